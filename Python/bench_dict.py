@@ -0,0 +1,77 @@
+# Dictionary Benchmark: Binary Tries vs Closure Chains
+# Filename: bench_dict.py
+# Usage: Run this file to time lc.py dictionaries with 1k and 10k keys.
+#
+# Both encodings get the same binary-numeral keys, compared with
+# lc_bin_equal in the closure chain. With unary Church keys the chain would
+# also pay O(k) per lc_equal at every entry it walks, which puts 10k keys
+# out of reach, so binary keys make this the chain's best case.
+
+import sys
+import time
+
+import lc
+
+
+def binary_keys(n):
+    """Return the binary numerals 0 .. n - 1."""
+    keys = []
+    key = lc.lc_bin_zero
+    for _ in range(n):
+        keys.append(key)
+        key = lc.lc_bin_inc(key)
+    return keys
+
+
+def _per_op(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def run(n, samples=200):
+    """Return per-operation timings in microseconds for both encodings."""
+    keys = binary_keys(n)
+    probes = keys[::max(n // samples, 1)]
+    insert_chain = lc.lc_chain_dict_insert_by(lc.lc_bin_equal)
+    results = {}
+    for name, empty, insert, lookup, remove in (
+        ('trie', lc.lc_trie_empty, lc.lc_trie_insert, lc.lc_trie_lookup, lc.lc_trie_remove),
+        ('chain', lc.lc_chain_dict_empty, insert_chain, lc.lc_chain_dict_lookup,
+         lc.lc_chain_dict_remove_by(lc.lc_bin_equal)),
+    ):
+        d = empty
+        start = time.perf_counter()
+        for i, key in enumerate(keys):
+            d = insert(d)(key)(i)
+        insert_us = (time.perf_counter() - start) / n * 1e6
+        lookup_us = _per_op(lambda key: lookup(d)(key), probes)
+        # Remove the probed keys, then look them up again as misses.
+        for key in probes:
+            d = remove(d)(key)
+        miss_us = _per_op(lambda key: lookup(d)(key), probes)
+        results[name] = (insert_us, lookup_us, miss_us)
+    return results
+
+
+def compare(sizes=(1_000, 10_000)):
+    """Print a table of insert, hit and miss timings per operation."""
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10000))
+    print(f"{'keys':>8}  {'encoding':<8}{'insert':>12}{'lookup':>12}{'miss':>12}")
+    try:
+        for n in sizes:
+            results = run(n)
+            for name, timings in results.items():
+                cells = ''.join(f"{t:10.1f}us" for t in timings)
+                print(f"{n:>8}  {name:<8}{cells}")
+            speedup = results['chain'][1] / results['trie'][1]
+            print(f"{'':>8}  lookup speedup {speedup:.1f}x")
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+# Example usage
+if __name__ == "__main__":
+    compare()
@@ -0,0 +1,239 @@
+# Benchmark Suite for lc.py and lambda_calculus.py
+# Filename: benchmarks.py
+# Usage: python benchmarks.py                         # run and print a table
+#        python benchmarks.py --save baseline.json    # record a baseline
+#        python benchmarks.py --compare baseline.json --check 'lc.list_*'
+#
+# Every case is timed after a warm-up, with enough calls per sample that a
+# sample takes at least --min-time seconds, and reported as the median of
+# --repeat samples. --compare exits with status 1 when the median of any
+# checked case is more than --threshold slower than in the baseline.
+
+import argparse
+import fnmatch
+import json
+import platform
+import statistics
+import sys
+import time
+
+import lambda_calculus
+import lc
+
+
+def _numeral(n):
+    result = lc.lc_zero
+    for _ in range(n):
+        result = lc.lc_inc(result)
+    return result
+
+
+def _to_int(n):
+    return n(lambda x: x + 1)(0)
+
+
+def _list(items):
+    result = lc.lc_nil
+    for item in reversed(items):
+        result = lc.lc_cons(item)(result)
+    return result
+
+
+def _numeral_cases(n):
+    m, half = _numeral(n), _numeral(n // 2)
+    yield 'lc.add', lambda: _to_int(lc.lc_add(m)(half))
+    yield 'lc.mul', lambda: _to_int(lc.lc_mul(m)(half))
+    yield 'lc.sub', lambda: _to_int(lc.lc_sub(m)(half))
+    yield 'lc.equal', lambda: lc.lc_equal(m)(half)(True)(False)
+    yield 'lc.less_than', lambda: lc.lc_less_than(half)(m)(True)(False)
+    tagged, tagged_half = lambda_calculus.int_to_church(n), lambda_calculus.int_to_church(n // 2)
+    yield 'lambda_calculus.mult', lambda: lambda_calculus.church_to_int(lambda_calculus.lc_mult(tagged)(tagged_half))
+    yield 'lambda_calculus.eq', lambda: lambda_calculus.lc_eq(tagged)(tagged_half)(True)(False)
+
+
+def _division_cases(n):
+    m, d = _numeral(n), _numeral(7)
+    yield 'lc.div', lambda: _to_int(lc.lc_div(m)(d))
+    yield 'lc.mod', lambda: _to_int(lc.lc_mod(m)(d))
+
+
+def _binary_cases(n):
+    a, b = lc.lc_bin_from_int(n), lc.lc_bin_from_int(n // 3 + 1)
+    yield 'lc.bin_add', lambda: lc.lc_bin_to_int(lc.lc_bin_add(a)(b))
+    yield 'lc.bin_mul', lambda: lc.lc_bin_to_int(lc.lc_bin_mul(a)(b))
+    yield 'lc.bin_divmod', lambda: lc.lc_bin_to_int(lc.lc_first(lc.lc_bin_divmod(a)(b)))
+    yield 'lc.bin_less_than', lambda: lc.lc_bin_less_than(a)(b)(True)(False)
+
+
+def _list_cases(n):
+    items = _list(list(range(n)))
+    is_even = lambda x: lc.lc_true if x % 2 == 0 else lc.lc_false
+    yield 'lc.list_map', lambda: lc.lc_list_map(lambda x: x + 1)(items)
+    yield 'lc.list_filter', lambda: lc.lc_list_filter(is_even)(items)
+    yield 'lc.list_foldl', lambda: lc.lc_list_foldl(lambda acc: lambda x: acc + x)(0)(items)
+    yield 'lc.list_reverse', lambda: lc.lc_list_reverse(items)
+
+
+def _dict_cases(n):
+    keys = [_numeral(i) for i in range(n)]
+    d = lc.lc_dict_empty
+    for i, key in enumerate(keys):
+        d = lc.lc_dict_insert(d)(key)(i)
+    yield 'lc.dict_lookup', lambda: [lc.lc_dict_lookup(d)(key) for key in keys]
+
+
+def _factorial_cases(n):
+    numeral = lambda_calculus.lc_zero
+    for _ in range(n):
+        numeral = lambda_calculus._church_succ(numeral)
+    yield 'lambda_calculus.factorial', lambda: lambda_calculus.church_to_int(lambda_calculus.factorial(numeral))
+
+
+def _converter_cases(n):
+    items = list(range(n))
+    church = lambda_calculus.list_to_church(items)
+    yield 'lambda_calculus.list_to_church', lambda: lambda_calculus.list_to_church(items)
+    yield 'lambda_calculus.church_to_list', lambda: lambda_calculus.church_to_list(church)
+
+
+# Each group builds its inputs once per size, outside the timed region.
+GROUPS = [
+    (_numeral_cases, (100, 1000)),
+    (_division_cases, (50, 200)),
+    (_binary_cases, (1000, 10 ** 6)),
+    (_list_cases, (1000, 10000)),
+    (_dict_cases, (100, 300)),
+    (_factorial_cases, (5, 7)),
+    (_converter_cases, (1000, 100000)),
+]
+
+
+def cases(patterns=('*',), quick=False):
+    """Yield `(name, fn)` for every case whose name matches a pattern."""
+    for group, sizes in GROUPS:
+        for size in sizes[:1] if quick else sizes:
+            for op, fn in group(size):
+                name = f"{op}[{size}]"
+                if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                    yield name, fn
+
+
+def measure(fn, repeat=5, warmup=1, min_time=0.02):
+    """
+    Time a zero-argument function.
+
+    Args:
+        fn: The function to time.
+        repeat: Number of samples to take.
+        warmup: Number of untimed calls made first.
+        min_time: Minimum duration of one sample, in seconds.
+
+    Returns:
+        dict: Seconds per call as median, min, mean and stdev over the
+        samples, plus the number of calls per sample.
+    """
+    for _ in range(warmup):
+        fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    samples = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'mean': statistics.mean(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'number': number,
+    }
+
+
+def compare(results, baseline, checks=('*',), threshold=0.25):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Mapping of case name to measurement, as from `measure`.
+        baseline: A mapping of the same shape, loaded from a saved baseline.
+        checks: Patterns selecting the cases that may fail the comparison.
+        threshold: Allowed slowdown of the median, as a fraction.
+
+    Returns:
+        list: `(name, ratio)` for every checked case that regressed.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline or not any(fnmatch.fnmatchcase(name, p) for p in checks):
+            continue
+        ratio = result['median'] / baseline[name]['median']
+        if ratio > 1 + threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def _format_time(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time lc.py and lambda_calculus.py operations.")
+    parser.add_argument('patterns', nargs='*', default=['*'], help="case name patterns to run")
+    parser.add_argument('--repeat', type=int, default=5, help="samples per case")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed calls per case")
+    parser.add_argument('--min-time', type=float, default=0.02, help="minimum seconds per sample")
+    parser.add_argument('--quick', action='store_true', help="run only the smallest size of each case")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a JSON baseline")
+    parser.add_argument('--check', action='append', metavar='PATTERN',
+                        help="cases that fail the comparison when they regress (default: all)")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown of the median, as a fraction")
+    args = parser.parse_args(argv)
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10000))
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    results = {}
+    print(f"{'case':<40}{'median':>10}{'min':>10}{'stdev':>10}{'baseline':>10}")
+    try:
+        for name, fn in cases(args.patterns, args.quick):
+            result = results[name] = measure(fn, args.repeat, args.warmup, args.min_time)
+            change = ''
+            if name in baseline:
+                change = f"{(result['median'] / baseline[name]['median'] - 1) * 100:+.0f}%"
+            print(f"{name:<40}{_format_time(result['median']):>10}{_format_time(result['min']):>10}"
+                  f"{_format_time(result['stdev']):>10}{change:>10}")
+    finally:
+        sys.setrecursionlimit(limit)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'python': platform.python_version(), 'results': results}, f, indent=2)
+            f.write('\n')
+    if args.compare:
+        regressions = compare(results, baseline, args.check or ['*'], args.threshold)
+        for name, ratio in regressions:
+            print(f"REGRESSION {name}: {ratio:.2f}x the baseline median", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
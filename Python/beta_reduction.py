@@ -1,7 +1,580 @@
+# Beta Reduction Engine for the Untyped Lambda Calculus
+# Filename: beta_reduction.py
+# Usage: Import `parse`, `normalize` and `LC_TERMS` to reduce lambda terms, or
+#        run this file to see a few reductions of the lc.py combinators.
+#
+# Terms use de Bruijn indices, so substitution is capture-avoiding by
+# construction and alpha-equivalent terms compare equal. Every traversal
+# (substitution, shifting, normalisation, printing) uses an explicit stack,
+# so deeply nested terms never touch the Python recursion limit.
+
+from typing import Dict, List, Optional, Tuple
+
+NORMAL_ORDER = 'normal'
+APPLICATIVE_ORDER = 'applicative'
+DEFAULT_MAX_STEPS = 1_000_000
+
+
+class ReductionLimitExceeded(RuntimeError):
+    """Raised when a reduction runs past its step budget."""
+
+    def __init__(self, steps: int, term: 'Term'):
+        super().__init__(f"Reduction stopped after {steps} steps")
+        self.steps = steps
+        self.term = term
+
+
+class Term:
+    """Base class for lambda terms.
+
+    `free` is one more than the largest free de Bruijn index in the term
+    (0 for closed terms); substitution and shifting use it to skip whole
+    subterms that cannot change. `hash` is computed once at construction.
+    """
+    __slots__ = ('free', 'hash')
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return isinstance(other, Term) and _alpha_equal(self, other)
+
+    def __repr__(self):
+        return show(self)
+
+
+class Var(Term):
+    """A variable, referring to the binder `index` lambdas further out."""
+    __slots__ = ('index',)
+
+    def __init__(self, index: int):
+        self.index = index
+        self.free = index + 1
+        self.hash = hash(('var', index))
+
+
+class Lam(Term):
+    """A lambda abstraction. `name` is only a hint for printing."""
+    __slots__ = ('body', 'name')
+
+    def __init__(self, body: Term, name: str = 'x'):
+        self.body = body
+        self.name = name
+        self.free = body.free - 1 if body.free else 0
+        self.hash = hash(('lam', body.hash))
+
+
+class App(Term):
+    """An application of `fn` to `arg`."""
+    __slots__ = ('fn', 'arg')
+
+    def __init__(self, fn: Term, arg: Term):
+        self.fn = fn
+        self.arg = arg
+        self.free = fn.free if fn.free > arg.free else arg.free
+        self.hash = hash(('app', fn.hash, arg.hash))
+
+
+# Variables are immutable, so small indices are shared between all terms.
+_VARS = [Var(i) for i in range(256)]
+
+
+def _var(index: int) -> Var:
+    return _VARS[index] if index < 256 else Var(index)
+
+
+def _alpha_equal(a: Term, b: Term) -> bool:
+    """Structural equality on de Bruijn terms, which is alpha-equivalence."""
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        if x is y:
+            continue
+        if x.hash != y.hash or x.__class__ is not y.__class__:
+            return False
+        if x.__class__ is Var:
+            if x.index != y.index:
+                return False
+        elif x.__class__ is Lam:
+            stack.append((x.body, y.body))
+        else:
+            stack.append((x.arg, y.arg))
+            stack.append((x.fn, y.fn))
+    return True
+
+
+def shift(term: Term, amount: int, cutoff: int = 0) -> Term:
+    """Add `amount` to every free variable of `term` at or above `cutoff`."""
+    if amount == 0 or term.free <= cutoff:
+        return term
+    out: List[Term] = []
+    stack = [(term, cutoff, False)]
+    while stack:
+        node, depth, done = stack.pop()
+        if node.free <= depth:
+            out.append(node)
+        elif node.__class__ is Var:
+            out.append(_var(node.index + amount))
+        elif node.__class__ is Lam:
+            if done:
+                out.append(Lam(out.pop(), node.name))
+            else:
+                stack.append((node, depth, True))
+                stack.append((node.body, depth + 1, False))
+        elif done:
+            arg = out.pop()
+            out.append(App(out.pop(), arg))
+        else:
+            stack.append((node, depth, True))
+            stack.append((node.arg, depth, False))
+            stack.append((node.fn, depth, False))
+    return out[0]
+
+
+def instantiate(body: Term, arg: Term) -> Term:
+    """Contract the redex `(λ. body) arg`.
+
+    Occurrences of the bound variable are replaced by `arg` (shifted under any
+    binders it moves beneath) and the remaining free variables of `body` are
+    lowered by one. Subterms that mention neither are shared, not copied.
+    """
+    if body.free == 0:
+        return body
+    shifted: Dict[int, Term] = {}
+    out: List[Term] = []
+    stack = [(body, 0, False)]
+    while stack:
+        node, depth, done = stack.pop()
+        if node.free <= depth:
+            out.append(node)
+        elif node.__class__ is Var:
+            if node.index == depth:
+                value = shifted.get(depth)
+                if value is None:
+                    value = shifted[depth] = shift(arg, depth)
+                out.append(value)
+            else:
+                out.append(_var(node.index - 1))
+        elif node.__class__ is Lam:
+            if done:
+                out.append(Lam(out.pop(), node.name))
+            else:
+                stack.append((node, depth, True))
+                stack.append((node.body, depth + 1, False))
+        elif done:
+            value = out.pop()
+            out.append(App(out.pop(), value))
+        else:
+            stack.append((node, depth, True))
+            stack.append((node.arg, depth, False))
+            stack.append((node.fn, depth, False))
+    return out[0]
+
+
 def beta_reduce(func, arg):
+    """Apply `func` to `arg`.
+
+    Lambda terms are contracted with capture-avoiding substitution; anything
+    else (a Python function) is simply called.
+    """
+    if isinstance(func, Lam):
+        return instantiate(func.body, arg)
     return func(arg)
 
+
+_BUILD_LAM = 0
+_BUILD_APP = 1
+_ARG = 2
+_FUN = 3
+
+# Both reducers run on environments instead of rewriting the term after every
+# step: an environment is a linked list of (value, next) cells and stands for
+# the substitution that would otherwise have been applied, so a beta step
+# allocates one cell instead of copying the function body. Binders that have
+# been entered during strong reduction are represented by their de Bruijn
+# level, and read back as indices when the normal form is rebuilt.
+
+
+def _free_env(term: Term, neutral) -> Optional[tuple]:
+    env = None
+    for k in reversed(range(term.free)):
+        env = (neutral(-k - 1), env)
+    return env
+
+
+def _build(values: List[Term], kind: int, payload) -> None:
+    if kind == _BUILD_LAM:
+        values.append(Lam(values.pop(), payload))
+        return
+    start = len(values) - payload - 1
+    result = values[start]
+    for i in range(start + 1, len(values)):
+        result = App(result, values[i])
+    del values[start:]
+    values.append(result)
+
+
+def _normal_order(term: Term, max_steps: int) -> Tuple[Term, int]:
+    # Strong call-by-name reduction (Cregut's KN machine): arguments are
+    # pushed as unevaluated closures and the head is reduced first.
+    steps = 0
+    values: List[Term] = []
+    tasks: list = [(term, _free_env(term, int), 0)]
+    while tasks:
+        task = tasks.pop()
+        if len(task) == 2:
+            _build(values, *task)
+            continue
+        node, env, depth = task
+        args: list = []
+        while True:
+            if node.__class__ is App:
+                args.append((node.arg, env))
+                node = node.fn
+            elif node.__class__ is Lam:
+                if not args:
+                    break
+                if steps >= max_steps:
+                    raise ReductionLimitExceeded(steps, term)
+                env = (args.pop(), env)
+                node = node.body
+                steps += 1
+            else:
+                cell = env
+                for _ in range(node.index):
+                    cell = cell[1]
+                value = cell[0]
+                if value.__class__ is int:
+                    break
+                node, env = value
+        if node.__class__ is Lam:
+            tasks.append((_BUILD_LAM, node.name))
+            tasks.append((node.body, (depth, env), depth + 1))
+        else:
+            values.append(_var(depth - value - 1))
+            if args:
+                tasks.append((_BUILD_APP, len(args)))
+                for arg, arg_env in args:
+                    tasks.append((arg, arg_env, depth))
+    return values[0], steps
+
+
+def _eval_strict(node: Term, env, steps: int, max_steps: int, term: Term):
+    # Weak call-by-value evaluation (a CEK machine). Values are closures
+    # (Lam, env) or neutral terms (level, args) headed by an entered binder.
+    stack: list = []
+    while True:
+        if node.__class__ is App:
+            stack.append((_ARG, node.arg, env))
+            node = node.fn
+            continue
+        if node.__class__ is Lam:
+            value = (node, env)
+        else:
+            cell = env
+            for _ in range(node.index):
+                cell = cell[1]
+            value = cell[0]
+        while stack:
+            frame = stack.pop()
+            if frame[0] == _ARG:
+                stack.append((_FUN, value))
+                node, env = frame[1], frame[2]
+                break
+            fn = frame[1]
+            if fn[0].__class__ is int:
+                value = (fn[0], fn[1] + (value,))
+                continue
+            if steps >= max_steps:
+                raise ReductionLimitExceeded(steps, term)
+            steps += 1
+            node, env = fn[0].body, (value, fn[1])
+            break
+        else:
+            return value, steps
+
+
+def _applicative_order(term: Term, max_steps: int) -> Tuple[Term, int]:
+    # Strong call-by-value reduction: arguments are evaluated before they
+    # are bound, and the bodies of the resulting lambdas are normalised when
+    # the value is read back as a term.
+    steps = 0
+    values: List[Term] = []
+    env = _free_env(term, lambda level: (level, ()))
+    value, steps = _eval_strict(term, env, steps, max_steps, term)
+    tasks: list = [(value, 0)]
+    while tasks:
+        task = tasks.pop()
+        if task[0].__class__ is int:
+            _build(values, *task)
+            continue
+        value, depth = task
+        head = value[0]
+        if head.__class__ is Lam:
+            body, steps = _eval_strict(head.body, ((depth, ()), value[1]),
+                                       steps, max_steps, term)
+            tasks.append((_BUILD_LAM, head.name))
+            tasks.append((body, depth + 1))
+        else:
+            values.append(_var(depth - head - 1))
+            if value[1]:
+                tasks.append((_BUILD_APP, len(value[1])))
+                for arg in reversed(value[1]):
+                    tasks.append((arg, depth))
+    return values[0], steps
+
+
+_STRATEGIES = {
+    NORMAL_ORDER: _normal_order,
+    APPLICATIVE_ORDER: _applicative_order,
+}
+
+
+def normalize(term: Term,
+              strategy: str = NORMAL_ORDER,
+              max_steps: int = DEFAULT_MAX_STEPS) -> Tuple[Term, int]:
+    """
+    Reduce a term to beta normal form.
+
+    Args:
+        term (Term): The term to reduce.
+        strategy (str): NORMAL_ORDER (leftmost-outermost, always finds a
+            normal form if one exists) or APPLICATIVE_ORDER (arguments are
+            normalised before they are substituted).
+        max_steps (int): Number of beta steps after which the reduction is
+            abandoned with ReductionLimitExceeded.
+
+    Returns:
+        Tuple[Term, int]: The normal form and the number of beta steps taken.
+    """
+    try:
+        reducer = _STRATEGIES[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown reduction strategy: {strategy}") from None
+    return reducer(term, max_steps)
+
+
+# Parsing and printing
+
+def _tokenize(source: str) -> List[str]:
+    tokens = []
+    i = 0
+    while i < len(source):
+        c = source[i]
+        if c.isspace():
+            i += 1
+        elif c in '()\\λ.':
+            tokens.append('\\' if c == 'λ' else c)
+            i += 1
+        elif c.isalnum() or c == '_':
+            j = i
+            while j < len(source) and (source[j].isalnum() or source[j] in "_'"):
+                j += 1
+            tokens.append(source[i:j])
+            i = j
+        else:
+            raise SyntaxError(f"Unexpected character {c!r} at offset {i}")
+    return tokens
+
+
+def parse(source: str, definitions: Optional[Dict[str, Term]] = None) -> Term:
+    """
+    Parse a lambda term such as `\\x y. x (y x)` or `λf.λx.f x`.
+
+    Free identifiers are looked up in `definitions` and inlined, so terms can
+    be written in terms of earlier combinators (see LC_TERMS).
+    """
+    definitions = LC_TERMS if definitions is None else definitions
+    tokens = _tokenize(source)
+    pos = 0
+    scope: List[str] = []
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def expect(token):
+        nonlocal pos
+        if peek() != token:
+            raise SyntaxError(f"Expected {token!r}, found {peek()!r}")
+        pos += 1
+
+    def atom():
+        nonlocal pos
+        token = peek()
+        if token == '(':
+            pos += 1
+            term = expression()
+            expect(')')
+            return term
+        if token is None or token in ').\\':
+            raise SyntaxError(f"Unexpected token {token!r}")
+        pos += 1
+        for depth, name in enumerate(reversed(scope)):
+            if name == token:
+                return _var(depth)
+        if token in definitions:
+            return definitions[token]
+        raise NameError(f"Unbound variable: {token}")
+
+    def expression():
+        nonlocal pos
+        if peek() == '\\':
+            pos += 1
+            names = []
+            while peek() not in ('.', None):
+                names.append(peek())
+                pos += 1
+            expect('.')
+            if not names:
+                raise SyntaxError("Lambda without parameters")
+            scope.extend(names)
+            body = expression()
+            del scope[len(scope) - len(names):]
+            for name in reversed(names):
+                body = Lam(body, name)
+            return body
+        term = atom()
+        while peek() not in (')', None):
+            term = App(term, expression() if peek() == '\\' else atom())
+        return term
+
+    term = expression()
+    if pos != len(tokens):
+        raise SyntaxError(f"Unexpected token {tokens[pos]!r}")
+    return term
+
+
+def show(term: Term) -> str:
+    """Render a term with named variables, renaming to avoid shadowing."""
+    out = []
+    stack = [(term, None, 0, False, False)]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            out.append(item)
+            continue
+        node, scope, depth, paren_lam, paren_app = item
+        if node.__class__ is Var:
+            names = scope
+            for _ in range(node.index):
+                names = names[1] if names else None
+            out.append(names[0] if names else f"#{node.index - depth}")
+        elif node.__class__ is Lam:
+            name = node.name
+            taken, names = set(), scope
+            while names:
+                taken.add(names[0])
+                names = names[1]
+            if name in taken:
+                suffix = 1
+                while f"{name}{suffix}" in taken:
+                    suffix += 1
+                name = f"{name}{suffix}"
+            if paren_lam:
+                out.append('(')
+                stack.append(')')
+            out.append(f"λ{name}.")
+            stack.append((node.body, (name, scope), depth + 1, False, False))
+        else:
+            if paren_app:
+                out.append('(')
+                stack.append(')')
+            stack.append((node.arg, scope, depth, True, True))
+            stack.append(' ')
+            stack.append((node.fn, scope, depth, True, False))
+    return ''.join(out)
+
+
+# Church encodings
+
+def church(n: int) -> Term:
+    """Build the Church numeral λf.λx.f (f ... (f x))."""
+    body: Term = _var(0)
+    f = _var(1)
+    for _ in range(n):
+        body = App(f, body)
+    return Lam(Lam(body, 'x'), 'f')
+
+
+def to_int(term: Term) -> int:
+    """Read a Church numeral in normal form back as a Python int."""
+    if term.__class__ is Lam and term.body.__class__ is Lam:
+        body, n = term.body.body, 0
+        while body.__class__ is App and body.fn.__class__ is Var and body.fn.index == 1:
+            body, n = body.arg, n + 1
+        if body.__class__ is Var and body.index == 0:
+            return n
+    raise ValueError(f"Not a Church numeral: {show(term)}")
+
+
+def to_bool(term: Term) -> bool:
+    """Read a Church boolean in normal form back as a Python bool."""
+    if term.__class__ is Lam and term.body.__class__ is Lam and term.body.body.__class__ is Var:
+        if term.body.body.index in (0, 1):
+            return term.body.body.index == 1
+    raise ValueError(f"Not a Church boolean: {show(term)}")
+
+
+# The non-recursive lc.py definitions as (name, source) pairs, in definition
+# order. Later entries may refer to earlier ones by name; LC_TERMS holds them
+# parsed with those references inlined.
+LC_SOURCES = [
+    ('lc_identity', r'\x. x'),
+    ('lc_kestrel', r'\x. \y. x'),
+    ('lc_kite', r'\x. \y. y'),
+    ('lc_bluebird', r'\x. \y. \z. x (y z)'),
+    ('lc_select', r'\x. \y. \selector. selector x y'),
+    ('lc_true', r'\x. \y. x'),
+    ('lc_false', r'\x. \y. y'),
+    ('lc_pair', r'\x. \y. \f. f x y'),
+    ('lc_first', r'\p. p lc_true'),
+    ('lc_second', r'\p. p lc_false'),
+    ('lc_nil', r'\x. lc_true'),
+    ('lc_cons', r'lc_pair'),
+    ('lc_is_nil', r'\l. l (\h. \t. lc_false)'),
+    ('lc_if', r'\c. \t. \e. c t e'),
+    ('lc_and', r'\x. \y. x y lc_false'),
+    ('lc_or', r'\x. \y. x lc_true y'),
+    ('lc_not', r'\x. x lc_false lc_true'),
+    ('lc_xor', r'\x. \y. x (lc_not y) y'),
+    ('lc_zero', r'\f. \x. x'),
+    ('lc_inc', r'\n. \f. \x. f (n f x)'),
+    ('lc_add', r'\m. \n. \f. \x. m f (n f x)'),
+    ('lc_dec', r'\n. \f. \x. n (\g. \h. h (g f)) (\u. x) (\u. u)'),
+    ('lc_sub', r'\m. \n. n lc_dec m'),
+    ('lc_mul', r'\m. \n. \f. \x. m (n f) x'),
+    ('lc_pow', r'\m. \n. n m'),
+    ('lc_is_zero', r'\n. n (\x. lc_false) lc_true'),
+    ('lc_equal', r'\m. \n. lc_and (lc_is_zero (lc_sub m n)) (lc_is_zero (lc_sub n m))'),
+    ('lc_less_than', r'\m. \n. lc_not (lc_is_zero (lc_sub n m))'),
+    ('lc_greater_than', r'\m. \n. lc_less_than n m'),
+    ('lc_less_than_or_equal', r'\m. \n. lc_or (lc_less_than m n) (lc_equal m n)'),
+    ('lc_greater_than_or_equal', r'\m. \n. lc_or (lc_greater_than m n) (lc_equal m n)'),
+    ('lc_max', r'\m. \n. lc_if (lc_less_than m n) n m'),
+    ('lc_min', r'\m. \n. lc_if (lc_less_than m n) m n'),
+    ('lc_i', r'\x. x'),
+    ('lc_k', r'\x. \y. x'),
+    ('lc_ki', r'\x. \y. y'),
+    ('lc_s', r'\x. \y. \z. x z (y z)'),
+    ('lc_b', r'\x. \y. \z. x (y z)'),
+    ('lc_c', r'\x. \y. \z. x z y'),
+    ('lc_y', r'\f. (\x. f (x x)) (\x. f (x x))'),
+]
+
+LC_TERMS: Dict[str, Term] = {}
+for _name, _source in LC_SOURCES:
+    LC_TERMS[_name] = parse(_source, LC_TERMS)
+
+
 # Example
-add_one = lambda x: x + 1
-result = beta_reduce(add_one, 5)
-print(result)  # Output: 6
+if __name__ == "__main__":
+    add_one = lambda x: x + 1
+    print(beta_reduce(add_one, 5))  # Output: 6
+
+    skk, steps = normalize(parse('lc_s lc_k lc_k'))
+    print(f"S K K = {show(skk)} in {steps} steps")
+
+    term = App(App(LC_TERMS['lc_sub'], church(50)), church(20))
+    for strategy in (NORMAL_ORDER, APPLICATIVE_ORDER):
+        result, steps = normalize(term, strategy)
+        print(f"50 - 20 = {to_int(result)} in {steps} steps ({strategy} order)")
@@ -0,0 +1,257 @@
+# Call-by-need Graph Reduction for the lc.py Definitions
+# Filename: graph_reduction.py
+# Usage: Run this file to compare strict Python closures, call-by-name and
+#        call-by-need evaluation of lc.py operations on numerals and lists in
+#        the hundreds, or import `GraphReducer` to evaluate terms lazily.
+#
+# Terms come from beta_reduction.py. Every argument becomes a shared thunk
+# that is overwritten with its weak head normal form the first time it is
+# forced, so a subterm such as the list tail that lc_list_length passes to
+# both lc_is_nil and lc_second is evaluated once instead of once per use.
+
+import sys
+import time
+from typing import Dict, Optional
+
+from beta_reduction import App, Lam, Term, Var, LC_TERMS, ReductionLimitExceeded, church, parse
+
+DEFAULT_MAX_STEPS = 10_000_000
+
+
+class Thunk:
+    """A suspended term in an environment, updated in place once forced."""
+    __slots__ = ('term', 'env', 'value')
+
+    def __init__(self, term: Optional[Term], env, value=None):
+        self.term = term
+        self.env = env
+        self.value = value
+
+
+class GraphReducer:
+    """
+    Lazy evaluator for closed lambda terms.
+
+    Values are closures `(Lam, env)` or neutral applications `(atom, args)`
+    of the host-provided atoms used to read results back. Environments are
+    linked `(thunk, next)` cells. With `share=False` thunks are never
+    updated, which turns the same machine into a call-by-name evaluator.
+    """
+
+    def __init__(self, share: bool = True, max_steps: int = DEFAULT_MAX_STEPS):
+        self.share = share
+        self.max_steps = max_steps
+        self.steps = 0
+        self.updates = 0
+
+    def force(self, thunk: Thunk):
+        """
+        Evaluate a thunk to weak head normal form.
+
+        Raises:
+            ReductionLimitExceeded: If evaluation takes more than max_steps
+                beta steps in total.
+        """
+        if thunk.value is not None:
+            return thunk.value
+        share = self.share
+        steps = self.steps
+        stack: list = []
+        if share:
+            stack.append((thunk,))
+        node, env = thunk.term, thunk.env
+        while True:
+            # Unwind the spine, pushing shared argument thunks.
+            while True:
+                if node.__class__ is App:
+                    arg = node.arg
+                    if arg.__class__ is Var:
+                        cell = env
+                        for _ in range(arg.index):
+                            cell = cell[1]
+                        stack.append(cell[0])
+                    else:
+                        stack.append(Thunk(arg, env))
+                    node = node.fn
+                elif node.__class__ is Lam:
+                    value = (node, env)
+                    break
+                else:
+                    cell = env
+                    for _ in range(node.index):
+                        cell = cell[1]
+                    target = cell[0]
+                    if target.value is not None:
+                        value = target.value
+                        break
+                    if share:
+                        stack.append((target,))
+                    node, env = target.term, target.env
+            # Return the value to the innermost pending argument or update.
+            while stack:
+                top = stack.pop()
+                if top.__class__ is tuple:
+                    top[0].value = value
+                    top[0].term = top[0].env = None
+                    self.updates += 1
+                elif value[0].__class__ is Lam:
+                    if steps >= self.max_steps:
+                        self.steps = steps
+                        raise ReductionLimitExceeded(steps, value[0])
+                    steps += 1
+                    node, env = value[0].body, (top, value[1])
+                    break
+                else:
+                    value = (value[0], value[1] + (top,))
+            else:
+                self.steps = steps
+                return value
+
+    def _apply_to_atoms(self, term: Term, *atoms: str):
+        env = None
+        body = term
+        for index, atom in enumerate(atoms):
+            env = (Thunk(None, None, (atom, ())), env)
+            body = App(body, Var(len(atoms) - index - 1))
+        return self.force(Thunk(body, env))
+
+    def to_int(self, term: Term) -> int:
+        """Evaluate a closed Church numeral term and read it back."""
+        value = self._apply_to_atoms(term, 'f', 'x')
+        n = 0
+        while value[0] == 'f' and len(value[1]) == 1:
+            value = self.force(value[1][0])
+            n += 1
+        if value != ('x', ()):
+            raise ValueError("Term did not evaluate to a Church numeral")
+        return n
+
+    def to_bool(self, term: Term) -> bool:
+        """Evaluate a closed Church boolean term and read it back."""
+        value = self._apply_to_atoms(term, 't', 'f')
+        if value[1] or value[0] not in ('t', 'f'):
+            raise ValueError("Term did not evaluate to a Church boolean")
+        return value[0] == 't'
+
+
+# Recursive lc.py definitions, tied with the Y combinator. They only
+# terminate under lazy evaluation, where lc_if never evaluates the branch
+# it does not select.
+_LAZY_SOURCES = [
+    ('lc_div', r'lc_y (\div. \m. \n. lc_if (lc_is_zero n) lc_zero'
+               r' (lc_if (lc_less_than m n) lc_zero (lc_inc (div (lc_sub m n) n))))'),
+    ('lc_mod', r'lc_y (\mod. \m. \n. lc_if (lc_is_zero n) lc_zero'
+               r' (lc_if (lc_less_than m n) m (mod (lc_sub m n) n)))'),
+    ('lc_list_length', r'lc_y (\len. \l. lc_if (lc_is_nil l) lc_zero (lc_inc (len (lc_second l))))'),
+    ('lc_list_foldl', r'lc_y (\fold. \f. \acc. \l. lc_if (lc_is_nil l) acc'
+                      r' (fold f (f acc (lc_first l)) (lc_second l)))'),
+    ('lc_dict_empty', r'\k. lc_false'),
+    ('lc_dict_insert', r'\d. \k. \v. \k_. lc_if (lc_equal k k_) v (d k_)'),
+    ('lc_dict_lookup', r'\d. \k. d k'),
+]
+
+LAZY_TERMS: Dict[str, Term] = dict(LC_TERMS)
+for _name, _source in _LAZY_SOURCES:
+    LAZY_TERMS[_name] = parse(_source, LAZY_TERMS)
+
+
+def _apply(name: str, *args: Term) -> Term:
+    term = LAZY_TERMS[name]
+    for arg in args:
+        term = App(term, arg)
+    return term
+
+
+def church_list(items) -> Term:
+    """Build the lc.py cons-list term holding the given terms."""
+    term = LAZY_TERMS['lc_nil']
+    for item in reversed(items):
+        term = App(App(LAZY_TERMS['lc_cons'], item), term)
+    return term
+
+
+def _time(fn):
+    start = time.perf_counter()
+    try:
+        fn()
+    except ReductionLimitExceeded:
+        return None
+    return time.perf_counter() - start
+
+
+def compare(sizes=(100, 200, 400), budget: int = 5_000_000) -> None:
+    """
+    Print timings for lc.py operations on numerals and lists in the hundreds.
+
+    `strict` runs the Python closures in lc.py, `by name` runs the graph
+    reducer without thunk updates and `by need` with them. Sharing is what
+    separates by name from by need: Church subtraction is intrinsically
+    O(m * n) however it is evaluated, so lc_sub and lc_equal gain nothing
+    from it, while the recursive definitions, which pass the same argument
+    to several places, do.
+
+    The last column is the time of strict over the time of by need. Graph
+    reduction interprets terms, so it is several times slower than the
+    strict closures (ratios below 1x); its use is evaluating terms lazily,
+    not speed.
+    """
+    import lc
+
+    def python_numeral(n):
+        numeral = lc.lc_zero
+        for _ in range(n):
+            numeral = lc.lc_inc(numeral)
+        return numeral
+
+    python_int = lambda n: n(lambda x: x + 1)(0)
+    python_bool = lambda b: b(True)(False)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10000))
+    print(f"{'operation':<24}{'strict':>12}{'by name':>12}{'by need':>12}{'vs strict':>11}")
+    try:
+        for n in sizes:
+            d = max(n // 10, 1)
+            m, half, k = python_numeral(n), python_numeral(n // 2), python_numeral(d)
+            items = church_list([church(i % 10) for i in range(n)])
+            python_items = lc.lc_nil
+            for i in range(n):
+                python_items = lc.lc_cons(python_numeral(i % 10))(python_items)
+            cases = [
+                (f"lc_sub {n} {n // 2}", int, _apply('lc_sub', church(n), church(n // 2)),
+                 lambda: python_int(lc.lc_sub(m)(half))),
+                (f"lc_equal {n} {n}", bool, _apply('lc_equal', church(n), church(n)),
+                 lambda: python_bool(lc.lc_equal(m)(m))),
+                (f"lc_div {n} {d}", int, _apply('lc_div', church(n), church(d)),
+                 lambda: python_int(lc.lc_div(m)(k))),
+                (f"lc_mod {n} {d}", int, _apply('lc_mod', church(n), church(d)),
+                 lambda: python_int(lc.lc_mod(m)(k))),
+                (f"lc_list_length [{n}]", int, _apply('lc_list_length', items),
+                 lambda: python_int(lc.lc_list_length(python_items))),
+                (f"lc_list_foldl add [{n}]", int,
+                 _apply('lc_list_foldl', LAZY_TERMS['lc_add'], church(0), items),
+                 lambda: python_int(lc.lc_list_foldl(lc.lc_add)(lc.lc_zero)(python_items))),
+            ]
+            for label, kind, term, strict in cases:
+                timings = [_time(strict) if strict else None]
+                for share in (False, True):
+                    reducer = GraphReducer(share=share, max_steps=budget)
+                    read = reducer.to_int if kind is int else reducer.to_bool
+                    timings.append(_time(lambda: read(term)))
+                cells = ''.join(f"{t * 1000:10.1f}ms" if t is not None else f"{'-':>12}"
+                                for t in timings)
+                if timings[0] is None or timings[2] is None:
+                    ratio = '-'
+                else:
+                    ratio = f"{timings[0] / timings[2]:.2f}x"
+                print(f"{label:<24}{cells}{ratio:>11}")
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+# Example usage
+if __name__ == "__main__":
+    reducer = GraphReducer()
+    print("17 div 5 =", reducer.to_int(_apply('lc_div', church(17), church(5))))
+    print("17 mod 5 =", reducer.to_int(_apply('lc_mod', church(17), church(5))))
+    print(f"({reducer.steps} beta steps, {reducer.updates} thunk updates)")
+    compare()
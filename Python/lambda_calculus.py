@@ -21,16 +21,58 @@ KI = lambda x: lambda y: y
 
 # Step 4: Create Church Numerals
 lc_zero = lambda f: lambda x: x
-lc_succ = lambda n: lambda f: lambda x: f(n(f)(x))
+lc_succ = lambda n: (ChurchNumeral(n.value + 1) if n.__class__ is ChurchNumeral
+                     else _church_succ(n))
+_church_succ = lambda n: lambda f: lambda x: f(n(f)(x))
 
 
 def church_to_int(n):
+    if n.__class__ is ChurchNumeral:
+        return n.value
     return n(lambda x: x + 1)(0)
 
 
+# Step 4b: Tagged Church Numerals (opt-in)
+# A ChurchNumeral is an ordinary callable numeral, n(f)(x) == f(f(...f(x))),
+# that also carries its integer value. Arithmetic below takes a fast path
+# whenever one operand is tagged, and applying it loops instead of nesting
+# closures, so numerals in the millions never hit the recursion limit.
+class ChurchNumeral:
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, f):
+        def apply_f(x):
+            for _ in range(self.value):
+                x = f(x)
+            return x
+        return apply_f
+
+    def __repr__(self):
+        return f"ChurchNumeral({self.value})"
+
+
+def int_to_church(n):
+    return ChurchNumeral(n)
+
+
+def _tagged(op, slow):
+    def binary(m):
+        def with_n(n):
+            if m.__class__ is ChurchNumeral or n.__class__ is ChurchNumeral:
+                return ChurchNumeral(op(church_to_int(m), church_to_int(n)))
+            return slow(m)(n)
+        return with_n
+    return binary
+
+
 # Step 5: Implement Basic Arithmetic
-lc_add = lambda m: lambda n: lambda f: lambda x: m(f)(n(f)(x))
-lc_mult = lambda m: lambda n: lambda f: m(n(f))
+_church_add = lambda m: lambda n: lambda f: lambda x: m(f)(n(f)(x))
+_church_mult = lambda m: lambda n: lambda f: m(n(f))
+lc_add = _tagged(lambda m, n: m + n, _church_add)
+lc_mult = _tagged(lambda m, n: m * n, _church_mult)
 
 lc_one = lc_succ(lc_zero)
 lc_two = lc_succ(lc_one)
@@ -56,47 +98,93 @@ lc_head = lc_first
 lc_tail = lc_second
 
 # Step 8: Implement Comparison Operations
-lc_is_zero = lambda n: n(lambda x: lc_false)(lc_true)
+lc_is_zero = lambda n: ((lc_true if n.value == 0 else lc_false) if n.__class__ is ChurchNumeral
+                        else n(lambda x: lc_false)(lc_true))
 lc_leq = lambda m: lambda n: lc_is_zero(lc_sub(m)(n))
 lc_eq = lambda m: lambda n: lc_and(lc_leq(m)(n))(lc_leq(n)(m))
 
 # Helper functions for comparison operations
 lc_and = lambda x: lambda y: x(y)(lc_false)
-lc_sub = lambda m: lambda n: n(lambda n: lambda f: lambda x: n(
+_church_sub = lambda m: lambda n: n(lambda n: lambda f: lambda x: n(
     lambda g: lambda h: h(g(f)))(lambda y: x)(lambda y: y))(m)
+lc_sub = _tagged(lambda m, n: max(m - n, 0), _church_sub)
 
 # Step 9: Implement Higher-Order List Operations
-lc_map = lambda f: lambda l: lc_if(lc_is_nil(l))(lc_nil)(lambda: lc_cons(
+# Both branches of lc_if are passed as thunks and the chosen one is called,
+# so only the selected branch is evaluated.
+lc_map = lambda f: lambda l: lc_if(lc_is_nil(l))(lambda: lc_nil)(lambda: lc_cons(
     f(lc_head(l)))(lc_map(f)(lc_tail(l))))()
-lc_filter = lambda p: lambda l: lc_if(lc_is_nil(l))(lc_nil)(lambda: lc_if(
+lc_filter = lambda p: lambda l: lc_if(lc_is_nil(l))(lambda: lc_nil)(lambda: lc_if(
     p(lc_head(l)))(lambda: lc_cons(lc_head(l))
                    (lc_filter(p)(lc_tail(l))))(lambda: lc_filter(p)
-                                               (lc_tail(l))))()
-lc_fold = lambda f: lambda acc: lambda l: lc_if(lc_is_nil(l))(acc)(
+                                               (lc_tail(l)))())()
+lc_fold = lambda f: lambda acc: lambda l: lc_if(lc_is_nil(l))(lambda: acc)(
     lambda: lc_fold(f)(f(acc)(lc_head(l)))(lc_tail(l)))()
 
 # Step 10: Explore Recursion and Fixed-Point Combinators
 Y = lambda f: (lambda x: f(lambda y: x(x)(y)))(lambda x: f(lambda y: x(x)(y)))
 
 # Example usage of Y combinator for factorial
-factorial = Y(lambda f: lambda n: lc_if(lc_is_zero(n))(lc_one)
+factorial = Y(lambda f: lambda n: lc_if(lc_is_zero(n))(lambda: lc_one)
               (lambda: lc_mult(n)(f(lc_sub(n)(lc_one))))())
 
 
-# Helper function to convert Python list to Church-encoded list
+# Helper functions to convert between Python iterables and Church-encoded lists
+# A Church list is built back to front, so sequences and buffers are walked
+# with reversed() in place; only one-shot iterators are collected first.
+def iter_to_church(iterable, convert=None):
+    try:
+        items = reversed(iterable)
+    except TypeError:
+        try:
+            items = reversed(memoryview(iterable))
+        except TypeError:
+            items = reversed(list(iterable))
+    result = lc_nil
+    if convert is None:
+        for item in items:
+            result = lc_cons(item)(result)
+    else:
+        for item in items:
+            result = lc_cons(convert(item))(result)
+    return result
+
+
 def list_to_church(lst):
-    if not lst:
-        return lc_nil
-    return lc_cons(lst[0])(list_to_church(lst[1:]))
+    return iter_to_church(lst)
+
+
+# Applying a list to _uncons returns (head, tail) for a pair and a Church
+# boolean for nil, so each element costs one application instead of three.
+_uncons = lambda h: lambda t: (h, t)
+
+
+def church_to_iter(l):
+    cell = l(_uncons)
+    while cell.__class__ is tuple:
+        yield cell[0]
+        cell = cell[1](_uncons)
 
 
-# Helper function to convert Church-encoded list to Python list
 def church_to_list(l):
-    result = []
-    while not lc_is_nil(l)(True):
-        result.append(lc_head(l))
-        l = lc_tail(l)
-    return result
+    return list(church_to_iter(l))
+
+
+# Bulk conversions of numerals and booleans
+def ints_to_church(iterable):
+    return iter_to_church(iterable, int_to_church)
+
+
+def church_to_ints(l):
+    return map(church_to_int, church_to_iter(l))
+
+
+def bools_to_church(iterable):
+    return iter_to_church(iterable, lambda b: lc_true if b else lc_false)
+
+
+def church_to_bools(l):
+    return (b(True)(False) for b in church_to_iter(l))
 
 
 # Example usage
@@ -26,6 +26,30 @@ lc_or = lambda x: lambda y: x(lc_true)(y)
 lc_not = lambda x: x(lc_false)(lc_true)
 lc_xor = lambda x: lambda y: x(lc_not(y))(y)
 
+# Lazy Conditionals and Trampolines
+# Python evaluates arguments eagerly, so lc_if computes both branches. The
+# recursive definitions below pass zero-argument thunks to lc_lazy_if, which
+# forces only the branch that was selected. Instead of recursing they return
+# lc_bounce(thunk), and lc_trampoline forces bounces in a loop, so the Python
+# stack stays bounded however long the list or numeral is.
+lc_lazy_if = lambda c: lambda t: lambda e: c(t)(e)()
+
+
+class _Bounce:
+    __slots__ = ('thunk',)
+
+    def __init__(self, thunk):
+        self.thunk = thunk
+
+
+lc_bounce = _Bounce
+
+
+def lc_trampoline(result):
+    while result.__class__ is _Bounce:
+        result = result.thunk()
+    return result
+
 # Church Numerals and Arithmetic (Building upon Pairs and Booleans)
 lc_zero = lambda f: lambda x: x
 lc_inc = lambda n: lambda f: lambda x: f(n(f)(x))
@@ -44,29 +68,189 @@ lc_less_than_or_equal = lambda m: lambda n: lc_or(lc_less_than(m)(n))(lc_equal(m
 lc_greater_than_or_equal = lambda m: lambda n: lc_or(lc_greater_than(m)(n))(lc_equal(m)(n))
 
 # Additional Arithmetic Operations
-lc_div = lambda m: lambda n: lc_if(lc_is_zero(n))(
-    lc_zero
+_lc_div_step = lambda q: lambda m: lambda n: lc_lazy_if(lc_less_than(m)(n))(
+    lambda: q
+)(
+    lambda: lc_bounce(lambda: _lc_div_step(lc_inc(q))(lc_sub(m)(n))(n))
+)
+
+lc_div = lambda m: lambda n: lc_lazy_if(lc_is_zero(n))(
+    lambda: lc_zero
+)(
+    lambda: lc_trampoline(_lc_div_step(lc_zero)(m)(n))
+)
+
+_lc_mod_step = lambda m: lambda n: lc_lazy_if(lc_less_than(m)(n))(
+    lambda: m
 )(
-    lc_if(lc_less_than(m)(n))(
-        lc_zero
+    lambda: lc_bounce(lambda: _lc_mod_step(lc_sub(m)(n))(n))
+)
+
+lc_mod = lambda m: lambda n: lc_lazy_if(lc_is_zero(n))(
+    lambda: lc_zero
+)(
+    lambda: lc_trampoline(_lc_mod_step(m)(n))
+)
+
+lc_abs = lambda n: lc_if(lc_less_than(n)(lc_zero))(lc_sub(lc_zero)(n))(n)
+lc_max = lambda m: lambda n: lc_if(lc_less_than(m)(n))(n)(m)
+lc_min = lambda m: lambda n: lc_if(lc_less_than(m)(n))(m)(n)
+
+# Binary Numerals
+# Little-endian lists of Church booleans with no trailing lc_false, so every
+# number has exactly one spelling and lc_bin_zero is the empty list. Unlike
+# Church numerals they can be compared and branched on one bit at a time,
+# and arithmetic costs time in the number of bits rather than the value.
+lc_bin_zero = lc_nil
+
+lc_bin_inc = lambda b: lc_lazy_if(lc_is_nil(b))(
+    lambda: lc_cons(lc_true)(lc_nil)
+)(
+    lambda: lc_lazy_if(lc_first(b))(
+        lambda: lc_cons(lc_false)(lc_bin_inc(lc_second(b)))
     )(
-        lc_inc(lc_div(lc_sub(m)(n))(n))
+        lambda: lc_cons(lc_true)(lc_second(b))
     )
 )
 
-lc_mod = lambda m: lambda n: lc_if(lc_is_zero(n))(
-    lc_zero
+lc_bin_equal = lambda a: lambda b: lc_lazy_if(lc_is_nil(a))(
+    lambda: lc_is_nil(b)
 )(
-    lc_if(lc_less_than(m)(n))(
-        m
+    lambda: lc_lazy_if(lc_is_nil(b))(
+        lambda: lc_false
     )(
-        lc_mod(lc_sub(m)(n))(n)
+        lambda: lc_lazy_if(lc_xor(lc_first(a))(lc_first(b)))(
+            lambda: lc_false
+        )(
+            lambda: lc_bin_equal(lc_second(a))(lc_second(b))
+        )
     )
 )
 
-lc_abs = lambda n: lc_if(lc_less_than(n)(lc_zero))(lc_sub(lc_zero)(n))(n)
-lc_max = lambda m: lambda n: lc_if(lc_less_than(m)(n))(n)(m)
-lc_min = lambda m: lambda n: lc_if(lc_less_than(m)(n))(m)(n)
+lc_num_to_bin = lambda n: n(lc_bin_inc)(lc_bin_zero)
+lc_bin_to_num = lambda b: lc_lazy_if(lc_is_nil(b))(
+    lambda: lc_zero
+)(
+    lambda: (lambda twice: lc_first(b)(lc_inc(twice))(twice))(lc_mul(lc_inc(lc_inc(lc_zero)))(lc_bin_to_num(lc_second(b))))
+)
+
+# Bit-level helpers: the low bit and the remaining bits of any numeral, and
+# a constructor that drops the trailing zero a leading lc_false would leave.
+_lc_bin_low = lambda b: lc_is_nil(b)(lc_false)(lc_first(b))
+_lc_bin_high = lambda b: lc_is_nil(b)(lc_nil)(lc_second(b))
+_lc_bin_bit = lambda bit: lambda rest: lc_and(lc_not(bit))(lc_is_nil(rest))(lc_nil)(lc_cons(bit)(rest))
+
+lc_bin_is_zero = lc_is_nil
+
+lc_bin_dec = lambda b: lc_lazy_if(lc_is_nil(b))(
+    lambda: lc_nil
+)(
+    lambda: lc_lazy_if(lc_first(b))(
+        lambda: _lc_bin_bit(lc_false)(lc_second(b))
+    )(
+        lambda: lc_cons(lc_true)(lc_bin_dec(lc_second(b)))
+    )
+)
+
+_lc_bin_compare = lambda a: lambda b: lambda below: lc_lazy_if(lc_and(lc_is_nil(a))(lc_is_nil(b)))(
+    lambda: below
+)(
+    lambda: (lambda x: lambda y: _lc_bin_compare(_lc_bin_high(a))(_lc_bin_high(b))(lc_xor(x)(y)(y)(below)))(
+        _lc_bin_low(a))(_lc_bin_low(b))
+)
+
+lc_bin_less_than = lambda a: lambda b: _lc_bin_compare(a)(b)(lc_false)
+
+_lc_bin_sub_borrow = lambda a: lambda b: lambda borrow: lc_lazy_if(lc_and(lc_is_nil(b))(lc_not(borrow)))(
+    lambda: a
+)(
+    lambda: (lambda x: lambda y: _lc_bin_bit(lc_xor(lc_xor(x)(y))(borrow))(
+        _lc_bin_sub_borrow(_lc_bin_high(a))(_lc_bin_high(b))(
+            lc_or(lc_and(lc_not(x))(y))(lc_and(lc_not(lc_xor(x)(y)))(borrow)))))(
+        _lc_bin_low(a))(_lc_bin_low(b))
+)
+
+# Saturating, like lc_sub: lc_bin_sub(a)(b) is zero when b >= a.
+lc_bin_sub = lambda a: lambda b: lc_lazy_if(lc_bin_less_than(a)(b))(
+    lambda: lc_bin_zero
+)(
+    lambda: _lc_bin_sub_borrow(a)(b)(lc_false)
+)
+
+lc_bin_one = lc_cons(lc_true)(lc_nil)
+lc_bin_double = lambda b: _lc_bin_bit(lc_false)(b)
+lc_bin_greater_than = lambda a: lambda b: lc_bin_less_than(b)(a)
+lc_bin_less_than_or_equal = lambda a: lambda b: lc_not(lc_bin_less_than(b)(a))
+lc_bin_greater_than_or_equal = lambda a: lambda b: lc_not(lc_bin_less_than(a)(b))
+
+_lc_bin_add_carry = lambda a: lambda b: lambda carry: lc_lazy_if(lc_and(lc_is_nil(a))(lc_is_nil(b)))(
+    lambda: _lc_bin_bit(carry)(lc_nil)
+)(
+    lambda: (lambda x: lambda y: lc_cons(lc_xor(lc_xor(x)(y))(carry))(
+        _lc_bin_add_carry(_lc_bin_high(a))(_lc_bin_high(b))(
+            lc_or(lc_and(x)(y))(lc_and(carry)(lc_xor(x)(y))))))(
+        _lc_bin_low(a))(_lc_bin_low(b))
+)
+
+lc_bin_add = lambda a: lambda b: _lc_bin_add_carry(a)(b)(lc_false)
+
+# Shift-and-add: a * b = a * (b mod 2) + 2 * (a * (b div 2)).
+lc_bin_mul = lambda a: lambda b: lc_lazy_if(lc_is_nil(b))(
+    lambda: lc_bin_zero
+)(
+    lambda: (lambda rest: lc_first(b)(lc_bin_add(a)(rest))(rest))(lc_bin_double(lc_bin_mul(a)(lc_second(b))))
+)
+
+# Square-and-multiply, so the cost grows with the bits of the result
+# rather than its value.
+lc_bin_pow = lambda a: lambda e: lc_lazy_if(lc_is_nil(e))(
+    lambda: lc_bin_one
+)(
+    lambda: (lambda half: (lambda square: lc_first(e)(lc_bin_mul(a)(square))(square))(lc_bin_mul(half)(half)))(
+        lc_bin_pow(a)(lc_second(e)))
+)
+
+# Long division from the most significant bit down, returning
+# lc_pair(quotient)(remainder). Like lc_div, dividing by zero gives zero.
+_lc_bin_divmod_step = lambda a: lambda b: lc_lazy_if(lc_is_nil(a))(
+    lambda: lc_pair(lc_bin_zero)(lc_bin_zero)
+)(
+    lambda: (lambda qr: (lambda q: lambda r: lc_lazy_if(lc_bin_less_than(r)(b))(
+        lambda: lc_pair(lc_bin_double(q))(r)
+    )(
+        lambda: lc_pair(lc_cons(lc_true)(q))(lc_bin_sub(r)(b))
+    ))(lc_first(qr))(_lc_bin_bit(lc_first(a))(lc_second(qr))))(_lc_bin_divmod_step(lc_second(a))(b))
+)
+
+lc_bin_divmod = lambda a: lambda b: lc_lazy_if(lc_is_nil(b))(
+    lambda: lc_pair(lc_bin_zero)(lc_bin_zero)
+)(
+    lambda: _lc_bin_divmod_step(a)(b)
+)
+
+lc_bin_div = lambda a: lambda b: lc_first(lc_bin_divmod(a)(b))
+lc_bin_mod = lambda a: lambda b: lc_second(lc_bin_divmod(a)(b))
+
+
+# Python int adapters
+def lc_bin_from_int(n):
+    if n < 0:
+        raise ValueError("Binary numerals are natural numbers")
+    result = lc_bin_zero
+    for bit in bin(n)[2:] if n else '':
+        result = lc_cons(lc_true if bit == '1' else lc_false)(result)
+    return result
+
+
+def lc_bin_to_int(b):
+    n = 0
+    shift = 0
+    while lc_is_nil(b)(False)(True):
+        n |= lc_first(b)(1)(0) << shift
+        shift += 1
+        b = lc_second(b)
+    return n
+
 
 # Characters (A-Z)
 lc_char_A = lambda x: x
@@ -81,64 +265,327 @@ lc_char_Z = lambda x: x(lc_char_Y)
 lc_list = lambda x: lambda xs: lc_cons(x)(xs)
 lc_list_empty = lc_nil
 
-lc_list_length = lambda l: lc_if(lc_is_nil(l))(lc_zero)(lc_inc(lc_list_length(lc_second(l))))
+lc_list_length = lambda l: lc_list_foldl(lambda acc: lambda x: lc_inc(acc))(lc_zero)(l)
+
+lc_list_append = lambda l1: lambda l2: lc_list_foldl(lambda acc: lambda x: lc_cons(x)(acc))(l2)(lc_list_reverse(l1))
+
+lc_list_map = lambda f: lambda l: lc_list_reverse(
+    lc_list_foldl(lambda acc: lambda x: lc_cons(f(x))(acc))(lc_nil)(l)
+)
+
+lc_list_filter = lambda pred: lambda l: lc_list_reverse(
+    lc_list_foldl(lambda acc: lambda x: lc_lazy_if(pred(x))(
+        lambda: lc_cons(x)(acc)
+    )(
+        lambda: acc
+    ))(lc_nil)(l)
+)
+
+_lc_list_foldl_step = lambda f: lambda acc: lambda l: lc_lazy_if(lc_is_nil(l))(
+    lambda: acc
+)(
+    lambda: lc_bounce(lambda: _lc_list_foldl_step(f)(f(acc)(lc_first(l)))(lc_second(l)))
+)
+
+lc_list_foldl = lambda f: lambda acc: lambda l: lc_trampoline(_lc_list_foldl_step(f)(acc)(l))
+
+lc_list_foldr = lambda f: lambda acc: lambda l: lc_list_foldl(lambda acc: lambda x: f(x)(acc))(acc)(lc_list_reverse(l))
+
+lc_list_reverse = lambda l: lc_list_foldl(lambda acc: lambda x: lc_cons(x)(acc))(lc_nil)(l)
+
+_lc_list_at_step = lambda l: lambda n: lc_lazy_if(lc_is_zero(n))(
+    lambda: lc_first(l)
+)(
+    lambda: lc_bounce(lambda: _lc_list_at_step(lc_second(l))(lc_dec(n)))
+)
+
+lc_list_at = lambda l: lambda n: lc_trampoline(_lc_list_at_step(l)(n))
+
+lc_list_slice = lambda l: lambda start: lambda end: lc_list_take(lc_list_drop(l)(start))(lc_sub(end)(start))
+
+_lc_list_take_step = lambda acc: lambda l: lambda n: lc_lazy_if(lc_or(lc_is_nil(l))(lc_is_zero(n)))(
+    lambda: lc_list_reverse(acc)
+)(
+    lambda: lc_bounce(lambda: _lc_list_take_step(lc_cons(lc_first(l))(acc))(lc_second(l))(lc_dec(n)))
+)
+
+lc_list_take = lambda l: lambda n: lc_trampoline(_lc_list_take_step(lc_nil)(l)(n))
+
+_lc_list_drop_step = lambda l: lambda n: lc_lazy_if(lc_or(lc_is_nil(l))(lc_is_zero(n)))(
+    lambda: l
+)(
+    lambda: lc_bounce(lambda: _lc_list_drop_step(lc_second(l))(lc_dec(n)))
+)
+
+lc_list_drop = lambda l: lambda n: lc_trampoline(_lc_list_drop_step(l)(n))
+
+# Streams (Lazy, Possibly Infinite Lists)
+# A stream is lc_nil or a pair of a head and a thunk for the rest. Tails are
+# memoised by lc_delay, so a stream fed from a one-shot Python iterator can
+# be walked more than once and each element is computed once. Consumed cells
+# are not referenced by what follows them, so pipelines over infinite
+# streams run in constant memory as long as nothing holds the first cell.
+def lc_delay(thunk):
+    value = None
+
+    def force():
+        nonlocal thunk, value
+        if thunk is not None:
+            value = thunk()
+            thunk = None
+        return value
+    return force
+
+
+lc_stream_nil = lc_nil
+lc_stream_cons = lambda h: lambda t: lc_pair(h)(lc_delay(t))
+lc_stream_is_nil = lc_is_nil
+lc_stream_head = lc_first
+lc_stream_tail = lambda s: lc_second(s)()
+
+lc_stream_iterate = lambda f: lambda x: lc_stream_cons(x)(lambda: lc_stream_iterate(f)(f(x)))
+lc_stream_from = lambda n: lc_stream_iterate(lc_inc)(n)
+lc_stream_repeat = lambda x: lc_stream_cons(x)(lambda: lc_stream_repeat(x))
+
+_lc_stream_cycle_from = lambda l: lambda rest: lc_lazy_if(lc_is_nil(rest))(
+    lambda: _lc_stream_cycle_from(l)(l)
+)(
+    lambda: lc_stream_cons(lc_first(rest))(lambda: _lc_stream_cycle_from(l)(lc_second(rest)))
+)
+
+lc_stream_cycle = lambda l: lc_lazy_if(lc_is_nil(l))(
+    lambda: lc_stream_nil
+)(
+    lambda: _lc_stream_cycle_from(l)(l)
+)
+
+lc_stream_take = lambda s: lambda n: lc_lazy_if(lc_or(lc_is_nil(s))(lc_is_zero(n)))(
+    lambda: lc_stream_nil
+)(
+    lambda: lc_stream_cons(lc_first(s))(lambda: lc_stream_take(lc_stream_tail(s))(lc_dec(n)))
+)
 
-lc_list_append = lambda l1: lambda l2: lc_if(lc_is_nil(l1))(
-    l2
+_lc_stream_drop_step = lambda s: lambda n: lc_lazy_if(lc_or(lc_is_nil(s))(lc_is_zero(n)))(
+    lambda: s
 )(
-    lc_cons(lc_first(l1))(lc_list_append(lc_second(l1))(l2))
+    lambda: lc_bounce(lambda: _lc_stream_drop_step(lc_stream_tail(s))(lc_dec(n)))
 )
 
-lc_list_map = lambda f: lambda l: lc_if(lc_is_nil(l))(
-    lc_nil
+lc_stream_drop = lambda s: lambda n: lc_trampoline(_lc_stream_drop_step(s)(n))
+
+lc_stream_map = lambda f: lambda s: lc_lazy_if(lc_is_nil(s))(
+    lambda: lc_stream_nil
 )(
-    lc_cons(f(lc_first(l)))(lc_list_map(f)(lc_second(l)))
+    lambda: lc_stream_cons(f(lc_first(s)))(lambda: lc_stream_map(f)(lc_stream_tail(s)))
 )
 
-lc_list_filter = lambda pred: lambda l: lc_if(lc_is_nil(l))(
-    lc_nil
+_lc_stream_filter_step = lambda pred: lambda s: lc_lazy_if(lc_is_nil(s))(
+    lambda: lc_stream_nil
 )(
-    lc_if(pred(lc_first(l)))(
-        lc_cons(lc_first(l))(lc_list_filter(pred)(lc_second(l)))
+    lambda: lc_lazy_if(pred(lc_first(s)))(
+        lambda: lc_stream_cons(lc_first(s))(lambda: lc_stream_filter(pred)(lc_stream_tail(s)))
     )(
-        lc_list_filter(pred)(lc_second(l))
+        lambda: lc_bounce(lambda: _lc_stream_filter_step(pred)(lc_stream_tail(s)))
     )
 )
 
-lc_list_foldl = lambda f: lambda acc: lambda l: lc_if(lc_is_nil(l))(
-    acc
+lc_stream_filter = lambda pred: lambda s: lc_trampoline(_lc_stream_filter_step(pred)(s))
+
+lc_stream_zip = lambda s1: lambda s2: lc_lazy_if(lc_or(lc_is_nil(s1))(lc_is_nil(s2)))(
+    lambda: lc_stream_nil
 )(
-    lc_list_foldl(f)(f(acc)(lc_first(l)))(lc_second(l))
+    lambda: lc_stream_cons(lc_pair(lc_first(s1))(lc_first(s2)))(
+        lambda: lc_stream_zip(lc_stream_tail(s1))(lc_stream_tail(s2)))
 )
 
-lc_list_foldr = lambda f: lambda acc: lambda l: lc_if(lc_is_nil(l))(
-    acc
+lc_stream_from_list = lambda l: lc_lazy_if(lc_is_nil(l))(
+    lambda: lc_stream_nil
 )(
-    f(lc_first(l))(lc_list_foldr(f)(acc)(lc_second(l)))
+    lambda: lc_stream_cons(lc_first(l))(lambda: lc_stream_from_list(lc_second(l)))
 )
 
-lc_list_reverse = lambda l: lc_list_foldl(lambda acc: lambda x: lc_cons(x)(acc))(lc_nil)(l)
+_lc_stream_to_list_step = lambda acc: lambda s: lc_lazy_if(lc_is_nil(s))(
+    lambda: lc_list_reverse(acc)
+)(
+    lambda: lc_bounce(lambda: _lc_stream_to_list_step(lc_cons(lc_first(s))(acc))(lc_stream_tail(s)))
+)
+
+lc_stream_to_list = lambda s: lc_trampoline(_lc_stream_to_list_step(lc_nil)(s))
 
-lc_list_at = lambda l: lambda n: lc_if(lc_is_zero(n))(
-    lc_first(l)
+
+# Python generator adapters
+def lc_stream_from_iter(iterable):
+    items = iter(iterable)
+
+    def next_cell():
+        for item in items:
+            return lc_stream_cons(item)(next_cell)
+        return lc_stream_nil
+    return next_cell()
+
+
+def lc_stream_to_iter(s):
+    while lc_is_nil(s)(False)(True):
+        yield lc_first(s)
+        s = lc_stream_tail(s)
+
+# Random-Access Lists
+# A skew-binary random-access list is a cons-list of (size, tree) pairs,
+# where each tree is complete, holds its elements in preorder and has a
+# binary-numeral size of the form 2^k - 1. Cons merges the first two trees
+# when they have equal size, so cons, head and tail are O(1). Index, update,
+# take and drop skip whole trees and then descend one tree, so they are
+# O(log n) with binary indexes (the _bin functions); the Church-numeral
+# wrappers first pay O(i) to convert the index. Take splits the cut tree
+# into O(log n) complete pieces, which keeps the list valid without copying.
+_lc_ra_leaf = lambda x: lc_pair(x)(lc_nil)
+_lc_ra_node = lambda x: lambda t1: lambda t2: lc_pair(x)(lc_pair(t1)(t2))
+_lc_ra_root = lc_first
+_lc_ra_left = lambda t: lc_first(lc_second(t))
+_lc_ra_right = lambda t: lc_second(lc_second(t))
+_lc_ra_is_leaf = lambda t: lc_is_nil(lc_second(t))
+_lc_ra_one = lc_cons(lc_true)(lc_nil)
+
+lc_ralist_empty = lc_nil
+lc_ralist_is_empty = lc_is_nil
+
+lc_ralist_cons = lambda x: lambda l: lc_lazy_if(
+    lc_and(lc_not(lc_is_nil(l)))(lc_and(lc_not(lc_is_nil(lc_second(l))))(
+        lc_bin_equal(lc_first(lc_first(l)))(lc_first(lc_first(lc_second(l))))))
 )(
-    lc_list_at(lc_second(l))(lc_dec(n))
+    lambda: lc_cons(lc_pair(lc_cons(lc_true)(lc_first(lc_first(l))))(
+        _lc_ra_node(x)(lc_second(lc_first(l)))(lc_second(lc_first(lc_second(l))))))(lc_second(lc_second(l)))
+)(
+    lambda: lc_cons(lc_pair(_lc_ra_one)(_lc_ra_leaf(x)))(l)
 )
 
-lc_list_slice = lambda l: lambda start: lambda end: lc_list_take(lc_list_drop(l)(start))(lc_sub(end)(start))
+lc_ralist_head = lambda l: _lc_ra_root(lc_second(lc_first(l)))
+
+lc_ralist_tail = lambda l: (lambda w: lambda t: lc_lazy_if(_lc_ra_is_leaf(t))(
+    lambda: lc_second(l)
+)(
+    lambda: lc_cons(lc_pair(lc_second(w))(_lc_ra_left(t)))(lc_cons(lc_pair(lc_second(w))(_lc_ra_right(t)))(lc_second(l)))
+))(lc_first(lc_first(l)))(lc_second(lc_first(l)))
+
+# Within a tree of size w = 2h + 1, index i > 0 is in the left subtree at
+# i - 1 when i - 1 < h and in the right subtree at i - 1 - h otherwise.
+_lc_ra_tree_at = lambda w: lambda t: lambda i: lc_lazy_if(lc_bin_is_zero(i))(
+    lambda: _lc_ra_root(t)
+)(
+    lambda: (lambda j: lc_lazy_if(lc_bin_less_than(j)(lc_second(w)))(
+        lambda: _lc_ra_tree_at(lc_second(w))(_lc_ra_left(t))(j)
+    )(
+        lambda: _lc_ra_tree_at(lc_second(w))(_lc_ra_right(t))(lc_bin_sub(j)(lc_second(w)))
+    ))(lc_bin_dec(i))
+)
+
+lc_ralist_at_bin = lambda l: lambda i: lc_lazy_if(lc_is_nil(l))(
+    lambda: lc_false
+)(
+    lambda: (lambda w: lc_lazy_if(lc_bin_less_than(i)(w))(
+        lambda: _lc_ra_tree_at(w)(lc_second(lc_first(l)))(i)
+    )(
+        lambda: lc_ralist_at_bin(lc_second(l))(lc_bin_sub(i)(w))
+    ))(lc_first(lc_first(l)))
+)
+
+_lc_ra_tree_update = lambda w: lambda t: lambda i: lambda v: lc_lazy_if(lc_bin_is_zero(i))(
+    lambda: lc_pair(v)(lc_second(t))
+)(
+    lambda: (lambda j: lc_lazy_if(lc_bin_less_than(j)(lc_second(w)))(
+        lambda: _lc_ra_node(_lc_ra_root(t))(_lc_ra_tree_update(lc_second(w))(_lc_ra_left(t))(j)(v))(_lc_ra_right(t))
+    )(
+        lambda: _lc_ra_node(_lc_ra_root(t))(_lc_ra_left(t))(
+            _lc_ra_tree_update(lc_second(w))(_lc_ra_right(t))(lc_bin_sub(j)(lc_second(w)))(v))
+    ))(lc_bin_dec(i))
+)
+
+lc_ralist_update_bin = lambda l: lambda i: lambda v: lc_lazy_if(lc_is_nil(l))(
+    lambda: l
+)(
+    lambda: (lambda w: lc_lazy_if(lc_bin_less_than(i)(w))(
+        lambda: lc_cons(lc_pair(w)(_lc_ra_tree_update(w)(lc_second(lc_first(l)))(i)(v)))(lc_second(l))
+    )(
+        lambda: lc_cons(lc_first(l))(lc_ralist_update_bin(lc_second(l))(lc_bin_sub(i)(w))(v))
+    ))(lc_first(lc_first(l)))
+)
+
+_lc_ra_tree_drop = lambda w: lambda t: lambda i: lambda rest: lc_lazy_if(lc_bin_is_zero(i))(
+    lambda: lc_cons(lc_pair(w)(t))(rest)
+)(
+    lambda: (lambda h: lambda j: lc_lazy_if(lc_bin_less_than(j)(h))(
+        lambda: _lc_ra_tree_drop(h)(_lc_ra_left(t))(j)(lc_cons(lc_pair(h)(_lc_ra_right(t)))(rest))
+    )(
+        lambda: _lc_ra_tree_drop(h)(_lc_ra_right(t))(lc_bin_sub(j)(h))(rest)
+    ))(lc_second(w))(lc_bin_dec(i))
+)
+
+lc_ralist_drop_bin = lambda l: lambda i: lc_lazy_if(lc_is_nil(l))(
+    lambda: l
+)(
+    lambda: (lambda w: lc_lazy_if(lc_bin_less_than(i)(w))(
+        lambda: _lc_ra_tree_drop(w)(lc_second(lc_first(l)))(i)(lc_second(l))
+    )(
+        lambda: lc_ralist_drop_bin(lc_second(l))(lc_bin_sub(i)(w))
+    ))(lc_first(lc_first(l)))
+)
+
+_lc_ra_tree_take = lambda w: lambda t: lambda i: lc_lazy_if(lc_bin_is_zero(i))(
+    lambda: lc_nil
+)(
+    lambda: lc_cons(lc_pair(_lc_ra_one)(_lc_ra_leaf(_lc_ra_root(t))))(
+        (lambda h: lambda j: lc_lazy_if(lc_bin_less_than(j)(h))(
+            lambda: _lc_ra_tree_take(h)(_lc_ra_left(t))(j)
+        )(
+            lambda: lc_cons(lc_pair(h)(_lc_ra_left(t)))(_lc_ra_tree_take(h)(_lc_ra_right(t))(lc_bin_sub(j)(h)))
+        ))(lc_second(w))(lc_bin_dec(i)))
+)
 
-lc_list_take = lambda l: lambda n: lc_if(lc_or(lc_is_nil(l))(lc_is_zero(n)))(
-    lc_nil
+lc_ralist_take_bin = lambda l: lambda i: lc_lazy_if(lc_or(lc_is_nil(l))(lc_bin_is_zero(i)))(
+    lambda: lc_nil
 )(
-    lc_cons(lc_first(l))(lc_list_take(lc_second(l))(lc_dec(n)))
+    lambda: (lambda w: lc_lazy_if(lc_bin_less_than(i)(w))(
+        lambda: _lc_ra_tree_take(w)(lc_second(lc_first(l)))(i)
+    )(
+        lambda: lc_cons(lc_first(l))(lc_ralist_take_bin(lc_second(l))(lc_bin_sub(i)(w)))
+    ))(lc_first(lc_first(l)))
 )
 
-lc_list_drop = lambda l: lambda n: lc_if(lc_or(lc_is_nil(l))(lc_is_zero(n)))(
-    l
+lc_ralist_slice_bin = lambda l: lambda start: lambda end: lc_ralist_take_bin(lc_ralist_drop_bin(l)(start))(lc_bin_sub(end)(start))
+
+# Church-numeral indexes, matching the lc_list_* signatures.
+lc_ralist_at = lambda l: lambda n: lc_ralist_at_bin(l)(lc_num_to_bin(n))
+lc_ralist_update = lambda l: lambda n: lambda v: lc_ralist_update_bin(l)(lc_num_to_bin(n))(v)
+lc_ralist_take = lambda l: lambda n: lc_ralist_take_bin(l)(lc_num_to_bin(n))
+lc_ralist_drop = lambda l: lambda n: lc_ralist_drop_bin(l)(lc_num_to_bin(n))
+lc_ralist_slice = lambda l: lambda start: lambda end: lc_ralist_slice_bin(l)(lc_num_to_bin(start))(lc_num_to_bin(end))
+
+_lc_ralist_foldl_step = lambda f: lambda acc: lambda l: lc_lazy_if(lc_is_nil(l))(
+    lambda: acc
+)(
+    lambda: lc_bounce(lambda: _lc_ralist_foldl_step(f)(f(acc)(lc_ralist_head(l)))(lc_ralist_tail(l)))
+)
+
+lc_ralist_foldl = lambda f: lambda acc: lambda l: lc_trampoline(_lc_ralist_foldl_step(f)(acc)(l))
+lc_ralist_length = lambda l: lc_list_foldl(lambda acc: lambda entry: lc_add(acc)(lc_bin_to_num(lc_first(entry))))(lc_zero)(l)
+
+_lc_ra_tree_map = lambda f: lambda t: lc_lazy_if(_lc_ra_is_leaf(t))(
+    lambda: _lc_ra_leaf(f(_lc_ra_root(t)))
 )(
-    lc_list_drop(lc_second(l))(lc_dec(n))
+    lambda: _lc_ra_node(f(_lc_ra_root(t)))(_lc_ra_tree_map(f)(_lc_ra_left(t)))(_lc_ra_tree_map(f)(_lc_ra_right(t)))
 )
 
+lc_ralist_map = lambda f: lc_list_map(lambda entry: lc_pair(lc_first(entry))(_lc_ra_tree_map(f)(lc_second(entry))))
+
+# Conversions to and from pair-based lists, both O(n).
+lc_ralist_to_list = lambda l: lc_list_reverse(lc_ralist_foldl(lambda acc: lambda x: lc_cons(x)(acc))(lc_nil)(l))
+lc_ralist_from_list = lambda l: lc_list_foldr(lc_ralist_cons)(lc_ralist_empty)(l)
+
+lc_ralist_reverse = lambda l: lc_ralist_foldl(lambda acc: lambda x: lc_ralist_cons(x)(acc))(lc_ralist_empty)(l)
+lc_ralist_foldr = lambda f: lambda acc: lambda l: lc_ralist_foldl(lambda acc: lambda x: f(x)(acc))(acc)(lc_ralist_reverse(l))
+lc_ralist_append = lambda l1: lambda l2: lc_ralist_foldr(lc_ralist_cons)(l2)(l1)
+lc_ralist_filter = lambda pred: lambda l: lc_ralist_from_list(lc_list_filter(pred)(lc_ralist_to_list(l)))
+
 # Trees
 lc_tree_empty = lc_nil
 lc_tree_make = lambda value: lambda left: lambda right: lc_list(value)(left)(right)
@@ -150,48 +597,130 @@ lc_tree_is_empty = lc_is_nil
 # Graphs (Adjacency Lists Representation)
 lc_graph_empty = lc_nil
 lc_graph_add_vertex = lambda g: lambda vertex: lc_cons(lc_pair(vertex)(lc_nil))(g)
-lc_graph_add_edge = lambda g: lambda v1: lambda v2: lc_if(lc_is_nil(g))(
-    lc_graph_empty
+lc_graph_add_edge = lambda g: lambda v1: lambda v2: lc_list_map(
+    lambda entry: lc_lazy_if(lc_equal(v1)(lc_first(entry)))(
+        lambda: lc_pair(lc_first(entry))(lc_cons(v2)(lc_second(entry)))
+    )(
+        lambda: entry
+    )
+)(g)
+
+# Optional type (Maybe monad)
+lc_maybe_some = lambda x: lc_pair(lc_true)(x)
+lc_maybe_none = lc_pair(lc_false)(lc_nil)
+lc_maybe_is_some = lambda m: lc_first(m)
+lc_maybe_is_none = lambda m: lc_not(lc_maybe_is_some(m))
+lc_maybe_map = lambda f: lambda m: lc_lazy_if(lc_maybe_is_some(m))(
+    lambda: lc_maybe_some(f(lc_second(m)))
 )(
-    lc_cons(
-        lc_if(lc_equal(v1)(lc_first(lc_first(g))))(
-            lc_pair(lc_first(lc_first(g)))(lc_cons(v2)(lc_second(lc_first(g))))
-        )(
-            lc_first(g)
-        )
+    lambda: lc_maybe_none
+)
+
+# Binary Tries
+# A trie is lc_nil or a node pairing a Maybe value with the subtries for a
+# next key bit of 0 and 1. Keys are binary numerals, so insert, lookup and
+# remove touch one node per key bit, and nodes left without a value or
+# children are pruned so removed keys are reclaimed. Union, intersection and
+# difference walk both tries together and share untouched subtries.
+_lc_trie_leaf = lc_pair(lc_maybe_none)(lc_pair(lc_nil)(lc_nil))
+_lc_trie_view = lambda t: lc_lazy_if(lc_is_nil(t))(lambda: _lc_trie_leaf)(lambda: t)
+_lc_trie_value = lambda n: lc_first(n)
+_lc_trie_zero = lambda n: lc_first(lc_second(n))
+_lc_trie_one = lambda n: lc_second(lc_second(n))
+_lc_trie_node = lambda v: lambda z: lambda o: lc_lazy_if(
+    lc_and(lc_maybe_is_none(v))(lc_and(lc_is_nil(z))(lc_is_nil(o)))
+)(
+    lambda: lc_nil
+)(
+    lambda: lc_pair(v)(lc_pair(z)(o))
+)
+
+lc_trie_empty = lc_nil
+lc_trie_is_empty = lc_is_nil
+
+lc_trie_alter = lambda f: lambda t: lambda k: (lambda n: lc_lazy_if(lc_is_nil(k))(
+    lambda: _lc_trie_node(f(_lc_trie_value(n)))(_lc_trie_zero(n))(_lc_trie_one(n))
+)(
+    lambda: lc_lazy_if(lc_first(k))(
+        lambda: _lc_trie_node(_lc_trie_value(n))(_lc_trie_zero(n))(lc_trie_alter(f)(_lc_trie_one(n))(lc_second(k)))
     )(
-        lc_graph_add_edge(lc_second(g))(v1)(v2)
+        lambda: _lc_trie_node(_lc_trie_value(n))(lc_trie_alter(f)(_lc_trie_zero(n))(lc_second(k)))(_lc_trie_one(n))
     )
+))(_lc_trie_view(t))
+
+lc_trie_insert = lambda t: lambda k: lambda v: lc_trie_alter(lambda old: lc_maybe_some(v))(t)(k)
+lc_trie_remove = lambda t: lambda k: lc_trie_alter(lambda old: lc_maybe_none)(t)(k)
+
+lc_trie_lookup = lambda t: lambda k: lc_lazy_if(lc_is_nil(t))(
+    lambda: lc_maybe_none
+)(
+    lambda: lc_lazy_if(lc_is_nil(k))(
+        lambda: _lc_trie_value(t)
+    )(
+        lambda: lc_trie_lookup(lc_first(k)(_lc_trie_one(t))(_lc_trie_zero(t)))(lc_second(k))
+    )
+)
+
+# Left-biased: where both tries hold a key, the value from t1 wins.
+lc_trie_union = lambda t1: lambda t2: lc_lazy_if(lc_is_nil(t1))(
+    lambda: t2
+)(
+    lambda: lc_lazy_if(lc_is_nil(t2))(
+        lambda: t1
+    )(
+        lambda: lc_pair(lc_maybe_is_some(_lc_trie_value(t1))(_lc_trie_value(t1))(_lc_trie_value(t2)))(
+            lc_pair(lc_trie_union(_lc_trie_zero(t1))(_lc_trie_zero(t2)))(
+                lc_trie_union(_lc_trie_one(t1))(_lc_trie_one(t2))))
+    )
+)
+
+lc_trie_intersection = lambda t1: lambda t2: lc_lazy_if(lc_or(lc_is_nil(t1))(lc_is_nil(t2)))(
+    lambda: lc_nil
+)(
+    lambda: _lc_trie_node(lc_maybe_is_some(_lc_trie_value(t2))(_lc_trie_value(t1))(lc_maybe_none))(
+        lc_trie_intersection(_lc_trie_zero(t1))(_lc_trie_zero(t2)))(
+        lc_trie_intersection(_lc_trie_one(t1))(_lc_trie_one(t2)))
+)
+
+lc_trie_difference = lambda t1: lambda t2: lc_lazy_if(lc_or(lc_is_nil(t1))(lc_is_nil(t2)))(
+    lambda: t1
+)(
+    lambda: _lc_trie_node(lc_maybe_is_some(_lc_trie_value(t2))(lc_maybe_none)(_lc_trie_value(t1)))(
+        lc_trie_difference(_lc_trie_zero(t1))(_lc_trie_zero(t2)))(
+        lc_trie_difference(_lc_trie_one(t1))(_lc_trie_one(t2)))
 )
 
-# Dictionaries
-lc_dict_empty = lambda k: lc_false
-lc_dict_insert = lambda d: lambda k: lambda v: lambda k_: lc_if(lc_equal(k)(k_))(v)(d(k_))
-lc_dict_lookup = lambda d: lambda k: d(k)
+# Dictionaries (Binary Tries Keyed by Church Numerals)
+lc_dict_empty = lc_trie_empty
+lc_dict_insert = lambda d: lambda k: lambda v: lc_trie_insert(d)(lc_num_to_bin(k))(v)
+lc_dict_lookup = lambda d: lambda k: (lambda m: lc_maybe_is_some(m)(lc_second(m))(lc_false))(lc_trie_lookup(d)(lc_num_to_bin(k)))
 lc_dict_update = lambda d: lambda k: lambda v: lc_dict_insert(d)(k)(v)
-lc_dict_remove = lambda d: lambda k: lambda k_: lc_if(lc_equal(k)(k_))(lc_false)(d(k_))
+lc_dict_remove = lambda d: lambda k: lc_trie_remove(d)(lc_num_to_bin(k))
+
+# Closure-chain dictionaries: each insert wraps the previous dict, so lookups
+# walk every insertion. Kept for comparison and for keys that only have an
+# equality test; the _by variants take that test.
+lc_chain_dict_empty = lambda k: lc_false
+lc_chain_dict_insert_by = lambda eq: lambda d: lambda k: lambda v: lambda k_: lc_lazy_if(eq(k)(k_))(lambda: v)(lambda: lc_bounce(lambda: d(k_)))
+lc_chain_dict_insert = lc_chain_dict_insert_by(lc_equal)
+lc_chain_dict_lookup = lambda d: lambda k: lc_trampoline(d(k))
+lc_chain_dict_remove_by = lambda eq: lambda d: lambda k: lambda k_: lc_lazy_if(eq(k)(k_))(lambda: lc_false)(lambda: lc_bounce(lambda: d(k_)))
+lc_chain_dict_remove = lc_chain_dict_remove_by(lc_equal)
 
 # Sets (Using Dictionaries)
+# A set is a dictionary mapping its members to lc_true. lc_set_insert takes
+# the set and the member only (s)(x); it used to be lc_dict_insert itself
+# and take a third, value argument, which callers must now drop.
 lc_set_empty = lc_dict_empty
-lc_set_insert = lc_dict_insert
-lc_set_member = lambda s: lambda x: lc_not(lc_is_nil(s(x)))
+lc_set_insert = lambda s: lambda x: lc_dict_insert(s)(x)(lc_true)
+lc_set_member = lambda s: lambda x: lc_dict_lookup(s)(x)
 lc_set_remove = lc_dict_remove
-lc_set_union = lambda s1: lambda s2: lambda x: lc_or(s1(x))(s2(x))
-lc_set_intersection = lambda s1: lambda s2: lambda x: lc_and(s1(x))(s2(x))
-lc_set_difference = lambda s1: lambda s2: lambda x: lc_and(s1(x))(lc_not(s2(x)))
+lc_set_is_empty = lc_trie_is_empty
+lc_set_union = lc_trie_union
+lc_set_intersection = lc_trie_intersection
+lc_set_difference = lc_trie_difference
+lc_set_subset = lambda s1: lambda s2: lc_set_is_empty(lc_set_difference(s1)(s2))
 lc_set_equal = lambda s1: lambda s2: lc_and(lc_set_subset(s1)(s2))(lc_set_subset(s2)(s1))
-lc_set_subset = lambda s1: lambda s2: lc_list_foldl(lambda acc: lambda x: lc_and(acc)(s2(x)))(lc_true)(s1)
-
-# Optional type (Maybe monad)
-lc_maybe_some = lambda x: lc_pair(lc_true)(x)
-lc_maybe_none = lc_pair(lc_false)(lc_nil)
-lc_maybe_is_some = lambda m: lc_first(m)
-lc_maybe_is_none = lambda m: lc_not(lc_maybe_is_some(m))
-lc_maybe_map = lambda f: lambda m: lc_if(lc_maybe_is_some(m))(
-    lc_maybe_some(f(lc_second(m)))
-)(
-    lc_maybe_none
-)
 
 # Identity and Combinators
 lc_i = lambda x: x  # Identity combinator
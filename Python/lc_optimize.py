@@ -0,0 +1,366 @@
+# Optimising Compiler from lc.py Definitions to Flattened Python
+# Filename: lc_optimize.py
+# Usage: python lc_optimize.py                  # print frames saved per operation
+#        python lc_optimize.py -o lc_flat.py    # also write the optimised module
+#
+# The definitions are read as terms from beta_reduction.py, with references
+# to earlier definitions kept as Global nodes instead of being inlined. The
+# passes below rewrite them, and emit() turns the result back into curried
+# Python lambdas. Python evaluates arguments eagerly, so every pass keeps
+# the call-by-value behaviour of the original:
+#
+#   inline  A known definition applied at a call site is replaced by its
+#           body when it is small. References passed as data stay globals.
+#   beta    (λx. b) a is contracted when a is a value (variable, lambda or
+#           global), or when x occurs once in b and not under a lambda, so
+#           a is still evaluated exactly once. A lambda applied to all its
+#           arguments is contracted in one step. With lc_true, lc_false and
+#           lc_if inlined this also folds conditionals on known booleans.
+#   dead    (λx. b) a with x unused and a a value becomes b.
+#   eta     λx. f x becomes f when f is a variable, lambda or global, so no
+#           computation moves from call time to definition time.
+#
+# Recursive lc.py definitions (lc_div, the list functions, ...) are not in
+# the term table and are left as they are. A definition that would not stop
+# reducing, such as lc_y, runs out of fuel and is emitted unchanged.
+
+import argparse
+import sys
+import types
+from typing import Dict, List, Optional, Tuple
+
+from beta_reduction import App, LC_SOURCES, Lam, Term, Var, instantiate, parse, shift
+
+DEFAULT_INLINE_SIZE = 24
+DEFAULT_FUEL = 1000
+MAX_ROUNDS = 50
+
+
+class _OutOfFuel(Exception):
+    pass
+
+
+class Global(Term):
+    """A reference to a named definition."""
+    __slots__ = ('name',)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.free = 0
+        self.hash = hash(('global', name))
+
+
+def size(term: Term) -> int:
+    """Count the nodes of a term."""
+    count = 0
+    stack = [term]
+    while stack:
+        node = stack.pop()
+        count += 1
+        if node.__class__ is Lam:
+            stack.append(node.body)
+        elif node.__class__ is App:
+            stack.append(node.fn)
+            stack.append(node.arg)
+    return count
+
+
+def _is_value(term: Term) -> bool:
+    return term.__class__ is not App
+
+
+def _occurrences(term: Term, depth: int = 0) -> Tuple[int, bool]:
+    """Count uses of the variable bound `depth` binders out, and whether any is under a lambda."""
+    count, under_lambda = 0, False
+    stack = [(term, depth, False)]
+    while stack:
+        node, d, in_lambda = stack.pop()
+        if node.free <= d:
+            continue
+        if node.__class__ is Var:
+            if node.index == d:
+                count += 1
+                under_lambda = under_lambda or in_lambda
+        elif node.__class__ is Lam:
+            stack.append((node.body, d + 1, True))
+        elif node.__class__ is App:
+            stack.append((node.fn, d, in_lambda))
+            stack.append((node.arg, d, in_lambda))
+    return count, under_lambda
+
+
+class Optimizer:
+    """
+    Rewrite lc.py definitions to fewer, larger Python functions.
+
+    Args:
+        inline_size: Largest optimised definition, in term nodes, that is
+            inlined at its call sites.
+        fuel: Most beta contractions spent on one definition.
+
+    Attributes:
+        terms: Definition name to its term with Global references.
+        optimized: Definition name to its optimised term.
+        rewrites: Count of each kind of rewrite applied.
+    """
+
+    def __init__(self, inline_size: int = DEFAULT_INLINE_SIZE, fuel: int = DEFAULT_FUEL):
+        self.inline_size = inline_size
+        self.fuel = fuel
+        self._fuel = 0
+        self.terms: Dict[str, Term] = {}
+        self.optimized: Dict[str, Term] = {}
+        self.rewrites = {'inline': 0, 'beta': 0, 'dead': 0, 'eta': 0}
+        globals_: Dict[str, Term] = {}
+        for name, source in LC_SOURCES:
+            self.terms[name] = parse(source, globals_)
+            globals_[name] = Global(name)
+        for name in self.terms:
+            self.optimized[name] = self.optimize(self.terms[name])
+
+    def _inlinable(self, name: str) -> Optional[Term]:
+        term = self.optimized.get(name)
+        if term is not None and size(term) <= self.inline_size:
+            return term
+        return None
+
+    def _rewrite(self, term: Term) -> Term:
+        """One bottom-up pass applying every rule once per node."""
+        if term.__class__ is Lam:
+            body = self._rewrite(term.body)
+            # eta: λx. f x  ->  f, when x is not free in f and f is a value.
+            if (body.__class__ is App and body.arg.__class__ is Var and body.arg.index == 0
+                    and _is_value(body.fn) and _occurrences(body.fn)[0] == 0):
+                self.rewrites['eta'] += 1
+                return shift(body.fn, -1)
+            return term if body is term.body else Lam(body, term.name)
+        if term.__class__ is not App:
+            return term
+        spine = []
+        node = term
+        while node.__class__ is App:
+            spine.append(node.arg)
+            node = node.fn
+        head = self._rewrite(node)
+        args = [self._rewrite(arg) for arg in reversed(spine)]
+        if head.__class__ is Global:
+            inlined = self._inlinable(head.name)
+            if inlined is not None:
+                self.rewrites['inline'] += 1
+                head = inlined
+        contracted = self._contract(head, args)
+        if contracted is not None:
+            return self._rewrite(contracted)
+        if head is node and all(a is b for a, b in zip(args, reversed(spine))):
+            return term
+        return self._apply(head, args)
+
+    def _contract(self, head: Term, args: List[Term]) -> Optional[Term]:
+        """
+        Beta-reduce a head lambda against its arguments, or return None.
+
+        All binders the arguments saturate are contracted at once, which is
+        safe when every argument that is not a value is used exactly once
+        and outside any lambda of the remaining body: each one is then still
+        evaluated exactly once. Otherwise only the first argument is tried
+        on its own, and an unused binder is dropped when its argument is a
+        value.
+        """
+        if head.__class__ is not Lam:
+            return None
+        binders, body = 0, head
+        while body.__class__ is Lam and binders < len(args):
+            binders, body = binders + 1, body.body
+        saturated = True
+        for i in range(binders):
+            if not _is_value(args[i]) and _occurrences(body, binders - 1 - i) != (1, False):
+                saturated = False
+                break
+        if not saturated:
+            count, under_lambda = _occurrences(head.body)
+            if count == 0 and _is_value(args[0]):
+                self.rewrites['dead'] += 1
+                return self._apply(shift(head.body, -1), args[1:])
+            if not (_is_value(args[0]) or (count == 1 and not under_lambda)):
+                return None
+            binders = 1
+        if self._fuel < binders:
+            raise _OutOfFuel
+        self._fuel -= binders
+        self.rewrites['beta'] += binders
+        for arg in args[:binders]:
+            head = instantiate(head.body, arg)
+        return self._apply(head, args[binders:])
+
+    @staticmethod
+    def _apply(term: Term, args: List[Term]) -> Term:
+        for arg in args:
+            term = App(term, arg)
+        return term
+
+    def optimize(self, term: Term) -> Term:
+        """
+        Rewrite a term until no rule applies.
+
+        Returns the term unchanged if it needs more than `fuel` beta
+        contractions or MAX_ROUNDS passes.
+        """
+        original, self._fuel = term, self.fuel
+        try:
+            for _ in range(MAX_ROUNDS):
+                rewritten = self._rewrite(term)
+                if rewritten is term:
+                    return term
+                term = rewritten
+        except (_OutOfFuel, RecursionError):
+            pass
+        return original
+
+
+def emit(name: str, term: Term) -> str:
+    """Render a term as a Python assignment of nested lambdas."""
+    out: List[str] = []
+    stack: list = [(term, None, False)]
+    while stack:
+        item = stack.pop()
+        if item.__class__ is str:
+            out.append(item)
+            continue
+        node, scope, wrap = item
+        if node.__class__ is Var:
+            names = scope
+            for _ in range(node.index):
+                names = names[1]
+            out.append(names[0])
+        elif node.__class__ is Global:
+            out.append(node.name)
+        elif node.__class__ is Lam:
+            taken, names = set(), scope
+            while names:
+                taken.add(names[0])
+                names = names[1]
+            param, suffix = node.name, 1
+            while param in taken:
+                param, suffix = f"{node.name}{suffix}", suffix + 1
+            if wrap:
+                out.append('(')
+                stack.append(')')
+            out.append(f"lambda {param}: ")
+            stack.append((node.body, (param, scope), False))
+        else:
+            stack.append(')')
+            stack.append((node.arg, scope, False))
+            stack.append('(')
+            stack.append((node.fn, scope, True))
+    return f"{name} = {''.join(out)}"
+
+
+def build_source(optimizer: Optional[Optimizer] = None) -> str:
+    """Return Python source defining every optimised lc.py definition."""
+    optimizer = optimizer or Optimizer()
+    lines = ["# Generated by lc_optimize.py from the lc.py definitions. Do not edit.", ""]
+    for name, term in optimizer.optimized.items():
+        lines.append(emit(name, term))
+    return '\n'.join(lines) + '\n'
+
+
+def build_module(optimizer: Optional[Optimizer] = None) -> types.ModuleType:
+    """Execute the optimised source as a fresh module."""
+    module = types.ModuleType('lc_flat')
+    exec(compile(build_source(optimizer), 'lc_flat.py', 'exec'), module.__dict__)
+    return module
+
+
+def count_frames(fn) -> Tuple[object, int]:
+    """Call `fn` and count the Python frames entered, via sys.setprofile."""
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event == 'call':
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        result = fn()
+    finally:
+        sys.setprofile(None)
+    return result, calls
+
+
+def _samples(m) -> Dict[str, object]:
+    def numeral(n):
+        result = m.lc_zero
+        for _ in range(n):
+            result = m.lc_inc(result)
+        return result
+
+    to_int = lambda n: n(lambda x: x + 1)(0)
+    to_bool = lambda b: b(True)(False)
+    three, five = numeral(3), numeral(5)
+    return {
+        'lc_first': lambda: m.lc_first(m.lc_pair(1)(2)),
+        'lc_second': lambda: m.lc_second(m.lc_pair(1)(2)),
+        'lc_is_nil': lambda: to_bool(m.lc_is_nil(m.lc_cons(1)(m.lc_nil))),
+        'lc_not': lambda: to_bool(m.lc_not(m.lc_true)),
+        'lc_and': lambda: to_bool(m.lc_and(m.lc_true)(m.lc_false)),
+        'lc_or': lambda: to_bool(m.lc_or(m.lc_false)(m.lc_true)),
+        'lc_xor': lambda: to_bool(m.lc_xor(m.lc_true)(m.lc_false)),
+        'lc_is_zero': lambda: to_bool(m.lc_is_zero(three)),
+        'lc_add': lambda: to_int(m.lc_add(three)(five)),
+        'lc_mul': lambda: to_int(m.lc_mul(three)(five)),
+        'lc_sub': lambda: to_int(m.lc_sub(five)(three)),
+        'lc_pow': lambda: to_int(m.lc_pow(three)(three)),
+        'lc_equal': lambda: to_bool(m.lc_equal(five)(five)),
+        'lc_less_than': lambda: to_bool(m.lc_less_than(three)(five)),
+        'lc_greater_than': lambda: to_bool(m.lc_greater_than(three)(five)),
+        'lc_less_than_or_equal': lambda: to_bool(m.lc_less_than_or_equal(five)(three)),
+        'lc_greater_than_or_equal': lambda: to_bool(m.lc_greater_than_or_equal(five)(three)),
+        'lc_max': lambda: to_int(m.lc_max(three)(five)),
+        'lc_min': lambda: to_int(m.lc_min(three)(five)),
+    }
+
+
+def frames_report(module: Optional[types.ModuleType] = None) -> List[Tuple[str, int, int]]:
+    """
+    Count frames per operation in lc.py and in the optimised module.
+
+    Returns:
+        list: `(name, original frames, optimised frames)` per operation.
+
+    Raises:
+        AssertionError: If an optimised operation returns a different result.
+    """
+    import lc
+    module = module or build_module()
+    original, optimized = _samples(lc), _samples(module)
+    rows = []
+    for name, run in original.items():
+        expected, before = count_frames(run)
+        result, after = count_frames(optimized[name])
+        if result != expected:
+            raise AssertionError(f"{name}: optimised result {result!r} != {expected!r}")
+        rows.append((name, before, after))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Optimise the lc.py definitions into flattened Python.")
+    parser.add_argument('-o', '--output', help="write the optimised module to this file")
+    parser.add_argument('--inline-size', type=int, default=DEFAULT_INLINE_SIZE,
+                        help="largest definition, in term nodes, to inline at call sites")
+    args = parser.parse_args(argv)
+
+    optimizer = Optimizer(args.inline_size)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(build_source(optimizer))
+    print(f"{'operation':<28}{'lc.py':>8}{'flat':>8}{'saved':>8}")
+    for name, before, after in frames_report(build_module(optimizer)):
+        print(f"{name:<28}{before:>8}{after:>8}{(before - after) / before:>8.0%}")
+    print("rewrites: " + ', '.join(f"{k} {v}" for k, v in optimizer.rewrites.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
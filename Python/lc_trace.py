@@ -0,0 +1,199 @@
+# Application and Allocation Tracing for Church-Encoded Programs
+# Filename: lc_trace.py
+# Usage: with Tracer() as tracer:
+#            lc.lc_div(m)(n)
+#        print(tracer.report())
+#        tracer.write_collapsed("div.folded")  # input for flamegraph.pl
+#
+# Definitions in lc.py call each other through module globals, so the
+# tracer swaps every `lc_*` global for a counting wrapper while it is active
+# and puts the originals back on exit. Nothing is patched otherwise, so an
+# untraced run executes exactly the same code as before.
+#
+# Closures created by a traced definition (partial applications such as
+# lc_sub(m), pairs, thunks for lc_lazy_if) are wrapped the first time they
+# are passed to or returned from a traced call. Their applications and
+# allocations are charged to the definition whose code created them.
+
+import sys
+from collections import Counter
+from types import CodeType, FunctionType
+
+DEFAULT_PREFIXES = ('lc_', '_lc_')
+
+
+def _nested_codes(code):
+    """Yield a code object and every code object defined inside it."""
+    pending = [code]
+    while pending:
+        code = pending.pop()
+        yield code
+        pending.extend(const for const in code.co_consts if isinstance(const, CodeType))
+
+
+class _Traced:
+    """A callable standing in for a definition or a closure it created."""
+    __slots__ = ('name', 'fn', 'tracer')
+
+    def __init__(self, name, fn, tracer):
+        self.name = name
+        self.fn = fn
+        self.tracer = tracer
+
+    def __call__(self, *args):
+        tracer = self.tracer
+        if not tracer._saved:
+            # Escaped the traced region: behave like the plain function.
+            return self.fn(*args)
+        tracer.applications[self.name] += 1
+        parent = tracer._node
+        key = (parent, self.name)
+        node = tracer._index.get(key)
+        if node is None:
+            node = tracer._index[key] = len(tracer._frames)
+            tracer._frames.append(key)
+            tracer._hits.append(0)
+        tracer._hits[node] += 1
+        tracer._node = node
+        tracer._depth += 1
+        if tracer._depth > tracer.max_depth:
+            tracer.max_depth = tracer._depth
+        wrap = tracer._wrap
+        try:
+            result = self.fn(*[wrap(arg) for arg in args])
+        finally:
+            tracer._node = parent
+            tracer._depth -= 1
+        return wrap(result)
+
+    def __repr__(self):
+        return f"<traced {self.name}>"
+
+
+class Tracer:
+    """
+    Count applications, closure allocations and call depth per definition.
+
+    Args:
+        modules: Modules whose definitions are traced (default: lc).
+        prefixes: Name prefixes of the globals to trace.
+
+    Attributes:
+        applications: Counter of applications per definition name.
+        closures: Counter of closures allocated per definition name.
+        max_depth: Deepest nesting of traced applications seen.
+    """
+
+    def __init__(self, modules=None, prefixes=DEFAULT_PREFIXES):
+        if modules is None:
+            import lc
+            modules = (lc,)
+        self.modules = tuple(modules)
+        self.prefixes = tuple(prefixes)
+        self.applications = Counter()
+        self.closures = Counter()
+        self.max_depth = 0
+        self._depth = 0
+        self._node = -1
+        self._index = {}
+        self._frames = []
+        self._hits = []
+        self._owners = {}
+        self._saved = []
+
+    def _wrap(self, value):
+        if value.__class__ is FunctionType:
+            owner = self._owners.get(value.__code__)
+            if owner is not None:
+                self.closures[owner] += 1
+                return _Traced(owner, value, self)
+        return value
+
+    def start(self):
+        """Install the wrappers. Prefer using the tracer as a context manager."""
+        if self._saved:
+            raise RuntimeError("Tracer is already active")
+        wrappers = {}
+        for module in self.modules:
+            namespace = vars(module)
+            for name, value in list(namespace.items()):
+                if value.__class__ is not FunctionType or not name.startswith(self.prefixes):
+                    continue
+                # Aliases such as lc_cons = lc_pair share one wrapper and
+                # are reported under the name defined first.
+                wrapper = wrappers.get(id(value))
+                if wrapper is None:
+                    wrapper = wrappers[id(value)] = _Traced(name, value, self)
+                    for code in _nested_codes(value.__code__):
+                        self._owners.setdefault(code, name)
+                self._saved.append((namespace, name, value))
+                namespace[name] = wrapper
+        return self
+
+    def stop(self):
+        """Restore the original definitions."""
+        for namespace, name, value in reversed(self._saved):
+            namespace[name] = value
+        self._saved = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+    def collapsed_stacks(self):
+        """
+        Return stacks of traced applications in collapsed format.
+
+        Returns:
+            list: Lines of the form `outer;inner;leaf count`, where count is
+            the number of applications made with exactly that stack, as
+            read by flamegraph.pl and speedscope.
+        """
+        paths = []
+        for parent, name in self._frames:
+            paths.append(name if parent < 0 else f"{paths[parent]};{name}")
+        return [f"{path} {hits}" for path, hits in zip(paths, self._hits) if hits]
+
+    def write_collapsed(self, path):
+        """Write `collapsed_stacks()` to a file, one stack per line."""
+        with open(path, 'w') as f:
+            for line in self.collapsed_stacks():
+                f.write(line + '\n')
+
+    def report(self, top=20):
+        """
+        Format per-definition totals, most applied first.
+
+        Args:
+            top: Number of definitions to list.
+
+        Returns:
+            str: A table of applications and closure allocations.
+        """
+        lines = [f"{'definition':<32}{'applications':>14}{'closures':>12}"]
+        for name, count in self.applications.most_common(top):
+            lines.append(f"{name:<32}{count:>14}{self.closures[name]:>12}")
+        lines.append(f"{'total':<32}{sum(self.applications.values()):>14}"
+                     f"{sum(self.closures.values()):>12}")
+        lines.append(f"max depth {self.max_depth}")
+        return '\n'.join(lines)
+
+
+# Example usage
+if __name__ == "__main__":
+    import lc
+
+    seventeen, five = lc.lc_zero, lc.lc_zero
+    for i in range(17):
+        seventeen = lc.lc_inc(seventeen)
+        if i < 5:
+            five = lc.lc_inc(five)
+    with Tracer() as tracer:
+        quotient = lc.lc_div(seventeen)(five)
+    print("17 div 5 =", quotient(lambda x: x + 1)(0))
+    print(tracer.report(top=10))
+    if len(sys.argv) > 1:
+        tracer.write_collapsed(sys.argv[1])
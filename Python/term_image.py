@@ -0,0 +1,202 @@
+# Compact Binary Images of Lambda Terms
+# Filename: term_image.py
+# Usage: python term_image.py -o lc.lcimg     # write the lc.py definitions
+#        python term_image.py lc.lcimg        # open an image and list it
+#
+# An image is the node arrays of a TermStore written out as they are in
+# memory, so opening one is an mmap and a header read: nodes are read from
+# the mapping when they are asked for, and nothing is parsed per node.
+# Several processes that open the same image share its pages read-only.
+#
+# Layout (little-endian, every section 4-byte aligned):
+#
+#   header   magic, version, node count, string count, root count,
+#            string data size, 32-byte digest chosen by the writer
+#   kinds    one byte per node: VAR, LAM or APP (see term_store.py)
+#   left     u32 per node: Var index, Lam body or App function
+#   right    u32 per node: App argument, otherwise 0
+#   names    u32 per node: string number of a Lam's name hint
+#   roots    (string number, node) u32 pairs naming the top-level terms
+#   offsets  u32 per string plus one, into the string data
+#   strings  UTF-8 string data
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from typing import Dict
+
+from beta_reduction import LC_TERMS, App, Lam, Term, Var, show
+from term_store import LAM, VAR, TermStore
+
+MAGIC = b'LCTI'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<4sIIIII32s')
+
+
+def _u32(values) -> bytes:
+    data = array('I', values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b'\0' * (-len(data) % 4)
+
+
+def image_bytes(store: TermStore, roots: Dict[str, int], digest: bytes = b'') -> bytes:
+    """Serialise every node of `store`, with `roots` naming the terms of interest."""
+    strings: Dict[str, int] = {'': 0}
+    names = []
+    for node in range(len(store)):
+        name = store.term(node).name if store.kinds[node] == LAM else ''
+        names.append(strings.setdefault(name, len(strings)))
+    root_table = []
+    for name, node in roots.items():
+        root_table += [strings.setdefault(name, len(strings)), node]
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(store), len(strings), len(roots),
+                          offsets[-1], digest.ljust(32, b'\0')[:32])
+    return b''.join([
+        header, _pad(store.kinds.tobytes()), _u32(store.left), _u32(store.right), _u32(names),
+        _u32(root_table), _u32(offsets), b''.join(encoded)])
+
+
+def save_image(store: TermStore, path: str, roots: Dict[str, int], digest: bytes = b'') -> None:
+    """Write an image atomically, so readers never see a partial file."""
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(image_bytes(store, roots, digest))
+    os.replace(temporary, path)
+
+
+class TermImage:
+    """
+    Read-only view of an image, in a buffer or a memory-mapped file.
+
+    `kinds`, `left` and `right` are memoryviews with the same meaning as the
+    arrays of a TermStore. Terms are built from them on first use and kept.
+
+    Raises:
+        ValueError: If the buffer is not an image of this format version.
+    """
+
+    def __init__(self, buffer):
+        if sys.byteorder != 'little':
+            raise ValueError("Term images are only read on little-endian machines")
+        self._buffer = buffer
+        self._view = view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError("Not a term image: too short")
+        magic, version, nodes, strings, roots, size, self.digest = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a term image of version {FORMAT_VERSION}")
+        pos = _HEADER.size
+        sections = []
+        for length, typecode in ((nodes, 'B'), (nodes, 'I'), (nodes, 'I'), (nodes, 'I'),
+                                 (2 * roots, 'I'), (strings + 1, 'I')):
+            width = length * (1 if typecode == 'B' else 4)
+            sections.append(view[pos:pos + width].cast(typecode))
+            pos += width + (-width % 4)
+        self.kinds, self.left, self.right, self._names, root_table, self._offsets = sections
+        self._strings = view[pos:pos + size]
+        if len(self._strings) != size:
+            raise ValueError("Not a term image: truncated")
+        self.roots: Dict[str, int] = {
+            self.string(root_table[i]): root_table[i + 1] for i in range(0, len(root_table), 2)}
+        self._terms: Dict[int, Term] = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'TermImage':
+        """Map an image file read-only."""
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __getitem__(self, name: str) -> Term:
+        return self.term(self.roots[name])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.roots
+
+    def string(self, number: int) -> str:
+        return bytes(self._strings[self._offsets[number]:self._offsets[number + 1]]).decode('utf-8')
+
+    def term(self, node: int) -> Term:
+        """Build (once) the term of a node, sharing subterms that were built before."""
+        terms = self._terms
+        stack = [node]
+        while stack:
+            n = stack[-1]
+            if n in terms:
+                stack.pop()
+                continue
+            kind = self.kinds[n]
+            if kind == VAR:
+                terms[n] = Var(self.left[n])
+            elif kind == LAM:
+                body = terms.get(self.left[n])
+                if body is None:
+                    stack.append(self.left[n])
+                    continue
+                terms[n] = Lam(body, self.string(self._names[n]))
+            else:
+                fn, arg = terms.get(self.left[n]), terms.get(self.right[n])
+                if fn is None or arg is None:
+                    if fn is None:
+                        stack.append(self.left[n])
+                    if arg is None:
+                        stack.append(self.right[n])
+                    continue
+                terms[n] = App(fn, arg)
+            stack.pop()
+        return terms[node]
+
+    def close(self) -> None:
+        """Release the views and the mapping. Terms already built stay usable."""
+        for view in (self.kinds, self.left, self.right, self._names, self._offsets, self._strings, self._view):
+            view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write or inspect binary images of lambda terms.")
+    parser.add_argument('image', nargs='?', help="image to open and list")
+    parser.add_argument('-o', '--output', help="write the lc.py definitions to this image")
+    args = parser.parse_args(argv)
+    if not args.image and not args.output:
+        parser.error("give an image to open or -o to write one")
+
+    if args.output:
+        store = TermStore()
+        save_image(store, args.output, {name: store.add(term) for name, term in LC_TERMS.items()})
+    path = args.image or args.output
+    start = time.perf_counter()
+    image = TermImage.open(path)
+    opened = time.perf_counter() - start
+    print(f"{path}: {len(image)} nodes, {len(image.roots)} roots, opened in {opened * 1000:.3f} ms")
+    for name, node in image.roots.items():
+        print(f"{name:<28}{show(image.term(node))}")
+    image.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+# Hash-Consed Store for Lambda Terms
+# Filename: term_store.py
+# Usage: Import `TermStore` to share and number terms, or run this file to
+#        see which lc.py definitions are the same term.
+#
+# Every distinct term is stored once and numbered densely. Because terms use
+# de Bruijn indices, alpha-equivalent terms are the same node, so equality
+# and hashing of node numbers are constant time whatever the size of the
+# term. Nodes live in three flat arrays (kind, left, right) with a table
+# from (kind, left, right) to node number; the canonical Var/Lam/App object
+# for each node is kept alongside, so interned terms can be handed straight
+# to beta_reduction.normalize.
+#
+# Lambda names are only printing hints and are not part of a node's
+# identity: the canonical Lam keeps the name it was first added with.
+
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from beta_reduction import (DEFAULT_MAX_STEPS, LC_TERMS, NORMAL_ORDER, App, Lam, Term, Var,
+                            normalize, show)
+
+# Node kinds. A Var's left is its index; a Lam's left is its body; an App's
+# left and right are its function and argument.
+VAR = 0
+LAM = 1
+APP = 2
+
+_BIND = 0
+_LAM = 1
+_APPLY = 2
+
+
+class TermStore:
+    """Interns lambda terms so that each distinct term is stored once."""
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.left = array('q')
+        self.right = array('q')
+        self._table: Dict[Tuple[int, int, int], int] = {}
+        self._terms: List[Term] = []
+        # Canonical objects are kept alive by _terms, so their id() is stable.
+        self._ids: Dict[int, int] = {}
+        self._normal: Dict[Tuple[int, str], Tuple[int, int]] = {}
+
+    def __len__(self):
+        return len(self._terms)
+
+    def _node(self, kind: int, left: int, right: int = 0, name: str = 'x') -> int:
+        key = (kind, left, right)
+        node = self._table.get(key)
+        if node is None:
+            node = self._table[key] = len(self._terms)
+            self.kinds.append(kind)
+            self.left.append(left)
+            self.right.append(right)
+            if kind == VAR:
+                term = Var(left)
+            elif kind == LAM:
+                term = Lam(self._terms[left], name)
+            else:
+                term = App(self._terms[left], self._terms[right])
+            self._terms.append(term)
+            self._ids[id(term)] = node
+        return node
+
+    def var(self, index: int) -> int:
+        return self._node(VAR, index)
+
+    def lam(self, body: int, name: str = 'x') -> int:
+        return self._node(LAM, body, 0, name)
+
+    def app(self, fn: int, arg: int) -> int:
+        return self._node(APP, fn, arg)
+
+    def term(self, node: int) -> Term:
+        """Return the canonical term for a node number."""
+        return self._terms[node]
+
+    def add(self, term: Term) -> int:
+        """Intern a term and all its subterms, returning its node number."""
+        node = self._ids.get(id(term))
+        if node is not None and self._terms[node] is term:
+            return node
+        # Subterms shared within `term` are visited once.
+        seen: Dict[int, int] = {}
+        out: List[int] = []
+        stack = [(term, False)]
+        while stack:
+            item, done = stack.pop()
+            if done:
+                if item.__class__ is Lam:
+                    node = self.lam(out.pop(), item.name)
+                else:
+                    arg = out.pop()
+                    node = self.app(out.pop(), arg)
+                seen[id(item)] = node
+                out.append(node)
+                continue
+            node = self._ids.get(id(item))
+            if node is None or self._terms[node] is not item:
+                node = seen.get(id(item))
+            if node is not None:
+                out.append(node)
+            elif item.__class__ is Var:
+                out.append(self.var(item.index))
+            else:
+                stack.append((item, True))
+                if item.__class__ is Lam:
+                    stack.append((item.body, False))
+                else:
+                    stack.append((item.arg, False))
+                    stack.append((item.fn, False))
+        return out[0]
+
+    def intern(self, term: Term) -> Term:
+        """Return the canonical term alpha-equivalent to `term`."""
+        return self._terms[self.add(term)]
+
+    def normalize(self, node: int, strategy: str = NORMAL_ORDER,
+                  max_steps: int = DEFAULT_MAX_STEPS) -> Tuple[int, int]:
+        """
+        Reduce a node to beta normal form, remembering the result.
+
+        Returns:
+            Tuple[int, int]: The node of the normal form and the number of
+            beta steps the first reduction took.
+        """
+        key = (node, strategy)
+        result = self._normal.get(key)
+        if result is None:
+            term, steps = normalize(self._terms[node], strategy, max_steps)
+            result = self._normal[key] = (self.add(term), steps)
+            self._normal.setdefault((result[0], strategy), (result[0], 0))
+        return result
+
+    def add_sexpr(self, expr, definitions: Optional[Dict[str, int]] = None) -> int:
+        """
+        Intern a lambda term written as a Scheme S-expression.
+
+        `expr` is nested lists of identifiers, as read by the Scheme reader.
+        Lambdas and applications of several arguments are curried, and a
+        lambda of no parameters or an application to no arguments stands for
+        its body or operator, which is how lc.scm delays evaluation. Free
+        identifiers are looked up in `definitions`.
+
+        Raises:
+            ValueError: If `expr` uses anything but lambda and application.
+            NameError: If an identifier is neither bound nor defined.
+        """
+        definitions = {} if definitions is None else definitions
+        scope: List[str] = []
+        out: List[int] = []
+        tasks: list = [expr]
+        while tasks:
+            task = tasks.pop()
+            if task.__class__ is tuple:
+                op, payload = task
+                if op == _BIND:
+                    scope.extend(payload)
+                elif op == _LAM:
+                    out.append(self.lam(out.pop(), payload))
+                    scope.pop()
+                else:
+                    args = out[len(out) - payload:]
+                    del out[len(out) - payload:]
+                    node = out.pop()
+                    for arg in args:
+                        node = self.app(node, arg)
+                    out.append(node)
+            elif isinstance(task, str):
+                for depth, name in enumerate(reversed(scope)):
+                    if name == task:
+                        out.append(self.var(depth))
+                        break
+                else:
+                    if task not in definitions:
+                        raise NameError(f"Unbound variable: {task}")
+                    out.append(definitions[task])
+            elif not task:
+                raise ValueError("Empty application ()")
+            elif task[0] == 'lambda' and 'lambda' not in scope:
+                if len(task) != 3 or not isinstance(task[1], list) or \
+                        not all(isinstance(p, str) for p in task[1]):
+                    raise ValueError(f"Not a curried lambda: {task}")
+                params = [str(p) for p in task[1]]
+                tasks.extend((_LAM, name) for name in params)
+                tasks.append(task[2])
+                tasks.append((_BIND, params))
+            elif isinstance(task[0], str) and task[0] in _SPECIAL_FORMS and task[0] not in scope:
+                raise ValueError(f"{task[0]} is not part of the lambda calculus")
+            else:
+                if len(task) > 1:
+                    tasks.append((_APPLY, len(task) - 1))
+                tasks.extend(reversed(task))
+        return out[0]
+
+    def add_definitions(self, forms, definitions: Optional[Dict[str, int]] = None) -> Dict[str, int]:
+        """
+        Intern the top-level `(define name term)` forms of a Scheme program.
+
+        Definitions that are not pure lambda terms, or that refer to such
+        definitions, are skipped.
+
+        Returns:
+            Dict[str, int]: `definitions` (or a new dict) with the node of
+            every definition added.
+        """
+        definitions = {} if definitions is None else definitions
+        for form in forms:
+            if not isinstance(form, list) or len(form) != 3 or form[0] != 'define':
+                continue
+            target, value = form[1], form[2]
+            if isinstance(target, list):
+                # (define (name . params) body)
+                if not target or not isinstance(target[0], str):
+                    continue
+                target, value = target[0], ['lambda', target[1:], value]
+            try:
+                definitions[str(target)] = self.add_sexpr(value, definitions)
+            except (ValueError, NameError):
+                continue
+        return definitions
+
+
+# Forms of the Scheme subset that have no lambda calculus reading.
+_SPECIAL_FORMS = {'quote', 'quasiquote', 'if', 'cond', 'define', 'let', 'let*', 'letrec',
+                  'letrec*', 'begin', 'and', 'or', 'set!', 'case', 'do', 'delay'}
+
+
+# Example
+if __name__ == "__main__":
+    store = TermStore()
+    nodes = {name: store.add(term) for name, term in LC_TERMS.items()}
+    print(f"{len(LC_TERMS)} definitions in {len(store)} nodes")
+    groups: Dict[int, List[str]] = {}
+    for name, node in nodes.items():
+        groups.setdefault(node, []).append(name)
+    for node, names in groups.items():
+        if len(names) > 1:
+            print(f"{show(store.term(node))}: {', '.join(names)}")
@@ -0,0 +1,26 @@
+import unittest
+from benchmarks import cases, compare, measure
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_measure(self):
+        result = measure(lambda: sum(range(100)), repeat=3, min_time=0.001)
+        self.assertLessEqual(result['min'], result['median'])
+        self.assertGreaterEqual(result['number'], 1)
+
+    def test_cases_filter(self):
+        names = [name for name, _ in cases(['lc.list_*'], quick=True)]
+        self.assertEqual(names, ['lc.list_map[1000]', 'lc.list_filter[1000]',
+                                 'lc.list_foldl[1000]', 'lc.list_reverse[1000]'])
+
+    def test_compare_flags_checked_regressions(self):
+        baseline = {'a[1]': {'median': 1.0}, 'b[1]': {'median': 1.0}}
+        results = {'a[1]': {'median': 1.5}, 'b[1]': {'median': 2.0}, 'c[1]': {'median': 9.0}}
+        self.assertEqual(compare(results, baseline), [('a[1]', 1.5), ('b[1]', 2.0)])
+        self.assertEqual(compare(results, baseline, checks=['b*'], threshold=1.5), [])
+        self.assertEqual(compare(results, baseline, checks=['a*']), [('a[1]', 1.5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from beta_reduction import (App, Lam, Var, LC_TERMS, NORMAL_ORDER, APPLICATIVE_ORDER,
+                            ReductionLimitExceeded, beta_reduce, church, instantiate,
+                            normalize, parse, show, to_bool, to_int)
+
+
+class TestBetaReduction(unittest.TestCase):
+
+    def test_python_functions(self):
+        self.assertEqual(beta_reduce(lambda x: x + 1, 5), 6)
+
+    def test_capture_avoiding_substitution(self):
+        # (λx.λy.x) y must not capture the free y
+        term = parse(r'\x. \y. x')
+        result = beta_reduce(term, Var(0))
+        self.assertEqual(result, Lam(Var(1)))
+        self.assertEqual(instantiate(App(Var(0), Var(1)), Var(5)), App(Var(5), Var(0)))
+
+    def test_alpha_equivalence(self):
+        self.assertEqual(parse(r'\x. \y. x'), parse(r'\a. \b. a'))
+        self.assertNotEqual(parse(r'\x. \y. x'), parse(r'\x. \y. y'))
+        self.assertEqual(show(parse(r'\x. \x. x')), 'λx.λx1.x1')
+
+    def test_combinators(self):
+        for strategy in (NORMAL_ORDER, APPLICATIVE_ORDER):
+            skk, steps = normalize(parse('lc_s lc_k lc_k'), strategy)
+            self.assertEqual(skk, LC_TERMS['lc_i'])
+            self.assertGreater(steps, 0)
+
+    def test_arithmetic(self):
+        sub = App(App(LC_TERMS['lc_sub'], church(7)), church(3))
+        self.assertEqual(to_int(normalize(sub)[0]), 4)
+        dec = App(LC_TERMS['lc_dec'], church(10))
+        self.assertEqual(to_int(normalize(dec, APPLICATIVE_ORDER)[0]), 9)
+        equal = parse('lc_equal (lc_add lc_zero (lc_inc lc_zero)) (lc_inc lc_zero)')
+        self.assertTrue(to_bool(normalize(equal)[0]))
+
+    def test_strategies_differ_on_divergent_arguments(self):
+        term = parse(r'lc_k lc_i ((\x. x x) (\x. x x))')
+        self.assertEqual(normalize(term, NORMAL_ORDER)[0], LC_TERMS['lc_i'])
+        with self.assertRaises(ReductionLimitExceeded):
+            normalize(term, APPLICATIVE_ORDER, max_steps=1000)
+
+    def test_large_reduction(self):
+        # Tens of thousands of redexes and a 40,000-deep normal form.
+        sub = App(App(LC_TERMS['lc_sub'], church(200)), church(100))
+        result, steps = normalize(sub)
+        self.assertEqual(to_int(result), 100)
+        self.assertGreater(steps, 10000)
+        mul = App(App(LC_TERMS['lc_mul'], church(200)), church(200))
+        self.assertEqual(to_int(normalize(mul)[0]), 40000)
+
+
+if __name__ == '__main__':
+    unittest.main()
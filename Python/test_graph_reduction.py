@@ -0,0 +1,43 @@
+import unittest
+from beta_reduction import App, LC_TERMS, ReductionLimitExceeded, church
+from graph_reduction import GraphReducer, LAZY_TERMS, church_list
+
+
+class TestGraphReduction(unittest.TestCase):
+
+    def test_arithmetic(self):
+        reducer = GraphReducer()
+        sub = App(App(LC_TERMS['lc_sub'], church(9)), church(4))
+        self.assertEqual(reducer.to_int(sub), 5)
+        self.assertTrue(reducer.to_bool(App(App(LC_TERMS['lc_equal'], church(6)), church(6))))
+        self.assertFalse(reducer.to_bool(App(App(LC_TERMS['lc_less_than'], church(6)), church(2))))
+
+    def test_recursive_definitions_terminate(self):
+        reducer = GraphReducer()
+        self.assertEqual(reducer.to_int(App(App(LAZY_TERMS['lc_div'], church(17)), church(5))), 3)
+        self.assertEqual(reducer.to_int(App(App(LAZY_TERMS['lc_mod'], church(17)), church(5))), 2)
+
+    def test_dictionary_lookup(self):
+        insert = LAZY_TERMS['lc_dict_insert']
+        d = LAZY_TERMS['lc_dict_empty']
+        for key in range(5):
+            d = App(App(App(insert, d), church(key)), church(key * 2))
+        lookup = App(App(LAZY_TERMS['lc_dict_lookup'], d), church(3))
+        self.assertEqual(GraphReducer().to_int(lookup), 6)
+
+    def test_sharing_saves_work(self):
+        length = App(LAZY_TERMS['lc_list_length'], church_list([church(1)] * 50))
+        by_name, by_need = GraphReducer(share=False), GraphReducer(share=True)
+        self.assertEqual(by_name.to_int(length), 50)
+        self.assertEqual(by_need.to_int(length), 50)
+        self.assertGreater(by_name.steps, 5 * by_need.steps)
+        self.assertEqual(by_name.updates, 0)
+
+    def test_step_budget(self):
+        omega = App(LAZY_TERMS['lc_y'], LAZY_TERMS['lc_i'])
+        with self.assertRaises(ReductionLimitExceeded):
+            GraphReducer(max_steps=1000).to_int(omega)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from lambda_calculus import lc_add, lc_mult, lc_map, lc_filter, lc_fold, lc_pair, lc_first, lc_second, lc_is_nil, lc_head, lc_tail, lc_true, lc_false, lc_if, lc_zero, lc_one, lc_two, lc_three, lc_four, lc_five, lc_six, lc_seven, lc_eight, lc_nine, lc_ten, factorial, list_to_church, church_to_list
+from lambda_calculus import lc_add, lc_mult, lc_map, lc_filter, lc_fold, lc_pair, lc_first, lc_second, lc_is_nil, lc_head, lc_tail, lc_true, lc_false, lc_if, lc_zero, lc_one, lc_two, lc_three, lc_four, lc_five, lc_six, lc_seven, lc_eight, lc_nine, lc_ten, factorial, list_to_church, church_to_list, church_to_int, lc_succ, lc_sub, lc_is_zero, lc_eq, ChurchNumeral, int_to_church, iter_to_church, church_to_iter, ints_to_church, church_to_ints, bools_to_church, church_to_bools
 
 
 class TestLambdaCalculus(unittest.TestCase):
@@ -39,5 +39,54 @@ class TestLambdaCalculus(unittest.TestCase):
             church_to_int(factorial(lc_add(lc_two)(lc_succ(lc_two))))(), 120)
 
 
+class TestTaggedNumerals(unittest.TestCase):
+
+    def test_is_a_church_numeral(self):
+        three = int_to_church(3)
+        self.assertEqual(three(lambda x: x + 1)(0), 3)
+        self.assertEqual(three(lambda s: s + "a")(""), "aaa")
+        self.assertEqual(church_to_int(lc_add(three)(lc_two)), 5)
+
+    def test_fast_arithmetic(self):
+        m, n = int_to_church(3_000_000), int_to_church(2_000_000)
+        self.assertEqual(church_to_int(lc_add(m)(n)), 5_000_000)
+        self.assertEqual(church_to_int(lc_mult(m)(n)), 6_000_000_000_000)
+        self.assertEqual(church_to_int(lc_sub(m)(n)), 1_000_000)
+        self.assertEqual(church_to_int(lc_sub(n)(m)), 0)
+        self.assertEqual(church_to_int(lc_succ(m)), 3_000_001)
+        self.assertIs(lc_is_zero(lc_sub(n)(m)), lc_true)
+        self.assertIs(lc_eq(m)(int_to_church(3_000_000)), lc_true)
+        self.assertIsInstance(lc_add(m)(lc_one), ChurchNumeral)
+
+    def test_application_loops(self):
+        n = int_to_church(1_000_000)
+        self.assertEqual(n(lambda x: x + 2)(0), 2_000_000)
+
+
+class TestChurchListConverters(unittest.TestCase):
+
+    def test_round_trip(self):
+        self.assertEqual(church_to_list(list_to_church([1, 2, 3])), [1, 2, 3])
+        self.assertEqual(church_to_list(list_to_church([])), [])
+        self.assertEqual(church_to_list(iter_to_church(x * x for x in range(4))), [0, 1, 4, 9])
+        self.assertEqual(church_to_list(iter_to_church(b"abc")), [97, 98, 99])
+        self.assertEqual(church_to_list(iter_to_church(range(3))), [0, 1, 2])
+
+    def test_lazy_iteration(self):
+        items = church_to_iter(list_to_church([1, 2, 3]))
+        self.assertEqual(next(items), 1)
+        self.assertEqual(list(items), [2, 3])
+
+    def test_large_lists(self):
+        n = 200_000
+        l = iter_to_church(range(n))
+        self.assertEqual(sum(church_to_iter(l)), n * (n - 1) // 2)
+
+    def test_bulk_conversions(self):
+        self.assertEqual(list(church_to_ints(ints_to_church([0, 5, 1_000_000]))), [0, 5, 1_000_000])
+        self.assertEqual(list(church_to_bools(bools_to_church([True, False]))), [True, False])
+        self.assertEqual(church_to_list(lc_map(lambda x: x * 2)(list_to_church([1, 2, 3]))), [2, 4, 6])
+
+
 if __name__ == '__main__':
     unittest.main()
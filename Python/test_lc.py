@@ -0,0 +1,251 @@
+import unittest
+from lc import (lc_zero, lc_inc, lc_true, lc_false, lc_nil, lc_cons, lc_lazy_if, lc_div, lc_mod,
+                lc_list_length, lc_list_append, lc_list_map, lc_list_filter, lc_list_foldl,
+                lc_list_foldr, lc_list_reverse, lc_list_at, lc_list_take, lc_list_drop,
+                lc_list_slice, lc_graph_empty, lc_graph_add_vertex, lc_graph_add_edge, lc_first,
+                lc_second, lc_dict_empty, lc_dict_insert, lc_dict_lookup, lc_maybe_none,
+                lc_maybe_map, lc_maybe_is_some, lc_and, lc_not, lc_is_zero, lc_sub,
+                lc_stream_from, lc_stream_iterate, lc_stream_repeat, lc_stream_cycle,
+                lc_stream_take, lc_stream_drop, lc_stream_map, lc_stream_filter, lc_stream_zip,
+                lc_stream_to_list, lc_stream_from_iter, lc_stream_to_iter, lc_dict_remove,
+                lc_bin_zero, lc_bin_inc, lc_trie_empty, lc_trie_insert, lc_trie_lookup,
+                lc_trie_remove, lc_maybe_is_none, lc_set_empty, lc_set_insert, lc_set_member,
+                lc_set_union, lc_set_intersection, lc_set_difference, lc_set_subset, lc_set_equal,
+                lc_bin_to_num, lc_bin_sub, lc_bin_less_than, lc_bin_add, lc_bin_mul, lc_bin_pow,
+                lc_bin_divmod, lc_bin_equal, lc_bin_from_int, lc_bin_to_int, lc_num_to_bin,
+                lc_ralist_cons, lc_ralist_head, lc_ralist_tail, lc_ralist_at, lc_ralist_at_bin,
+                lc_ralist_update, lc_ralist_take, lc_ralist_drop, lc_ralist_slice, lc_ralist_take_bin,
+                lc_ralist_drop_bin, lc_ralist_length, lc_ralist_map, lc_ralist_foldl, lc_ralist_append,
+                lc_ralist_to_list, lc_ralist_from_list)
+from itertools import count, islice
+
+
+def numeral(n):
+    result = lc_zero
+    for _ in range(n):
+        result = lc_inc(result)
+    return result
+
+
+def to_int(n):
+    return n(lambda x: x + 1)(0)
+
+
+def from_list(items):
+    result = lc_nil
+    for item in reversed(items):
+        result = lc_cons(item)(result)
+    return result
+
+
+def to_list(l):
+    return lc_list_foldr(lambda x: lambda acc: [x] + acc)([])(l)
+
+
+class TestLazyConditionals(unittest.TestCase):
+
+    def test_only_chosen_branch_runs(self):
+        def fail():
+            raise AssertionError("unselected branch evaluated")
+        self.assertEqual(lc_lazy_if(lc_true)(lambda: "yes")(fail), "yes")
+        self.assertEqual(lc_lazy_if(lc_false)(fail)(lambda: "no"), "no")
+
+    def test_division(self):
+        self.assertEqual(to_int(lc_div(numeral(17))(numeral(5))), 3)
+        self.assertEqual(to_int(lc_mod(numeral(17))(numeral(5))), 2)
+        self.assertEqual(to_int(lc_div(numeral(3))(numeral(5))), 0)
+        self.assertEqual(to_int(lc_div(numeral(3))(lc_zero)), 0)
+
+    def test_list_operations(self):
+        l = from_list([1, 2, 3, 4, 5])
+        self.assertEqual(to_int(lc_list_length(l)), 5)
+        self.assertEqual(to_list(lc_list_map(lambda x: x * 10)(l)), [10, 20, 30, 40, 50])
+        is_even = lambda x: lc_true if x % 2 == 0 else lc_false
+        self.assertEqual(to_list(lc_list_filter(is_even)(l)), [2, 4])
+        self.assertEqual(to_list(lc_list_reverse(l)), [5, 4, 3, 2, 1])
+        self.assertEqual(to_list(lc_list_append(l)(from_list([6]))), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(lc_list_at(l)(numeral(3)), 4)
+        self.assertEqual(to_list(lc_list_take(l)(numeral(2))), [1, 2])
+        self.assertEqual(to_list(lc_list_drop(l)(numeral(2))), [3, 4, 5])
+        self.assertEqual(to_list(lc_list_slice(l)(numeral(1))(numeral(3))), [2, 3])
+        self.assertEqual(lc_list_foldl(lambda acc: lambda x: acc - x)(0)(l), -15)
+
+    def test_fold_large_list(self):
+        l = from_list(range(100_000))
+        self.assertEqual(lc_list_foldl(lambda acc: lambda x: acc + x)(0)(l), 4_999_950_000)
+        mapped = lc_list_map(lambda x: x * 2)(from_list(range(10_000)))
+        self.assertEqual(lc_list_foldr(lambda x: lambda acc: max(acc, x))(0)(mapped), 19_998)
+
+    def test_graph_and_dict(self):
+        g = lc_graph_add_vertex(lc_graph_add_vertex(lc_graph_empty)(numeral(1)))(numeral(2))
+        g = lc_graph_add_edge(g)(numeral(1))(numeral(2))
+        entry = lc_first(lc_second(g))
+        self.assertEqual(to_int(lc_first(entry)), 1)
+        self.assertEqual(to_int(lc_first(lc_second(entry))), 2)
+        d = lc_dict_insert(lc_dict_insert(lc_dict_empty)(numeral(1))("one"))(numeral(2))("two")
+        self.assertEqual(lc_dict_lookup(d)(numeral(1)), "one")
+        self.assertIs(lc_dict_lookup(d)(numeral(3)), lc_false)
+        self.assertIs(lc_maybe_is_some(lc_maybe_map(lambda x: x + 1)(lc_maybe_none)), lc_false)
+
+
+class TestStreams(unittest.TestCase):
+
+    def test_first_primes_from_naturals(self):
+        two = numeral(2)
+
+        def is_prime(n):
+            divisors = lc_stream_take(lc_stream_from(two))(lc_sub(n)(two))
+            no_factor = lambda acc: lambda d: lc_and(acc)(lc_not(lc_is_zero(lc_mod(n)(d))))
+            return lc_list_foldl(no_factor)(lc_true)(lc_stream_to_list(divisors))
+
+        primes = lc_stream_take(lc_stream_filter(is_prime)(lc_stream_from(two)))(numeral(10))
+        self.assertEqual([to_int(p) for p in lc_stream_to_iter(primes)],
+                         [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+
+    def test_infinite_operations(self):
+        naturals = lc_stream_iterate(lambda x: x + 1)(0)
+        evens = lc_stream_filter(lambda x: lc_true if x % 2 == 0 else lc_false)(naturals)
+        pairs = lc_stream_zip(lc_stream_map(lambda x: x * x)(evens))(lc_stream_cycle(from_list("ab")))
+        firsts = [(lc_first(p), lc_second(p)) for p in islice(lc_stream_to_iter(pairs), 4)]
+        self.assertEqual(firsts, [(0, 'a'), (4, 'b'), (16, 'a'), (36, 'b')])
+        self.assertEqual(to_list(lc_stream_to_list(lc_stream_take(lc_stream_repeat(7))(numeral(3)))),
+                         [7, 7, 7])
+        self.assertEqual(next(lc_stream_to_iter(lc_stream_drop(naturals)(numeral(50)))), 50)
+        self.assertIs(lc_stream_cycle(lc_nil), lc_nil)
+
+    def test_generator_bridge(self):
+        squares = lc_stream_from_iter(x * x for x in count())
+        self.assertEqual(list(islice(lc_stream_to_iter(squares), 5)), [0, 1, 4, 9, 16])
+        # Tails are memoised, so the one-shot generator can be replayed.
+        self.assertEqual(list(islice(lc_stream_to_iter(squares), 3)), [0, 1, 4])
+        self.assertEqual(list(lc_stream_to_iter(lc_stream_from_iter([]))), [])
+        self.assertEqual(to_list(lc_stream_to_list(lc_stream_from_iter("abc"))), ['a', 'b', 'c'])
+
+    def test_long_pipeline(self):
+        naturals = lc_stream_from_iter(count())
+        total = sum(islice(lc_stream_to_iter(lc_stream_map(lambda x: x + 1)(naturals)), 50_000))
+        self.assertEqual(total, 1_250_025_000)
+
+
+def to_bool(b):
+    return b(True)(False)
+
+
+def make_set(items):
+    s = lc_set_empty
+    for item in items:
+        s = lc_set_insert(s)(numeral(item))
+    return s
+
+
+def members(s, limit=20):
+    return [x for x in range(limit) if to_bool(lc_set_member(s)(numeral(x)))]
+
+
+class TestBinaryTries(unittest.TestCase):
+
+    def test_insert_lookup_remove(self):
+        keys = [lc_bin_zero]
+        for _ in range(2000):
+            keys.append(lc_bin_inc(keys[-1]))
+        t = lc_trie_empty
+        for i, key in enumerate(keys):
+            t = lc_trie_insert(t)(key)(i)
+        self.assertEqual(lc_second(lc_trie_lookup(t)(keys[1234])), 1234)
+        for key in keys:
+            t = lc_trie_remove(t)(key)
+        # Emptied nodes are pruned, leaving nothing behind.
+        self.assertIs(t, lc_trie_empty)
+        self.assertTrue(to_bool(lc_maybe_is_none(lc_trie_lookup(t)(keys[7]))))
+
+    def test_dict_remove(self):
+        d = lc_dict_empty
+        for i in range(10):
+            d = lc_dict_insert(d)(numeral(i))(i * i)
+        d = lc_dict_remove(lc_dict_insert(d)(numeral(3))("three"))(numeral(4))
+        self.assertEqual(lc_dict_lookup(d)(numeral(3)), "three")
+        self.assertIs(lc_dict_lookup(d)(numeral(4)), lc_false)
+        self.assertEqual(lc_dict_lookup(d)(numeral(9)), 81)
+
+    def test_set_operations(self):
+        a, b = make_set([1, 2, 3, 5, 8]), make_set([2, 3, 4, 8, 13])
+        self.assertEqual(members(lc_set_union(a)(b)), [1, 2, 3, 4, 5, 8, 13])
+        self.assertEqual(members(lc_set_intersection(a)(b)), [2, 3, 8])
+        self.assertEqual(members(lc_set_difference(a)(b)), [1, 5])
+        self.assertTrue(to_bool(lc_set_subset(make_set([2, 8]))(a)))
+        self.assertFalse(to_bool(lc_set_subset(b)(a)))
+        self.assertTrue(to_bool(lc_set_equal(lc_set_intersection(a)(b))(make_set([8, 3, 2]))))
+
+
+class TestBinaryNumerals(unittest.TestCase):
+
+    def test_sub_and_compare(self):
+        for a in range(10):
+            for b in range(10):
+                x, y = lc_bin_from_int(a), lc_bin_from_int(b)
+                self.assertEqual(to_int(lc_bin_to_num(lc_bin_sub(x)(y))), max(a - b, 0))
+                self.assertEqual(to_bool(lc_bin_less_than(x)(y)), a < b)
+
+    def test_arithmetic_in_the_thousands(self):
+        for a, b in ((4321, 17), (1000, 1000), (999, 1024), (0, 5), (7, 0)):
+            x, y = lc_bin_from_int(a), lc_bin_from_int(b)
+            self.assertEqual(lc_bin_to_int(lc_bin_add(x)(y)), a + b)
+            self.assertEqual(lc_bin_to_int(lc_bin_mul(x)(y)), a * b)
+            self.assertEqual(to_bool(lc_bin_equal(x)(y)), a == b)
+            quotient, remainder = (a // b, a % b) if b else (0, 0)
+            self.assertEqual(lc_bin_to_int(lc_first(lc_bin_divmod(x)(y))), quotient)
+            self.assertEqual(lc_bin_to_int(lc_second(lc_bin_divmod(x)(y))), remainder)
+        self.assertEqual(lc_bin_to_int(lc_bin_pow(lc_bin_from_int(3))(lc_bin_from_int(100))), 3 ** 100)
+
+    def test_conversions(self):
+        self.assertEqual(lc_bin_to_int(lc_num_to_bin(numeral(300))), 300)
+        self.assertEqual(to_int(lc_bin_to_num(lc_bin_from_int(300))), 300)
+        self.assertIs(lc_bin_from_int(0), lc_nil)
+        with self.assertRaises(ValueError):
+            lc_bin_from_int(-1)
+
+
+class TestRandomAccessLists(unittest.TestCase):
+
+    def ralist(self, items):
+        return lc_ralist_from_list(from_list(items))
+
+    def test_list_api(self):
+        items = list(range(20))
+        l = self.ralist(items)
+        self.assertEqual(to_list(lc_ralist_to_list(l)), items)
+        self.assertEqual(to_int(lc_ralist_length(l)), 20)
+        self.assertEqual(lc_ralist_head(lc_ralist_tail(l)), 1)
+        self.assertEqual(lc_ralist_head(lc_ralist_cons(-1)(l)), -1)
+        self.assertEqual([lc_ralist_at(l)(numeral(i)) for i in range(20)], items)
+        updated = lc_ralist_update(l)(numeral(13))("x")
+        self.assertEqual(to_list(lc_ralist_to_list(updated))[12:15], [12, "x", 14])
+        self.assertEqual(lc_ralist_at(l)(numeral(13)), 13)
+        self.assertEqual(to_list(lc_ralist_to_list(lc_ralist_map(lambda x: x * 2)(l)))[:3], [0, 2, 4])
+        self.assertEqual(lc_ralist_foldl(lambda acc: lambda x: acc + x)(0)(l), 190)
+        both = lc_ralist_append(self.ralist([1, 2]))(self.ralist([3]))
+        self.assertEqual(to_list(lc_ralist_to_list(both)), [1, 2, 3])
+
+    def test_take_drop_slice(self):
+        for n in (0, 1, 6, 7, 15):
+            items = list(range(n))
+            l = self.ralist(items)
+            for i in range(n + 2):
+                taken = lc_ralist_take(l)(numeral(i))
+                self.assertEqual(to_list(lc_ralist_to_list(taken)), items[:i])
+                self.assertEqual(to_list(lc_ralist_to_list(lc_ralist_cons("h")(taken))), ["h"] + items[:i])
+                self.assertEqual(to_list(lc_ralist_to_list(lc_ralist_drop(l)(numeral(i)))), items[i:])
+                sliced = lc_ralist_slice(l)(numeral(i // 2))(numeral(i))
+                self.assertEqual(to_list(lc_ralist_to_list(sliced)), items[i // 2:i])
+
+    def test_large_index(self):
+        # Out of reach for lc_list_at, whose unary index overflows the stack.
+        l = self.ralist(list(range(20_000)))
+        self.assertEqual(lc_ralist_at_bin(l)(lc_bin_from_int(19_999)), 19_999)
+        window = lc_ralist_take_bin(lc_ralist_drop_bin(l)(lc_bin_from_int(12_000)))(lc_bin_from_int(1_000))
+        self.assertEqual(lc_ralist_at_bin(window)(lc_bin_from_int(999)), 12_999)
+        self.assertEqual(lc_ralist_head(window), 12_000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from beta_reduction import App, Lam, Var, parse
+from lc_optimize import Global, Optimizer, build_module, emit, frames_report
+
+
+class TestOptimizer(unittest.TestCase):
+
+    def setUp(self):
+        self.optimizer = Optimizer()
+
+    def optimize(self, source):
+        return self.optimizer.optimize(parse(source, {'g': Global('g')}))
+
+    def flat(self, source):
+        return emit('t', self.optimize(source))[len('t = '):]
+
+    def test_rewrites(self):
+        # eta, and a redex whose argument is a value
+        self.assertEqual(self.flat(r'\x. g x'), 'g')
+        self.assertEqual(self.flat(r'\y. (\x. x y y) g'), 'lambda y: g(y)(y)')
+        # dead binding with a value argument
+        self.assertEqual(self.flat(r'\y. (\x. y) (\z. z)'), 'lambda y: y')
+
+    def test_keeps_call_by_value_cost(self):
+        # The argument g y is not a value and x is used twice: no contraction.
+        term = self.optimize(r'\y. (\x. x x) (g y)')
+        self.assertIsInstance(term.body.fn, Lam)
+        # Used once under a lambda would delay it from call to every use.
+        term = self.optimize(r'\y. (\x. \z. x) (g y)')
+        self.assertIsInstance(term.body.fn, Lam)
+        # Eta must not move g y from call time to definition time.
+        term = self.optimize(r'\y. \x. g y x')
+        self.assertIsInstance(term.body, Lam)
+
+    def test_inlines_known_combinators(self):
+        flat = self.optimizer.optimized
+        self.assertEqual(emit('lc_less_than', flat['lc_less_than']),
+                         'lc_less_than = lambda m: lambda n: '
+                         'm(lc_dec)(n)(lambda x: lc_false)(lc_true)(lc_false)(lc_true)')
+        # lc_y would reduce forever; it is left as written.
+        self.assertIs(flat['lc_y'], self.optimizer.terms['lc_y'])
+        self.assertEqual(emit('t', App(Lam(Lam(Var(1), 'x'), 'x'), Global('g'))),
+                         't = (lambda x: lambda x1: x)(g)')
+
+    def test_module_matches_lc(self):
+        rows = frames_report(build_module(self.optimizer))
+        self.assertTrue(all(after <= before for _, before, after in rows))
+        saved = {name: before - after for name, before, after in rows}
+        self.assertGreater(saved['lc_less_than'], 0)
+        self.assertGreater(saved['lc_max'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import lc
+from lc_trace import Tracer
+
+
+def numeral(n):
+    result = lc.lc_zero
+    for _ in range(n):
+        result = lc.lc_inc(result)
+    return result
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_counts_applications(self):
+        m, n = numeral(7), numeral(3)
+        with Tracer() as tracer:
+            result = lc.lc_sub(m)(n)
+        self.assertEqual(result(lambda x: x + 1)(0), 4)
+        # lc_sub applies lc_dec once per unit of n, and each lc_dec walks m.
+        self.assertEqual(tracer.applications['lc_sub'], 2)
+        self.assertGreaterEqual(tracer.applications['lc_dec'], 3)
+        self.assertGreater(tracer.closures['lc_dec'], 0)
+        self.assertGreater(tracer.max_depth, 1)
+
+    def test_restores_definitions(self):
+        original = lc.lc_dec
+        with Tracer():
+            self.assertIsNot(lc.lc_dec, original)
+            # Aliases share the wrapper of the name defined first.
+            self.assertIs(lc.lc_cons, lc.lc_pair)
+        self.assertIs(lc.lc_dec, original)
+        self.assertEqual(lc.lc_list_length(lc.lc_cons(1)(lc.lc_nil))(lambda x: x + 1)(0), 1)
+
+    def test_collapsed_stacks(self):
+        with Tracer() as tracer:
+            lc.lc_div(numeral(9))(numeral(4))
+        lines = tracer.collapsed_stacks()
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+        self.assertTrue(any(line.startswith('lc_div;') for line in lines))
+        total = sum(int(line.rsplit(' ', 1)[1]) for line in lines)
+        self.assertEqual(total, sum(tracer.applications.values()))
+        self.assertIn('lc_div', tracer.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
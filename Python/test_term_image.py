@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from beta_reduction import App, LC_TERMS, church, normalize, show, to_int
+from term_image import TermImage, image_bytes, save_image
+from term_store import TermStore
+
+
+class TestTermImage(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TermStore()
+        self.roots = {name: self.store.add(term) for name, term in LC_TERMS.items()}
+        self.roots['big'] = self.store.add(church(50000))
+
+    def test_round_trip(self):
+        with TermImage(image_bytes(self.store, self.roots, b'prelude')) as image:
+            self.assertEqual(len(image), len(self.store))
+            self.assertEqual(image.digest.rstrip(b'\0'), b'prelude')
+            self.assertEqual(list(image.kinds), list(self.store.kinds))
+            self.assertEqual(image.roots, self.roots)
+            for name, term in LC_TERMS.items():
+                self.assertEqual(image[name], term)
+                self.assertEqual(show(image[name]), show(self.store.term(self.roots[name])))
+            # Definitions that share a node share the built term.
+            self.assertIs(image['lc_true'], image['lc_k'])
+            self.assertEqual(to_int(image['big']), 50000)
+
+    def test_mapped_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lc.lcimg')
+            save_image(self.store, path, self.roots)
+            with TermImage.open(path) as image:
+                sub = App(App(image['lc_sub'], church(9)), church(4))
+                self.assertEqual(to_int(normalize(sub)[0]), 5)
+                self.assertIn('lc_y', image)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            TermImage(b'#!/usr/bin/env python\n' * 4)
+        with self.assertRaises(ValueError):
+            TermImage(image_bytes(self.store, self.roots)[:-10])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from beta_reduction import App, LC_TERMS, Lam, Var, church, parse, to_int
+from term_store import APP, LAM, VAR, TermStore
+
+
+class TestTermStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = TermStore()
+
+    def test_alpha_equivalent_terms_share_a_node(self):
+        k = self.store.add(parse(r'\x. \y. x'))
+        self.assertEqual(self.store.add(parse(r'\a. \b. a')), k)
+        self.assertNotEqual(self.store.add(parse(r'\x. \y. y')), k)
+        # Var 1 and Var 0, each under two lambdas.
+        self.assertEqual(len(self.store), 6)
+        self.assertEqual(self.store.kinds[k], LAM)
+        self.assertEqual(self.store.kinds[self.store.left[self.store.left[k]]], VAR)
+        self.assertIs(self.store.intern(parse(r'\u. \v. u')), self.store.term(k))
+
+    def test_shared_subterms_are_stored_once(self):
+        self.assertEqual(self.store.add(LC_TERMS['lc_true']), self.store.add(LC_TERMS['lc_k']))
+        self.assertEqual(len(self.store), 3)
+        self.store.add(church(100000))
+        # One node per application, Var 0 and two lambdas; Var 1 is shared.
+        self.assertEqual(len(self.store), 100006)
+        self.assertEqual(self.store.kinds[self.store.add(App(Var(1), Var(0)))], APP)
+        self.assertEqual(len(self.store), 100006)
+
+    def test_normal_forms_are_memoised(self):
+        term = self.store.add(App(App(LC_TERMS['lc_sub'], church(20)), church(5)))
+        normal, steps = self.store.normalize(term)
+        self.assertEqual(to_int(self.store.term(normal)), 15)
+        self.assertGreater(steps, 0)
+        self.assertEqual(self.store.normalize(term), (normal, steps))
+        self.assertEqual(self.store.normalize(normal), (normal, 0))
+
+    def test_scheme_definitions(self):
+        forms = [
+            ['define', 'lc-true', ['lambda', ['x'], ['lambda', ['y'], 'x']]],
+            ['define', ['lc-k', 'x', 'y'], 'x'],
+            ['define', 'lc-pair', ['lambda', ['x', 'y', 'f'], [['f', 'x', 'y']]]],
+            ['define', 'lc-first', ['lambda', ['p'], ['p', 'lc-true']]],
+            ['define', 'three', ['quote', 3]],
+            ['define', 'uses-three', ['lambda', ['x'], 'three']],
+        ]
+        definitions = self.store.add_definitions(forms)
+        self.assertEqual(sorted(definitions), ['lc-first', 'lc-k', 'lc-pair', 'lc-true'])
+        self.assertEqual(definitions['lc-k'], definitions['lc-true'])
+        self.assertEqual(self.store.term(definitions['lc-pair']), LC_TERMS['lc_pair'])
+        self.assertEqual(self.store.term(definitions['lc-first']), Lam(App(Var(0), LC_TERMS['lc_true'])))
+        with self.assertRaises(NameError):
+            self.store.add_sexpr(['lambda', ['x'], 'y'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+# Parallel Purity Lint for Directories of Scheme Submissions
+# Filename: scheme_batch.py
+# Usage: python scheme_batch.py llm-*.scm llm-replit/ > lint.jsonl
+#        python scheme_batch.py 'runs/**/*.scm' --jobs 16
+#
+# Files are linted across a process pool with the same analysis as
+# scheme_parser.py. One JSON object per file is written to stdout as soon
+# as it is ready, in completion order, and a table of non-allowed
+# primitive uses per model is printed to stderr at the end.
+#
+# Workers start from the shared __schemecache__/lint.json and send back the
+# entries they compute, which the parent merges and saves once, so shared
+# files such as lc-utils.scm are analysed at most once per worker and not
+# at all on the next run if unchanged.
+
+import glob
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional
+
+import click
+
+from scheme_parser import CACHE_DIR_NAME, LINT_CACHE_NAME, SCHEME_PRIMITIVES, AnalysisCache
+
+_cache: Optional[AnalysisCache] = None
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Expand files, directories (searched recursively for *.scm) and globs, without duplicates."""
+    paths: Dict[str, None] = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for directory, subdirs, files in os.walk(pattern):
+                subdirs[:] = sorted(d for d in subdirs if d != CACHE_DIR_NAME)
+                for name in sorted(files):
+                    if name.endswith('.scm'):
+                        paths.setdefault(os.path.join(directory, name))
+        elif glob.has_magic(pattern):
+            for path in sorted(glob.glob(pattern, recursive=True)):
+                if os.path.isfile(path):
+                    paths.setdefault(path)
+        else:
+            paths.setdefault(pattern)
+    return list(paths)
+
+
+def model_name(path: str) -> str:
+    """
+    Name the model a submission came from.
+
+    `llm-claude.scm` and `llm-replit/lambda_calculus.scm` give `claude` and
+    `replit`; otherwise the file's directory names the run.
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem.startswith('llm-'):
+        return stem[4:]
+    directories = os.path.dirname(os.path.abspath(path)).split(os.sep)
+    for directory in reversed(directories):
+        if directory.startswith('llm-'):
+            return directory[4:]
+    return directories[-1] or stem
+
+
+def _init_worker(cache_path: Optional[str]) -> None:
+    global _cache
+    _cache = AnalysisCache(cache_path)
+
+
+def lint_file(path: str) -> Dict:
+    """
+    Lint one file with this process's cache.
+
+    Returns:
+        dict: The JSON record for the file, with the cache entries computed
+        for it under the private key `_entries`.
+    """
+    global _cache
+    if _cache is None:
+        _cache = AnalysisCache()
+    start, first_new = time.perf_counter(), len(_cache.analysed)
+    record = {'path': path, 'model': model_name(path), 'ok': True}
+    try:
+        found = _cache.lint(path)
+    except (OSError, UnicodeDecodeError, SyntaxError) as e:
+        record['ok'] = False
+        if isinstance(e, SyntaxError):
+            record['error'] = f"{e.filename}:{e.lineno}:{e.offset}: {e.msg}"
+        else:
+            record['error'] = f"{type(e).__name__}: {e}"
+    else:
+        record['primitives'] = {k: v for k, v in sorted(found.items()) if k in SCHEME_PRIMITIVES}
+        record['undefined'] = {k: v for k, v in sorted(found.items()) if k not in SCHEME_PRIMITIVES}
+    record['seconds'] = round(time.perf_counter() - start, 6)
+    record['_entries'] = {p: _cache.entries[p] for p in _cache.analysed[first_new:]}
+    return record
+
+
+def lint_paths(paths: List[str], jobs: int = 1, cache_path: Optional[str] = None) -> Iterable[Dict]:
+    """
+    Lint files across `jobs` processes, yielding records as they complete.
+
+    Entries computed by the workers are saved to `cache_path` once every
+    file is done.
+    """
+    cache = AnalysisCache(cache_path)
+    try:
+        if jobs <= 1:
+            _init_worker(cache_path)
+            for path in paths:
+                record = lint_file(path)
+                cache.merge(record.pop('_entries'))
+                yield record
+            return
+        with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(cache_path,)) as pool:
+            futures = [pool.submit(lint_file, path) for path in paths]
+            for future in as_completed(futures):
+                record = future.result()
+                cache.merge(record.pop('_entries'))
+                yield record
+    finally:
+        cache.save()
+
+
+def summarise(records: Iterable[Dict]) -> List[str]:
+    """Format files, read errors and non-allowed primitive uses per model."""
+    files, errors = Counter(), Counter()
+    uses: Dict[str, Counter] = defaultdict(Counter)
+    for record in records:
+        model = record['model']
+        files[model] += 1
+        if not record['ok']:
+            errors[model] += 1
+            continue
+        uses[model].update(record['primitives'])
+    lines = [f"{'model':<20}{'files':>7}{'errors':>8}{'uses':>7}  most used"]
+    for model in sorted(files):
+        top = ', '.join(f"{name} {count}" for name, count in uses[model].most_common(5))
+        lines.append(f"{model:<20}{files[model]:>7}{errors[model]:>8}"
+                     f"{sum(uses[model].values()):>7}  {top}")
+    return lines
+
+
+@click.command()
+@click.argument('patterns', nargs=-1, required=True)
+@click.option('--jobs', '-j', type=int, default=os.cpu_count() or 1, show_default=True,
+              help="Worker processes; 1 lints in this process.")
+@click.option('--cache-file', type=click.Path(dir_okay=False),
+              default=os.path.join(CACHE_DIR_NAME, LINT_CACHE_NAME), show_default=True,
+              help="Shared lint cache.")
+@click.option('--no-cache', is_flag=True, help="Analyse every file again and save nothing.")
+def main(patterns: List[str], jobs: int, cache_file: str, no_cache: bool) -> None:
+    """
+    Lint Scheme files, directories and globs for lambda calculus purity.
+
+    Writes one JSON object per file to stdout and a summary per model to
+    stderr. Exits with status 1 if any file could not be read.
+    """
+    paths = expand_paths(patterns)
+    if not paths:
+        raise click.ClickException("No Scheme files matched")
+    records = []
+    for record in lint_paths(paths, jobs, None if no_cache else cache_file):
+        records.append(record)
+        sys.stdout.write(json.dumps(record) + '\n')
+        sys.stdout.flush()
+    for line in summarise(records):
+        click.echo(line, err=True)
+    if any(not record['ok'] for record in records):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,462 @@
+# Scheme to Python Closure Compiler
+# Filename: scheme_compiler.py
+# Usage: python scheme_compiler.py y-combinator.scm
+#        python scheme_compiler.py llm-claude.scm --emit
+#
+# Compiles the pure lambda subset (lambda, define, if, cond, let, and, or,
+# quote, begin) to Python closures and caches the code objects in
+# __schemecache__. Each file is compiled on its own: `load` is not
+# supported, so programs that pull in another file, such as
+# lc-examples.scm, are rejected with a CompileError. Run those with
+# scheme_eval.py instead.
+
+import ast
+import hashlib
+import importlib.util
+import keyword
+import marshal
+import os
+import re
+import sys
+from types import CodeType
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+from scheme_parser import read_forms
+
+# Bump whenever the generated code changes, so stale cache entries are ignored.
+COMPILER_VERSION = 2
+
+CACHE_DIR_NAME = '__schemecache__'
+
+# Names the generated code uses for runtime helpers. mangle() never produces
+# a name starting with this prefix.
+_HELPER_PREFIX = '__scm_'
+
+_ESCAPES = {
+    '-': '_', '?': '_p', '!': '_x', '*': '_star', '+': '_plus', '/': '_slash',
+    '<': '_lt', '>': '_gt', '=': '_eq', '%': '_pct', '&': '_amp', '.': '_dot',
+    ':': '_colon', '$': '_dollar', '^': '_caret', '~': '_tilde', '@': '_at', "'": '_prime',
+}
+
+_NUMBER = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$')
+
+
+class CompileError(SyntaxError):
+    """Raised for Scheme forms outside the compiled subset."""
+
+
+class Symbol(str):
+    """A quoted Scheme symbol, kept distinct from strings."""
+    __slots__ = ()
+
+    def __repr__(self):
+        return str(self)
+
+
+def mangle(name: str) -> str:
+    """Turn a Scheme identifier into a readable Python identifier."""
+    result = ''.join(_ESCAPES.get(c, c if c.isalnum() or c == '_' else f'_u{ord(c):x}') for c in name)
+    if not result.isidentifier() or keyword.iskeyword(result) or result.startswith(_HELPER_PREFIX):
+        result = 's_' + result
+    return result
+
+
+class _Names:
+    """Allocate distinct Python names for the Scheme names of one program."""
+
+    def __init__(self):
+        self.python: Dict[str, str] = {}
+        self.used = set()
+
+    def __getitem__(self, name: str) -> str:
+        python = self.python.get(name)
+        if python is None:
+            python = candidate = mangle(name)
+            n = 1
+            while python in self.used:
+                python = f'{candidate}_{n}'
+                n += 1
+            self.python[name] = python
+            self.used.add(python)
+        return python
+
+
+def _display_string(value: Any) -> str:
+    if value is True:
+        return '#t'
+    if value is False:
+        return '#f'
+    if isinstance(value, list):
+        return '(' + ' '.join(_display_string(item) for item in value) + ')'
+    if callable(value):
+        return '#<procedure>'
+    return str(value)
+
+
+def _error(message, *irritants):
+    raise RuntimeError(' '.join([_display_string(message)] + [_display_string(i) for i in irritants]))
+
+
+# Host primitives available to compiled programs, by Scheme name. Only the
+# ones a program refers to are bound in its namespace.
+PRIMITIVES: Dict[str, Callable] = {
+    '+': lambda *args: sum(args),
+    '-': lambda first, *rest: first - sum(rest) if rest else -first,
+    '*': lambda *args: _product(args),
+    '=': lambda a, b: a == b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+    'zero?': lambda n: n == 0,
+    'not': lambda x: x is False,
+    'eq?': lambda a, b: a is b or (isinstance(a, (Symbol, int)) and a == b),
+    'null?': lambda x: x == [],
+    'cons': lambda a, d: [a] + d if isinstance(d, list) else (a, d),
+    'car': lambda p: p[0],
+    'cdr': lambda p: p[1:] if isinstance(p, list) else p[1],
+    'list': lambda *items: list(items),
+    'procedure?': callable,
+    'number->string': lambda n: str(n),
+    'string-append': lambda *parts: ''.join(parts),
+    'display': lambda value: print(_display_string(value), end=''),
+    'newline': lambda: print(),
+    'error': _error,
+}
+
+
+def _product(args):
+    result = 1
+    for arg in args:
+        result *= arg
+    return result
+
+
+def read_program(source: str, filename: str = '<string>') -> List:
+    """Read every top-level form of a Scheme source text."""
+    try:
+        return list(read_forms(source, filename))
+    except SyntaxError as e:
+        raise CompileError(e.msg, (e.filename, e.lineno, e.offset, e.text)) from None
+
+
+_SPECIAL_FORMS = {
+    'lambda': 'form_lambda', 'quote': 'form_quote', 'if': 'form_if', 'begin': 'form_begin',
+    'let': 'form_let', 'and': 'form_and', 'or': 'form_or', 'cond': 'form_cond', 'define': 'form_define',
+}
+
+
+class _Compiler:
+
+    def __init__(self):
+        self.names = _Names()
+        self.globals = set()
+        self.temps = 0
+
+    def sequence(self, exprs: List, scope: frozenset) -> ast.expr:
+        if not exprs:
+            raise CompileError("Empty body")
+        for expr in exprs:
+            if isinstance(expr, list) and expr and expr[0] == 'define':
+                raise CompileError("Internal define is not supported; use a top-level define")
+        if len(exprs) == 1:
+            return self.expr(exprs[0], scope)
+        return ast.Subscript(ast.Tuple([self.expr(e, scope) for e in exprs], ast.Load()),
+                             ast.UnaryOp(ast.USub(), ast.Constant(1)), ast.Load())
+
+    def atom(self, token: str, scope: frozenset) -> ast.expr:
+        if _NUMBER.match(token):
+            return ast.Constant(float(token) if any(c in token for c in '.eE') else int(token))
+        if token.startswith('"'):
+            return ast.Constant(token[1:-1].replace('\\"', '"').replace('\\n', '\n'))
+        if token in ('#t', '#true'):
+            return ast.Constant(True)
+        if token in ('#f', '#false'):
+            return ast.Constant(False)
+        if token.startswith('#\\'):
+            return ast.Constant(token[2:])
+        if token not in scope:
+            self.globals.add(token)
+        return ast.Name(self.names[token], ast.Load())
+
+    def datum(self, value) -> ast.expr:
+        if isinstance(value, list):
+            return ast.List([self.datum(item) for item in value], ast.Load())
+        if _NUMBER.match(value) or value[0] in '"#':
+            return self.atom(value, frozenset())
+        return ast.Call(ast.Name(_HELPER_PREFIX + 'symbol', ast.Load()), [ast.Constant(str(value))], [])
+
+    def params(self, spec, scope: frozenset):
+        """Compile a parameter list, which may be a symbol or end in `. rest`."""
+        if isinstance(spec, str):
+            fixed, rest = [], spec
+        elif '.' in spec:
+            if spec.index('.') != len(spec) - 2:
+                raise CompileError(f"Malformed parameter list {spec}")
+            fixed, rest = spec[:-2], spec[-1]
+        else:
+            fixed, rest = spec, None
+        for name in fixed + ([rest] if rest else []):
+            if not isinstance(name, str):
+                raise CompileError(f"Parameter must be an identifier, not {name}")
+        arguments = ast.arguments(
+            posonlyargs=[], args=[ast.arg(self.names[p]) for p in fixed],
+            vararg=ast.arg(self.names[rest]) if rest else None,
+            kwonlyargs=[], kw_defaults=[], kwarg=None, defaults=[])
+        return arguments, scope | set(fixed) | ({rest} if rest else set())
+
+    def expr(self, expr, scope: frozenset) -> ast.expr:
+        if isinstance(expr, str):
+            return self.atom(expr, scope)
+        if not expr:
+            raise CompileError("Empty application ()")
+        head = expr[0]
+        if isinstance(head, str) and head not in scope and head in _SPECIAL_FORMS:
+            return getattr(self, _SPECIAL_FORMS[head])(expr, scope)
+        return ast.Call(self.expr(head, scope), [self.expr(arg, scope) for arg in expr[1:]], [])
+
+    def form_lambda(self, expr, scope):
+        if len(expr) < 3:
+            raise CompileError("lambda needs parameters and a body")
+        arguments, inner = self.params(expr[1], scope)
+        return ast.Lambda(arguments, self.sequence(expr[2:], frozenset(inner)))
+
+    def form_quote(self, expr, scope):
+        return self.datum(expr[1])
+
+    def _truthy(self, test):
+        # Only #f is false in Scheme.
+        return ast.Compare(test, [ast.IsNot()], [ast.Constant(False)])
+
+    def form_if(self, expr, scope):
+        if len(expr) not in (3, 4):
+            raise CompileError("if needs a test, a consequent and an optional alternative")
+        alternative = self.expr(expr[3], scope) if len(expr) == 4 else ast.Constant(None)
+        return ast.IfExp(self._truthy(self.expr(expr[1], scope)), self.expr(expr[2], scope), alternative)
+
+    def form_begin(self, expr, scope):
+        return self.sequence(expr[1:], scope)
+
+    def form_let(self, expr, scope):
+        bindings = expr[1]
+        names = [binding[0] for binding in bindings]
+        arguments, inner = self.params(names, scope)
+        function = ast.Lambda(arguments, self.sequence(expr[2:], frozenset(inner)))
+        return ast.Call(function, [self.expr(binding[1], scope) for binding in bindings], [])
+
+    def form_and(self, expr, scope):
+        if len(expr) == 1:
+            return ast.Constant(True)
+        result = self.expr(expr[-1], scope)
+        for test in reversed(expr[1:-1]):
+            result = ast.IfExp(self._truthy(self.expr(test, scope)), result, ast.Constant(False))
+        return result
+
+    def form_or(self, expr, scope):
+        if len(expr) == 1:
+            return ast.Constant(False)
+        result = self.expr(expr[-1], scope)
+        for test in reversed(expr[1:-1]):
+            temp = f'{_HELPER_PREFIX}t{self.temps}'
+            self.temps += 1
+            value = ast.NamedExpr(ast.Name(temp, ast.Store()), self.expr(test, scope))
+            result = ast.IfExp(self._truthy(value), ast.Name(temp, ast.Load()), result)
+        return result
+
+    def form_cond(self, expr, scope):
+        result = ast.Constant(None)
+        for clause in reversed(expr[1:]):
+            body = self.sequence(clause[1:], scope)
+            if clause[0] == 'else':
+                result = body
+            else:
+                result = ast.IfExp(self._truthy(self.expr(clause[0], scope)), body, result)
+        return result
+
+    def form_define(self, expr, scope):
+        raise CompileError("define is only allowed at top level")
+
+    def toplevel(self, form) -> ast.stmt:
+        if isinstance(form, list) and form and form[0] == 'load':
+            raise CompileError("load is not supported; run multi-file programs with scheme_eval.py")
+        if isinstance(form, list) and form and form[0] == 'define':
+            if len(form) < 3:
+                raise CompileError(f"define needs a name and a value: {form}")
+            target = form[1]
+            if isinstance(target, list):
+                # (define (name . params) body ...)
+                name = target[0]
+                value = self.form_lambda(['lambda', target[1:]] + form[2:], frozenset())
+            else:
+                name = target
+                value = self.expr(form[2], frozenset())
+            self.globals.add(name)
+            return ast.Assign([ast.Name(self.names[name], ast.Store())], value)
+        return ast.Expr(self.expr(form, frozenset()))
+
+
+def compile_program(forms: List, filename: str = '<scheme>') -> CodeType:
+    """
+    Compile top-level Scheme forms into a Python code object.
+
+    Lambdas become Python closures and top-level defines become module
+    globals. Running the code object in a namespace from `new_namespace`
+    defines everything and evaluates the top-level expressions in order.
+
+    Args:
+        forms: Forms as read by `read_program`.
+        filename: File name recorded in tracebacks.
+
+    Returns:
+        CodeType: The compiled module code.
+
+    Raises:
+        CompileError: If a form is outside the supported subset.
+    """
+    compiler = _Compiler()
+    body = []
+    for form in forms:
+        line, col = getattr(form, 'line', 0), getattr(form, 'col', 0)
+        try:
+            statement = compiler.toplevel(form)
+        except CompileError as e:
+            if e.lineno is None and line:
+                raise CompileError(e.msg, (filename, line, col, None)) from None
+            raise
+        if line:
+            # Tracebacks through compiled code point at the Scheme form.
+            statement.lineno = statement.end_lineno = line
+            statement.col_offset = statement.end_col_offset = col - 1
+        body.append(statement)
+    names = compiler.names.python
+    # The module records its Scheme to Python name table, then binds the
+    # host primitives it refers to.
+    table = ast.Dict([ast.Constant(str(k)) for k in names], [ast.Constant(v) for v in names.values()])
+    header = [ast.Assign([ast.Name('__scheme_names__', ast.Store())], table)]
+    for name in sorted(n for n in compiler.globals if n in PRIMITIVES):
+        lookup = ast.Call(ast.Name(_HELPER_PREFIX + 'primitive', ast.Load()), [ast.Constant(str(name))], [])
+        header.append(ast.Assign([ast.Name(names[name], ast.Store())], lookup))
+    module = ast.fix_missing_locations(ast.Module(header + body, type_ignores=[]))
+    return compile(module, filename, 'exec')
+
+
+def to_python_source(forms: List) -> str:
+    """Return the Python source `compile_program` generates, for inspection."""
+    compiler = _Compiler()
+    return ast.unparse(ast.fix_missing_locations(ast.Module([compiler.toplevel(f) for f in forms], type_ignores=[])))
+
+
+def _cache_path(path: str, digest: str, cache_dir: Optional[str]) -> str:
+    directory = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f'{stem}.{digest[:16]}.{sys.implementation.cache_tag}.bin')
+
+
+def compile_file(path: str, cache: bool = True, cache_dir: Optional[str] = None) -> CodeType:
+    """
+    Compile a Scheme file, reusing the on-disk cache when possible.
+
+    Cache entries are keyed by the SHA-256 of the source, the interpreter's
+    bytecode magic number and COMPILER_VERSION, and are written atomically.
+    A cache directory that cannot be written is silently skipped.
+
+    Args:
+        path: Path to the Scheme source file.
+        cache: Whether to read and write the cache.
+        cache_dir: Directory for cache entries (default: __schemecache__
+            next to the source file).
+
+    Returns:
+        CodeType: The compiled module code.
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    digest = hashlib.sha256(source).hexdigest()
+    header = importlib.util.MAGIC_NUMBER + COMPILER_VERSION.to_bytes(4, 'little') + bytes.fromhex(digest)
+    cached = _cache_path(path, digest, cache_dir)
+    if cache:
+        try:
+            with open(cached, 'rb') as f:
+                data = f.read()
+            if data.startswith(header):
+                return marshal.loads(data[len(header):])
+        except (OSError, ValueError, EOFError, TypeError):
+            pass
+    code = compile_program(read_program(source.decode('utf-8'), path), path)
+    if cache:
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            temporary = f'{cached}.{os.getpid()}.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(header + marshal.dumps(code))
+            os.replace(temporary, cached)
+        except OSError:
+            pass
+    return code
+
+
+_SYMBOLS: Dict[str, Symbol] = {}
+
+
+def _symbol(name: str) -> Symbol:
+    symbol = _SYMBOLS.get(name)
+    if symbol is None:
+        symbol = _SYMBOLS[name] = Symbol(name)
+    return symbol
+
+
+class SchemeModule:
+    """The definitions of a compiled Scheme program, looked up by Scheme name."""
+
+    def __init__(self, code: CodeType):
+        self.namespace: Dict[str, Any] = {
+            '__builtins__': {},
+            _HELPER_PREFIX + 'symbol': _symbol,
+            _HELPER_PREFIX + 'primitive': PRIMITIVES.__getitem__,
+        }
+        exec(code, self.namespace)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.namespace[self.namespace['__scheme_names__'][name]]
+
+    def __contains__(self, name: str) -> bool:
+        python = self.namespace['__scheme_names__'].get(name)
+        return python is not None and python in self.namespace
+
+    def names(self) -> List[str]:
+        """Return the Scheme names the program defines."""
+        return [name for name in self.namespace['__scheme_names__'] if name in self and name not in PRIMITIVES]
+
+
+def load(path: str, cache: bool = True, cache_dir: Optional[str] = None) -> SchemeModule:
+    """Compile (or fetch from the cache) and run a Scheme file."""
+    return SchemeModule(compile_file(path, cache, cache_dir))
+
+
+@click.command()
+@click.argument('file_path', type=click.Path(exists=True))
+@click.option('--no-cache', is_flag=True, help="Compile from scratch and leave the cache untouched.")
+@click.option('--emit', is_flag=True, help="Print the generated Python instead of running it.")
+def main(file_path: str, no_cache: bool, emit: bool) -> None:
+    """
+    Compile a Scheme file to Python closures and run it.
+
+    Usage: python scheme_compiler.py <path_to_file.scm>
+    """
+    if emit:
+        with open(file_path) as f:
+            click.echo(to_python_source(read_program(f.read(), file_path)))
+        return
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+    try:
+        module = load(file_path, cache=not no_cache)
+    except CompileError as e:
+        raise click.ClickException(f"Compile error: {e}")
+    click.echo()
+    click.echo(click.style(f"Defined {len(module.names())} names.", fg="green"))
+
+
+if __name__ == "__main__":
+    main()
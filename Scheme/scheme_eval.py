@@ -0,0 +1,643 @@
+# Embedded Evaluator for the Pure Scheme Subset
+# Filename: scheme_eval.py
+# Usage: python scheme_eval.py y-combinator.scm
+#        python scheme_eval.py llm-claude.scm --fuel 1000000
+#
+# Runs Scheme files in-process, at a cost that can be bounded in advance,
+# so submissions can be checked for the results they compute without an
+# external Scheme.
+#
+# Each top-level form is first translated into a tree of nodes in which
+# every variable reference is resolved: locals to a (depth, index) address
+# into array-backed frames, globals to a shared cell. The tree is then run
+# by an iterative machine with an explicit continuation stack. Calls in
+# tail position push nothing, so loops written as tail calls run in
+# constant space, and non-tail recursion is bounded by max_depth rather
+# than by Python's recursion limit.
+#
+# The language is what scheme_compiler.py compiles, plus let*, letrec,
+# named let, internal defines and load, over the host primitives of
+# scheme_compiler.PRIMITIVES and the few list and character helpers that
+# lc-utils.scm uses.
+
+import os
+import sys
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Union
+
+import click
+
+from scheme_compiler import _NUMBER, PRIMITIVES, Symbol, _display_string
+from scheme_parser import load_forms, read_forms
+
+# Node opcodes. A node is a tuple whose first item is its opcode.
+CONST, LOCAL, GLOBAL, LAMBDA, IF, SEQ, CALL, DEFINE, SET_LOCAL, AND, OR = range(11)
+
+# Continuation kinds on the machine's stack.
+_K_ARGS, _K_IF, _K_SEQ, _K_AND, _K_OR, _K_DEFINE, _K_SET_LOCAL = range(7)
+
+
+class SchemeError(Exception):
+    """Raised when an evaluated Scheme program signals or causes an error."""
+
+
+class EvaluationLimit(SchemeError):
+    """Raised when a program runs out of steps, fuel or stack depth."""
+
+
+class _Unbound:
+    __slots__ = ()
+
+    def __repr__(self):
+        return '#<unbound>'
+
+
+# The value of a global that was never defined, or of an internal define
+# read before it is assigned.
+UNBOUND = _Unbound()
+
+# Passed to the operand continuation of a call before any operand is evaluated.
+_PENDING = _Unbound()
+
+
+class Cell:
+    """The value of one global variable, shared by every reference to it."""
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name: str, value: Any = UNBOUND):
+        self.name = name
+        self.value = value
+
+
+class Procedure:
+    """A Scheme closure: a lambda node and the frame it was created in. Callable from Python."""
+    __slots__ = ('lam', 'env', 'evaluator')
+
+    def __init__(self, lam: tuple, env: Optional[list], evaluator: 'Evaluator'):
+        self.lam = lam
+        self.env = env
+        self.evaluator = evaluator
+
+    @property
+    def name(self) -> str:
+        return self.lam[5]
+
+    def __call__(self, *args):
+        return self.evaluator.apply(self, args)
+
+    def __repr__(self):
+        return f'#<procedure {self.name}>'
+
+
+def _map(f, *lists):
+    return [f(*items) for items in zip(*lists)]
+
+
+def _for_each(f, *lists):
+    for items in zip(*lists):
+        f(*items)
+
+
+# Host procedures available to evaluated programs in addition to PRIMITIVES.
+EXTRA_PRIMITIVES: Dict[str, Callable] = {
+    'map': _map,
+    'for-each': _for_each,
+    'apply': lambda f, *args: f(*args[:-1], *args[-1]),
+    'length': len,
+    'append': lambda *lists: [item for items in lists for item in items],
+    'list-ref': lambda items, k: items[k],
+    'integer->char': chr,
+    'char->integer': ord,
+    'string': lambda *chars: ''.join(chars),
+}
+
+
+def _where(filename: str, form) -> str:
+    return f"{filename}:{getattr(form, 'line', 0)}:{getattr(form, 'col', 0)}"
+
+
+def _literal(token: str):
+    """Return the value of a self-evaluating token, or UNBOUND if it is an identifier."""
+    if _NUMBER.match(token):
+        return float(token) if any(c in token for c in '.eE') else int(token)
+    if token.startswith('"'):
+        return token[1:-1].replace('\\"', '"').replace('\\n', '\n')
+    if token in ('#t', '#true'):
+        return True
+    if token in ('#f', '#false'):
+        return False
+    if token.startswith('#\\'):
+        return token[2:]
+    return UNBOUND
+
+
+def _datum(value):
+    if isinstance(value, list):
+        return [_datum(item) for item in value]
+    literal = _literal(value)
+    return Symbol(str(value)) if literal is UNBOUND else literal
+
+
+def _is_define(form) -> bool:
+    return isinstance(form, list) and len(form) > 0 and form[0] == 'define'
+
+
+class _Translator:
+    """
+    Translate forms into nodes with every variable reference resolved.
+
+    A scope is a linked list `(names, parent)` of frames, innermost first,
+    where `names` maps each name to its slot. Slot 0 of a runtime frame
+    holds the enclosing frame, so a name's slot is also its index.
+    """
+
+    def __init__(self, evaluator: 'Evaluator', filename: str):
+        self.cell = evaluator.cell
+        self.filename = filename
+
+    def error(self, message: str, form) -> SyntaxError:
+        return SyntaxError(message, (self.filename, getattr(form, 'line', 0), getattr(form, 'col', 0), None))
+
+    @staticmethod
+    def address(name: str, scope) -> Optional[tuple]:
+        depth = 0
+        while scope is not None:
+            names, scope = scope
+            index = names.get(name)
+            if index is not None:
+                return depth, index
+            depth += 1
+        return None
+
+    def toplevel(self, form) -> tuple:
+        if _is_define(form):
+            name, value = self.definition(form)
+            return (DEFINE, self.cell(name), self.named(value, None, name))
+        if isinstance(form, list) and form and form[0] == 'begin':
+            if len(form) == 1:
+                return (CONST, None)
+            nodes = tuple(self.toplevel(f) for f in form[1:])
+            return nodes[0] if len(nodes) == 1 else (SEQ, nodes)
+        return self.expr(form, None)
+
+    def definition(self, form):
+        """Split a define into its name and value form, expanding `(define (f . params) ...)`."""
+        if len(form) < 3:
+            raise self.error("define needs a name and a value", form)
+        target, body = form[1], form[2:]
+        if not isinstance(target, list) and len(body) > 1:
+            raise self.error(f"define of {target} has more than one value", form)
+        # Curried shorthand (define ((f a) b) ...) nests one lambda per level.
+        while isinstance(target, list):
+            if not target:
+                raise self.error("define needs a name", form)
+            body = [['lambda', target[1:]] + body]
+            target = target[0]
+        if _literal(target) is not UNBOUND:
+            raise self.error(f"Cannot define {target}", form)
+        return target, body[0]
+
+    def named(self, value, scope, name: str) -> tuple:
+        node = self.expr(value, scope)
+        if node[0] == LAMBDA:
+            node = node[:5] + (str(name),)
+        return node
+
+    def body(self, forms: List, scope, form) -> tuple:
+        """Translate a lambda body, whose defines become slots in the frame of `scope`."""
+        if not forms:
+            raise self.error("Empty body", form)
+        names = scope[0]
+        for f in forms:
+            if _is_define(f):
+                names.setdefault(self.definition(f)[0], len(names) + 1)
+        nodes = []
+        for f in forms:
+            if _is_define(f):
+                name, value = self.definition(f)
+                nodes.append((SET_LOCAL, names[name], self.named(value, scope, name)))
+            else:
+                nodes.append(self.expr(f, scope))
+        return nodes[0] if len(nodes) == 1 else (SEQ, tuple(nodes))
+
+    def expr(self, expr, scope) -> tuple:
+        if not isinstance(expr, list):
+            value = _literal(expr)
+            if value is not UNBOUND:
+                return (CONST, value)
+            address = self.address(expr, scope)
+            if address is not None:
+                return (LOCAL,) + address
+            return (GLOBAL, self.cell(str(expr)), _where(self.filename, expr))
+        if not expr:
+            raise self.error("Empty application ()", expr)
+        head = expr[0]
+        if isinstance(head, str) and head in _SPECIAL_FORMS and self.address(head, scope) is None:
+            return getattr(self, _SPECIAL_FORMS[head])(expr, scope)
+        name = str(head) if isinstance(head, str) else 'procedure'
+        return (CALL, tuple(self.expr(e, scope) for e in expr), _where(self.filename, expr), name)
+
+    def params(self, spec, form):
+        """Split a parameter list, which may be a symbol or end in `. rest`, into fixed names and rest."""
+        if isinstance(spec, str):
+            fixed, rest = [], spec
+        elif '.' in spec:
+            if spec.index('.') != len(spec) - 2:
+                raise self.error(f"Malformed parameter list {spec}", form)
+            fixed, rest = spec[:-2], spec[-1]
+        else:
+            fixed, rest = list(spec), None
+        for name in fixed + ([rest] if rest else []):
+            if not isinstance(name, str) or _literal(name) is not UNBOUND:
+                raise self.error(f"Parameter must be an identifier, not {name}", form)
+        return fixed, rest
+
+    def lambda_node(self, spec, body: List, scope, form) -> tuple:
+        fixed, rest = self.params(spec, form)
+        names: Dict[str, int] = {}
+        for name in fixed + ([rest] if rest else []):
+            names[name] = len(names) + 1
+        body_node = self.body(body, (names, scope), form)
+        # The frame size is known only once the body's defines are counted.
+        return (LAMBDA, len(fixed), rest is not None, len(names) + 1, body_node, 'lambda')
+
+    def form_lambda(self, expr, scope):
+        if len(expr) < 3:
+            raise self.error("lambda needs parameters and a body", expr)
+        return self.lambda_node(expr[1], expr[2:], scope, expr)
+
+    def form_quote(self, expr, scope):
+        if len(expr) != 2:
+            raise self.error("quote takes one datum", expr)
+        return (CONST, _datum(expr[1]))
+
+    def form_if(self, expr, scope):
+        if len(expr) not in (3, 4):
+            raise self.error("if needs a test, a consequent and an optional alternative", expr)
+        alternative = self.expr(expr[3], scope) if len(expr) == 4 else (CONST, None)
+        return (IF, self.expr(expr[1], scope), self.expr(expr[2], scope), alternative)
+
+    def form_begin(self, expr, scope):
+        if len(expr) == 1:
+            return (CONST, None)
+        if len(expr) == 2:
+            return self.expr(expr[1], scope)
+        return (SEQ, tuple(self.expr(e, scope) for e in expr[1:]))
+
+    def bindings(self, expr):
+        bindings = expr[1]
+        if not isinstance(bindings, list) or len(expr) < 3:
+            raise self.error(f"{expr[0]} needs bindings and a body", expr)
+        for binding in bindings:
+            if not isinstance(binding, list) or len(binding) != 2 or isinstance(binding[0], list):
+                raise self.error(f"Malformed binding {binding}", expr)
+        return [b[0] for b in bindings], [b[1] for b in bindings]
+
+    def form_let(self, expr, scope):
+        if len(expr) > 1 and isinstance(expr[1], str):
+            return self.named_let(expr, scope)
+        names, inits = self.bindings(expr)
+        function = self.lambda_node(names, expr[2:], scope, expr)
+        return (CALL, (function,) + tuple(self.expr(i, scope) for i in inits), _where(self.filename, expr), 'let')
+
+    def named_let(self, expr, scope):
+        # (let loop ((v init) ...) body) runs ((letrec ((loop (lambda (v ...) body))) loop) init ...),
+        # with the inits outside the scope of loop.
+        if len(expr) < 4:
+            raise self.error("named let needs a name, bindings and a body", expr)
+        name = expr[1]
+        names, inits = self.bindings(expr[1:])
+        outer = ({name: 1}, scope)
+        loop = self.lambda_node(names, expr[3:], outer, expr)[:5] + (str(name),)
+        letrec = (LAMBDA, 0, False, 2, (SEQ, ((SET_LOCAL, 1, loop), (LOCAL, 0, 1))), 'let')
+        where = _where(self.filename, expr)
+        return (CALL, ((CALL, (letrec,), where, 'let'),) + tuple(self.expr(i, scope) for i in inits), where, str(name))
+
+    def form_let_star(self, expr, scope):
+        names, inits = self.bindings(expr)
+        if len(names) <= 1:
+            return self.form_let(expr, scope)
+        inner = ['let*', expr[1][1:]] + expr[2:]
+        return self.form_let(['let', expr[1][:1], inner], scope)
+
+    def form_letrec(self, expr, scope):
+        # Bindings are assigned in order in a fresh frame, which also serves letrec*.
+        self.bindings(expr)
+        defines = [['define', name, init] for name, init in expr[1]]
+        return (CALL, (self.lambda_node([], defines + expr[2:], scope, expr),), _where(self.filename, expr), 'letrec')
+
+    def form_and(self, expr, scope):
+        if len(expr) == 1:
+            return (CONST, True)
+        if len(expr) == 2:
+            return self.expr(expr[1], scope)
+        return (AND, tuple(self.expr(e, scope) for e in expr[1:]))
+
+    def form_or(self, expr, scope):
+        if len(expr) == 1:
+            return (CONST, False)
+        if len(expr) == 2:
+            return self.expr(expr[1], scope)
+        return (OR, tuple(self.expr(e, scope) for e in expr[1:]))
+
+    def form_cond(self, expr, scope):
+        result = (CONST, None)
+        for clause in reversed(expr[1:]):
+            if not isinstance(clause, list) or not clause:
+                raise self.error(f"Malformed cond clause {clause}", expr)
+            if len(clause) > 1 and clause[1] == '=>':
+                raise self.error("cond clauses with => are not supported", expr)
+            if clause[0] == 'else':
+                result = self.form_begin(clause, scope)
+            elif len(clause) == 1:
+                result = (OR, (self.expr(clause[0], scope), result))
+            else:
+                result = (IF, self.expr(clause[0], scope), self.form_begin(clause, scope), result)
+        return result
+
+    def form_define(self, expr, scope):
+        raise self.error("define is only allowed at top level or at the start of a body", expr)
+
+
+_SPECIAL_FORMS = {
+    'lambda': 'form_lambda', 'quote': 'form_quote', 'if': 'form_if', 'begin': 'form_begin',
+    'let': 'form_let', 'let*': 'form_let_star', 'letrec': 'form_letrec', 'letrec*': 'form_letrec',
+    'and': 'form_and', 'or': 'form_or', 'cond': 'form_cond', 'define': 'form_define',
+}
+
+
+class Evaluator:
+    """
+    A global environment and the machine that runs forms in it.
+
+    Costs are counted in steps, one per node visited. `max_steps` bounds
+    each top-level form or call from Python, `fuel` bounds everything this
+    evaluator ever runs, and `max_depth` bounds the pending non-tail calls.
+    Exceeding any of them raises EvaluationLimit.
+
+    Args:
+        max_steps: Steps allowed per top-level evaluation (default: no limit).
+        fuel: Steps allowed in total (default: no limit).
+        max_depth: Continuations allowed on the machine's stack.
+        cache: Whether loaded files are read through their read snapshots
+            in __schemecache__, so an unchanged prelude is not tokenised again.
+    """
+
+    def __init__(self, max_steps: Optional[int] = None, fuel: Optional[int] = None, max_depth: int = 100000,
+                 cache: bool = True):
+        self.max_steps = max_steps
+        self.fuel = fuel
+        self.max_depth = max_depth
+        self.cache = cache
+        self.steps = 0
+        self.globals: Dict[str, Cell] = {}
+        self._limit = sys.maxsize
+        self._active = 0
+        self._loading: List[str] = []
+        for name, primitive in {**PRIMITIVES, **EXTRA_PRIMITIVES}.items():
+            self.define(name, primitive)
+        self.define('load', self.load)
+
+    def cell(self, name: str) -> Cell:
+        cell = self.globals.get(name)
+        if cell is None:
+            cell = self.globals[name] = Cell(name)
+        return cell
+
+    def define(self, name: str, value: Any) -> None:
+        """Bind a global, for example to give programs another host procedure."""
+        self.cell(name).value = value
+
+    def __getitem__(self, name: str) -> Any:
+        cell = self.globals.get(name)
+        if cell is None or cell.value is UNBOUND:
+            raise KeyError(name)
+        return cell.value
+
+    def __contains__(self, name: str) -> bool:
+        cell = self.globals.get(name)
+        return cell is not None and cell.value is not UNBOUND
+
+    def eval(self, form, filename: str = '<string>') -> Any:
+        """Evaluate one top-level form as read by `read_forms`."""
+        return self._enter(self._run, _Translator(self, filename).toplevel(form), None)
+
+    def eval_source(self, source: Union[str, TextIO], filename: str = '<string>') -> Any:
+        """Evaluate every form of a source text or stream in turn, returning the last value."""
+        value = None
+        for form in read_forms(source, filename):
+            value = self.eval(form, filename)
+        return value
+
+    def load(self, path: str) -> None:
+        """Evaluate a file. Relative paths in a loaded file are relative to its directory."""
+        if self._loading and not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(self._loading[-1]), path)
+        if os.path.realpath(path) in map(os.path.realpath, self._loading):
+            raise SchemeError(f"load cycle through {path}")
+        self._loading.append(path)
+        try:
+            for form in load_forms(path, self.cache):
+                self.eval(form, path)
+        finally:
+            self._loading.pop()
+
+    def apply(self, procedure: Any, args: Sequence) -> Any:
+        """Call a Scheme or host procedure on `args`."""
+        if type(procedure) is not Procedure:
+            return procedure(*args)
+        frame = _bind(procedure, [procedure, *args], '<python>')
+        return self._enter(self._run, procedure.lam[4], frame)
+
+    def _enter(self, run: Callable, node: tuple, env: Optional[list]) -> Any:
+        if self._active == 0:
+            limit = sys.maxsize if self.fuel is None else self.fuel
+            if self.max_steps is not None:
+                limit = min(limit, self.steps + self.max_steps)
+            self._limit = limit
+        self._active += 1
+        try:
+            return run(node, env)
+        finally:
+            self._active -= 1
+
+    def _exhausted(self) -> EvaluationLimit:
+        if self.fuel is not None and self.steps >= self.fuel:
+            return EvaluationLimit(f"Out of fuel after {self.steps} steps")
+        return EvaluationLimit(f"Step limit of {self.max_steps} exceeded")
+
+    def _run(self, node: tuple, env: Optional[list]) -> Any:
+        stack: List[tuple] = []
+        steps, limit, max_depth = self.steps, self._limit, self.max_depth
+        try:
+            while True:
+                steps += 1
+                if steps > limit:
+                    self.steps = steps = steps - 1
+                    raise self._exhausted()
+                op = node[0]
+                if op == LOCAL:
+                    frame = env
+                    for _ in range(node[1]):
+                        frame = frame[0]
+                    value = frame[node[2]]
+                    if value is UNBOUND:
+                        raise SchemeError("Internal definition used before it is assigned")
+                elif op == CALL:
+                    if len(stack) >= max_depth:
+                        raise EvaluationLimit(f"{node[2]}: recursion deeper than {max_depth} calls")
+                    stack.append((_K_ARGS, node, env, []))
+                    value = _PENDING
+                elif op == GLOBAL:
+                    value = node[1].value
+                    if value is UNBOUND:
+                        raise SchemeError(f"{node[2]}: unbound variable {node[1].name}")
+                elif op == CONST:
+                    value = node[1]
+                elif op == LAMBDA:
+                    value = Procedure(node, env, self)
+                elif op == IF:
+                    stack.append((_K_IF, node, env, None))
+                    node = node[1]
+                    continue
+                elif op == SEQ:
+                    stack.append((_K_SEQ, node, env, 1))
+                    node = node[1][0]
+                    continue
+                elif op == AND:
+                    stack.append((_K_AND, node, env, 1))
+                    node = node[1][0]
+                    continue
+                elif op == OR:
+                    stack.append((_K_OR, node, env, 1))
+                    node = node[1][0]
+                    continue
+                elif op == DEFINE:
+                    stack.append((_K_DEFINE, node, env, None))
+                    node = node[2]
+                    continue
+                else:
+                    stack.append((_K_SET_LOCAL, node, env, None))
+                    node = node[2]
+                    continue
+
+                # Return the value to the innermost continuation.
+                while True:
+                    if not stack:
+                        return value
+                    kind, k_node, k_env, data = stack[-1]
+                    if kind == _K_ARGS:
+                        if value is not _PENDING:
+                            data.append(value)
+                        # Variables and constants among the operands are
+                        # evaluated here rather than by a trip round the machine.
+                        operands = k_node[1]
+                        i = len(data)
+                        while i < len(operands):
+                            operand = operands[i]
+                            o = operand[0]
+                            if o == LOCAL:
+                                frame = k_env
+                                for _ in range(operand[1]):
+                                    frame = frame[0]
+                                value = frame[operand[2]]
+                                if value is UNBOUND:
+                                    raise SchemeError("Internal definition used before it is assigned")
+                            elif o == GLOBAL:
+                                value = operand[1].value
+                                if value is UNBOUND:
+                                    raise SchemeError(f"{operand[2]}: unbound variable {operand[1].name}")
+                            elif o == CONST:
+                                value = operand[1]
+                            else:
+                                break
+                            steps += 1
+                            if steps > limit:
+                                self.steps = steps = steps - 1
+                                raise self._exhausted()
+                            data.append(value)
+                            i += 1
+                        if i < len(operands):
+                            node, env = operands[i], k_env
+                            break
+                        stack.pop()
+                        fn = data[0]
+                        if type(fn) is Procedure:
+                            # The argument list becomes the callee's frame;
+                            # nothing is pushed, so tail calls run in constant space.
+                            env = _bind(fn, data, k_node[2])
+                            node = fn.lam[4]
+                            break
+                        if not callable(fn):
+                            raise SchemeError(f"{k_node[2]}: not a procedure: {_display_string(fn)}")
+                        self.steps = steps
+                        try:
+                            value = fn(*data[1:])
+                        except SchemeError:
+                            raise
+                        except (TypeError, ValueError, ArithmeticError, LookupError, RuntimeError) as e:
+                            raise SchemeError(f"{k_node[2]}: {k_node[3]}: {e}") from None
+                        steps = self.steps
+                        continue
+                    stack.pop()
+                    if kind == _K_IF:
+                        node, env = (k_node[2] if value is not False else k_node[3]), k_env
+                        break
+                    if kind == _K_SEQ or kind == _K_AND or kind == _K_OR:
+                        if (kind == _K_AND and value is False) or (kind == _K_OR and value is not False):
+                            continue
+                        exprs = k_node[1]
+                        if data + 1 < len(exprs):
+                            stack.append((kind, k_node, k_env, data + 1))
+                        node, env = exprs[data], k_env
+                        break
+                    if kind == _K_DEFINE:
+                        k_node[1].value = value
+                    else:
+                        k_env[k_node[1]] = value
+                    value = None
+        finally:
+            self.steps = steps
+
+
+def _bind(procedure: Procedure, values: list, where: str) -> list:
+    """Turn `[procedure, arg, ...]` into the procedure's frame `[env, arg, ..., unassigned, ...]`."""
+    _, fixed, rest, size, _, name = procedure.lam
+    count = len(values) - 1
+    if count != fixed and not (rest and count > fixed):
+        expected = f"at least {fixed}" if rest else str(fixed)
+        raise SchemeError(f"{where}: {name}: expected {expected} argument{'s' * (expected != '1')}, got {count}")
+    if rest:
+        values[fixed + 1:] = [values[fixed + 1:]]
+    values[0] = procedure.env
+    if len(values) < size:
+        values.extend([UNBOUND] * (size - len(values)))
+    return values
+
+
+@click.command()
+@click.argument('file_path', type=click.Path(exists=True))
+@click.option('--max-steps', type=int, default=None, help="Steps allowed per top-level form.")
+@click.option('--fuel', type=int, default=None, help="Steps allowed for the whole run.")
+@click.option('--max-depth', type=int, default=100000, show_default=True, help="Pending non-tail calls allowed.")
+@click.option('--no-cache', is_flag=True, help="Read every file from source and leave the snapshots untouched.")
+def main(file_path: str, max_steps: Optional[int], fuel: Optional[int], max_depth: int, no_cache: bool) -> None:
+    """
+    Run a Scheme file in the embedded evaluator.
+
+    Usage: python scheme_eval.py <path_to_file.scm>
+    """
+    evaluator = Evaluator(max_steps, fuel, max_depth, cache=not no_cache)
+    try:
+        evaluator.load(file_path)
+    except SyntaxError as e:
+        raise click.ClickException(f"{e.filename}:{e.lineno}:{e.offset}: {e.msg}")
+    except SchemeError as e:
+        raise click.ClickException(f"{e} (after {evaluator.steps} steps)")
+    finally:
+        sys.stdout.flush()
+    click.echo()
+    click.echo(click.style(f"Ran in {evaluator.steps} steps.", fg="green"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+# Deterministic Local Grader for Lambda Calculus Submissions
+# Filename: scheme_grader.py
+# Usage: python scheme_grader.py llm-*.scm llm-replit/ > grades.jsonl
+#        python scheme_grader.py 'runs/**/*.scm' --jobs 16
+#
+# Scores an answer to prompt.md.tmpl from 0 to 1 on three criteria:
+#
+#   purity       share of identifier references that are lambda parameters
+#                or the submission's own definitions rather than Scheme
+#                primitives, by the analysis of scheme_parser.py
+#   correctness  share of TEST_VECTORS that give the expected result when
+#                run against the submission in the embedded evaluator
+#   structure    mean of four checks: the prompt's definitions are present,
+#                the header has the fields it asks for, definitions are
+#                commented and names are Scheme-style
+#
+# and grades it with the WEIGHTS-weighted mean of the three. Evaluation is
+# bounded by steps rather than by time, so a submission gets the same grade
+# on any machine, and nothing is fetched from the network.
+#
+# Every submission is graded in a subprocess of its own that caps its own
+# CPU time and address space and is killed after WALL_SECONDS. It reports
+# the static scores first and then one line per test vector, so whatever it
+# reported before it was killed still counts. Grading many submissions runs
+# that many subprocesses at once from a thread pool.
+
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+try:
+    import resource
+except ImportError:  # Not on Windows, where only the wall-clock limit applies
+    resource = None
+
+import click
+
+from scheme_batch import expand_paths
+from scheme_compiler import _display_string
+from scheme_eval import Evaluator, Procedure, SchemeError
+from scheme_parser import BOUND, DEFINED, FREE, PRIMITIVE, read_forms, resolve, top_level_defines
+
+# Bump whenever a change could give a submission a different grade, so
+# stored grades can be told apart from current ones.
+GRADER_VERSION = 2
+
+WEIGHTS = {'purity': 0.25, 'correctness': 0.5, 'structure': 0.25}
+
+# Limits of each grading subprocess
+CPU_SECONDS = 10
+MEMORY_BYTES = 1 << 30
+WALL_SECONDS = 30
+
+# Evaluation budgets, in evaluator steps
+LOAD_STEPS = 1_000_000      # per top-level form of the submission
+LOAD_FUEL = 5_000_000       # for all of them together
+VECTOR_STEPS = 200_000      # per test vector, and again per call to decode its value
+MAX_DEPTH = 10_000
+
+
+def _numeral(n: int) -> str:
+    return '(lc-succ ' * n + 'lc-zero' + ')' * n
+
+
+# (name, expression, decoder, expected). Expressions call the submission's
+# definitions the way prompt.md.tmpl does; decoders accept Church booleans
+# and numerals whether they take their arguments together or one at a time.
+TEST_VECTORS = [
+    ('identity', "(identity 'a)", 'datum', 'a'),
+    ('lc-true', "lc-true", 'boolean', True),
+    ('lc-false', "lc-false", 'boolean', False),
+    ('lc-if true', "(lc-if lc-true 'yes 'no)", 'datum', 'yes'),
+    ('lc-if false', "(lc-if lc-false 'yes 'no)", 'datum', 'no'),
+    ('lc-zero', "lc-zero", 'numeral', 0),
+    ('lc-succ', _numeral(3), 'numeral', 3),
+    ('lc-add', f"(lc-add {_numeral(2)} {_numeral(3)})", 'numeral', 5),
+    ('lc-add zero', f"(lc-add lc-zero {_numeral(1)})", 'numeral', 1),
+    ('lc-mult', f"(lc-mult {_numeral(2)} {_numeral(3)})", 'numeral', 6),
+    ('lc-mult zero', f"(lc-mult lc-zero {_numeral(3)})", 'numeral', 0),
+    ('lc-first', "(lc-first (lc-pair 'a 'b))", 'datum', 'a'),
+    ('lc-second', "(lc-second (lc-pair 'a 'b))", 'datum', 'b'),
+    ('lc-is-nil? nil', "(lc-is-nil? lc-nil)", 'boolean', True),
+    ('lc-is-nil? cons', "(lc-is-nil? (lc-cons 'a lc-nil))", 'boolean', False),
+    ('lc-head', "(lc-head (lc-cons 'a lc-nil))", 'datum', 'a'),
+    ('lc-tail', "(lc-is-nil? (lc-tail (lc-cons 'a lc-nil)))", 'boolean', True),
+    ('lc-is-zero? zero', "(lc-is-zero? lc-zero)", 'boolean', True),
+    ('lc-is-zero? one', f"(lc-is-zero? {_numeral(1)})", 'boolean', False),
+    ('lc-map', f"(lc-head (lc-map lc-succ (lc-cons {_numeral(1)} lc-nil)))", 'numeral', 2),
+]
+
+# Definitions the steps of prompt.md.tmpl ask for by name
+REQUIRED_DEFINITIONS = [
+    'identity', 'lc-true', 'lc-false', 'lc-if', 'lc-zero', 'lc-succ', 'lc-add', 'lc-mult',
+    'lc-pair', 'lc-first', 'lc-second', 'lc-nil', 'lc-cons', 'lc-is-nil?', 'lc-head', 'lc-tail',
+    'lc-map', 'lc-filter', 'lc-fold',
+]
+
+# Header fields prompt.md.tmpl asks for, and how each may be written
+HEADER_FIELDS = {
+    'filename': re.compile(r'file\s*name|\w\.scm\b', re.IGNORECASE),
+    'description': re.compile(r'descri', re.IGNORECASE),
+    'author': re.compile(r'author|(created|developed|written) by', re.IGNORECASE),
+    'model': re.compile(r'\bmodel\b', re.IGNORECASE),
+    'usage': re.compile(r'usage|how to (run|use)', re.IGNORECASE),
+}
+
+_SCHEME_NAME = re.compile(r'[a-z][a-z0-9]*(?:(?:-|->)[a-z0-9]+)*[?!*]?$')
+
+# A line with a comment that does not start inside a string
+_COMMENT = re.compile(r'[^";]*;')
+
+
+def extract_code(text: str) -> str:
+    """Return the fenced code blocks of a Markdown answer joined, or the text itself if it has none."""
+    blocks = re.findall(r'^```[^\n]*\n(.*?)^```', text, re.MULTILINE | re.DOTALL)
+    return '\n'.join(blocks) if blocks else text
+
+
+def normalise_source(text: str) -> str:
+    """
+    Return the code of an answer without what cannot change its grade.
+
+    Markdown around the code, line endings, indentation, trailing spaces
+    and runs of blank lines are dropped, so answers that differ only in
+    those are graded as the same text.
+    """
+    lines: List[str] = []
+    for line in extract_code(text).splitlines():
+        line = line.strip()
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    while lines and not lines[-1]:
+        lines.pop()
+    return '\n'.join(lines) + '\n'
+
+
+def _purity(forms: List) -> Dict[str, Any]:
+    references = resolve(forms, top_level_defines(forms))
+    total = sum(sum(references[kind].values()) for kind in (BOUND, DEFINED, PRIMITIVE, FREE))
+    pure = sum(references[BOUND].values()) + sum(references[DEFINED].values())
+    return {'score': pure / total if total else 0.0,
+            'primitives': dict(references[PRIMITIVE] + references[FREE])}
+
+
+def _structure(source: str, forms: List) -> Dict[str, float]:
+    lines = source.splitlines()
+    comment = [bool(_COMMENT.match(line)) for line in lines]
+    defines = [form for form in forms if isinstance(form, list) and len(form) > 1 and form[0] == 'define']
+    names = top_level_defines(forms)
+
+    header = []
+    for line, is_comment in zip(lines, comment):
+        if not is_comment and line.strip():
+            break
+        header.append(line)
+    header_text = '\n'.join(header)
+
+    # A definition is commented if the block of non-blank lines around
+    # where it starts has a comment in it.
+    documented = 0
+    for form in defines:
+        begin = end = form.line - 1
+        while begin > 0 and lines[begin - 1].strip():
+            begin -= 1
+        while end < len(lines) and lines[end].strip():
+            end += 1
+        documented += any(comment[begin:end])
+
+    return {
+        'definitions': sum(name in names for name in REQUIRED_DEFINITIONS) / len(REQUIRED_DEFINITIONS),
+        'header': sum(bool(p.search(header_text)) for p in HEADER_FIELDS.values()) / len(HEADER_FIELDS),
+        'comments': documented / len(defines) if defines else 0.0,
+        'naming': sum(bool(_SCHEME_NAME.match(name)) for name in names) / len(names) if names else 0.0,
+    }
+
+
+def _call(evaluator: Evaluator, fn: Any, *args) -> Any:
+    """Apply `fn` to `args`, a few at a time if it takes fewer, so curried encodings work too."""
+    args = list(args)
+    while args:
+        if not callable(fn):
+            raise ValueError(f"not a procedure: {_display_string(fn)}")
+        take = len(args)
+        if type(fn) is Procedure and not fn.lam[2]:
+            take = min(take, max(fn.lam[1], 1))
+        fn = evaluator.apply(fn, args[:take])
+        del args[:take]
+    return fn
+
+
+def _decode_boolean(evaluator: Evaluator, value: Any) -> bool:
+    yes, no = object(), object()
+    chosen = _call(evaluator, value, yes, no)
+    if chosen is not yes and chosen is not no:
+        raise ValueError(f"not a Church boolean: {_display_string(value)}")
+    return chosen is yes
+
+
+def _decode_numeral(evaluator: Evaluator, value: Any) -> int:
+    count = _call(evaluator, value, lambda n: n + 1, 0)
+    if type(count) is not int:
+        raise ValueError(f"not a Church numeral: {_display_string(value)}")
+    return count
+
+
+_DECODERS: Dict[str, Callable[[Evaluator, Any], Any]] = {
+    'datum': lambda evaluator, value: _display_string(value),
+    'boolean': _decode_boolean,
+    'numeral': _decode_numeral,
+}
+
+
+def _no_load(path: str) -> None:
+    raise SchemeError(f"load is not available to graded submissions: {path}")
+
+
+def _sandbox() -> int:
+    """Grade the submission on stdin, writing JSON lines to stdout. Runs in the grading subprocess."""
+    if resource is not None:
+        resource.setrlimit(resource.RLIMIT_CPU, (CPU_SECONDS, CPU_SECONDS + 1))
+        resource.setrlimit(resource.RLIMIT_AS, (MEMORY_BYTES, MEMORY_BYTES))
+    source = sys.stdin.read()
+    out = sys.stdout
+    # What the submission displays is not graded.
+    sys.stdout = open(os.devnull, 'w')
+
+    def report(**record):
+        out.write(json.dumps(record) + '\n')
+        out.flush()
+
+    try:
+        forms = list(read_forms(source, '<submission>'))
+    except SyntaxError as e:
+        report(purity=0.0, primitives={}, structure={}, errors=[f"line {e.lineno}: {e.msg}"])
+        return 0
+    purity = _purity(forms)
+    report(purity=purity['score'], primitives=purity['primitives'], structure=_structure(source, forms))
+
+    evaluator = Evaluator(LOAD_STEPS, LOAD_FUEL, MAX_DEPTH, cache=False)
+    evaluator.define('load', _no_load)
+    errors = []
+    for form in forms:
+        try:
+            evaluator.eval(form, '<submission>')
+        except Exception as e:
+            errors.append(f"line {form.line}: {e}" if isinstance(form, list) else str(e))
+    report(errors=errors)
+
+    evaluator.fuel = None
+    evaluator.max_steps = VECTOR_STEPS
+    for name, expression, decoder, expected in TEST_VECTORS:
+        try:
+            actual = _DECODERS[decoder](evaluator, evaluator.eval(next(read_forms(expression)), name))
+        except Exception as e:
+            report(vector=name, passed=False, error=str(e))
+            continue
+        if actual == expected:
+            report(vector=name, passed=True)
+        else:
+            report(vector=name, passed=False, error=f"expected {expected!r}, got {actual!r}")
+    return 0
+
+
+def _text(data: Any) -> str:
+    return data.decode('utf-8', 'replace') if isinstance(data, bytes) else data or ''
+
+
+def grade_source(source: str) -> Dict[str, Any]:
+    """
+    Grade one submission in a sandboxed subprocess.
+
+    Args:
+        source: The submission, as Scheme or as Markdown with fenced code.
+            It is graded as `normalise_source` leaves it, so answers with
+            the same normal form get the same report.
+
+    Returns:
+        dict: The `grade` and the `scores` it is the weighted mean of, all
+        from 0 to 1; the `structure` checks; the `failed` test vectors with
+        the reason each failed; the `primitives` used, with counts; the
+        `errors` raised while loading the submission; whether the grading
+        subprocess was `interrupted` after reporting the static scores, by
+        a crash or WALL_SECONDS, so that some vectors did not run; and the
+        `version` of the grader.
+
+    Raises:
+        RuntimeError: If the grading subprocess failed before reporting
+            anything, so there is nothing to grade the submission on.
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--sandbox']
+    try:
+        done = subprocess.run(command, input=normalise_source(source), capture_output=True, text=True,
+                              timeout=WALL_SECONDS, cwd=tempfile.gettempdir())
+        output, stderr = done.stdout, done.stderr
+        problem = None if done.returncode == 0 else f"grading subprocess exited with status {done.returncode}"
+    except subprocess.TimeoutExpired as e:
+        # Output captured before a timeout is bytes even with text=True.
+        output, stderr = _text(e.stdout), _text(e.stderr)
+        problem = f"grading subprocess killed after {WALL_SECONDS} s"
+
+    static: Dict[str, Any] = {}
+    results: Dict[str, Dict] = {}
+    errors: List[str] = []
+    for line in output.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue  # cut short when the subprocess was killed
+        if 'vector' in record:
+            results[record['vector']] = record
+        else:
+            static.update(record)
+            errors += record.get('errors', [])
+    if 'purity' not in static:
+        detail = stderr.strip().splitlines()[-1:] or ['no output']
+        raise RuntimeError(f"{problem or 'grading subprocess reported nothing'}: {detail[0]}")
+    if problem:
+        errors.append(problem)
+
+    checks = static.get('structure', {})
+    failed = {name: results.get(name, {}).get('error', 'not run')
+              for name, *_ in TEST_VECTORS if not results.get(name, {}).get('passed')}
+    scores = {
+        'purity': static.get('purity', 0.0),
+        'correctness': 1 - len(failed) / len(TEST_VECTORS),
+        'structure': sum(checks.values()) / len(checks) if checks else 0.0,
+    }
+    grade = sum(WEIGHTS[criterion] * score for criterion, score in scores.items())
+    return {
+        'grade': round(grade, 4),
+        'scores': {criterion: round(score, 4) for criterion, score in scores.items()},
+        'structure': {check: round(score, 4) for check, score in checks.items()},
+        'failed': failed,
+        'primitives': static.get('primitives', {}),
+        'errors': errors,
+        'interrupted': problem is not None,
+        'version': GRADER_VERSION,
+    }
+
+
+def grade_sources(sources: Iterable[str], jobs: int = os.cpu_count() or 1) -> Iterator[Dict[str, Any]]:
+    """Grade submissions `jobs` at a time, yielding their reports in order."""
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(grade_source, sources)
+
+
+def _read(path: str) -> str:
+    with open(path, encoding='utf-8', errors='replace') as f:
+        return f.read()
+
+
+@click.command()
+@click.argument('patterns', nargs=-1)
+@click.option('--jobs', '-j', type=int, default=os.cpu_count() or 1, show_default=True,
+              help="Submissions graded at once.")
+@click.option('--sandbox', is_flag=True, hidden=True, help="Grade the submission on stdin.")
+def main(patterns: List[str], jobs: int, sandbox: bool) -> None:
+    """
+    Grade Scheme files, directories and globs offline.
+
+    Writes one JSON object per file to stdout, in the order given, and the
+    mean grade to stderr.
+    """
+    if sandbox:
+        sys.exit(_sandbox())
+    paths = expand_paths(patterns)
+    if not paths:
+        raise click.ClickException("No Scheme files matched")
+    start = time.perf_counter()
+    total = 0.0
+    for path, report in zip(paths, grade_sources(map(_read, paths), max(jobs, 1))):
+        total += report['grade']
+        sys.stdout.write(json.dumps({'file': path, **report}) + '\n')
+        sys.stdout.flush()
+    elapsed = time.perf_counter() - start
+    click.echo(f"Graded {len(paths)} files in {elapsed:.1f} s, mean grade {total / len(paths):.3f}", err=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,12 @@
+import hashlib
+import json
+import mmap
 import re
-from collections import defaultdict
-from typing import Dict, Set, List, Tuple
+import struct
+import sys
+from array import array
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple, Union
 import click
 import os
 
@@ -146,62 +152,644 @@ def parse(tokens: List[str]) -> List:
     else:
         return token
 
+class Token(str):
+    """An atom or string literal as written in the source, with its 1-based line and column."""
+
+    def __new__(cls, text: str, line: int = 0, col: int = 0):
+        self = super().__new__(cls, text)
+        self.line = line
+        self.col = col
+        return self
+
+class Form(list):
+    """A parenthesised form, with the line and column of its opening bracket."""
+
+    def __init__(self, items: Iterable = (), line: int = 0, col: int = 0):
+        super().__init__(items)
+        self.line = line
+        self.col = col
+
+# Whitespace and line comments are consumed together with the token after
+# them; a match without a token group is trailing whitespace or a bad string.
+_TOKEN = re.compile(r'''
+    (?:\s+|;[^\n]*)*
+    (?:
+        (?P<block>\#\|)
+      | (?P<open>[(\[])
+      | (?P<close>[)\]])
+      | (?P<quote>'|`|,@|,)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<atom>[^\s()\[\]";'`,][^\s()\[\]";]*)
+    )?
+''', re.VERBOSE)
+
+_BLOCK_DELIMITER = re.compile(r'\#\||\|\#')
+
+_QUOTES = {"'": 'quote', '`': 'quasiquote', ',': 'unquote', ',@': 'unquote-splicing'}
+
+_CLOSERS = {'(': ')', '[': ']'}
+
+def _block_comment_end(text: str, pos: int) -> int:
+    """Return the index just past the `|#` closing a (possibly nested) block comment, or -1."""
+    depth = 1
+    for match in _BLOCK_DELIMITER.finditer(text, pos):
+        depth += 1 if match.group() == '#|' else -1
+        if depth == 0:
+            return match.end()
+    return -1
+
+def read_forms(source: Union[str, TextIO], filename: Optional[str] = None,
+               chunk_size: int = 1 << 16) -> Iterator[Union[Form, Token]]:
+    """
+    Read top-level forms one at a time from a string or a text stream.
+
+    The reader makes a single pass with a cursor and an explicit stack, so it
+    runs in linear time and any nesting depth is fine. Streams are read in
+    chunks of `chunk_size` characters. `;` line comments and nestable `#| |#`
+    block comments are skipped, `'x` is read as `(quote x)` (likewise for
+    `` ` ``, `,` and `,@`), and square brackets pair like parentheses. String
+    literals are kept as written, quotes included.
+
+    Raises:
+        SyntaxError: On unbalanced brackets or an unterminated string or
+            comment, with the file name, line and column set.
+    """
+    if isinstance(source, str):
+        buffer, read = source, None
+    else:
+        buffer, read = '', source.read
+    filename = filename or getattr(source, 'name', '<string>')
+    pos = line_start = 0
+    line = 1
+    stack: List[Tuple[Form, Optional[str]]] = []
+
+    def error(message: str, line: int, col: int) -> SyntaxError:
+        return SyntaxError(message, (filename, line, col, None))
+
+    match_token = _TOKEN.match
+    size = len(buffer)
+    while pos < size or read is not None:
+        match = match_token(buffer, pos)
+        kind, end = match.lastgroup, match.end()
+        if kind == 'block':
+            end = _block_comment_end(buffer, end)
+        # A token that reaches the end of the buffer may continue in the next chunk.
+        if read is not None and (kind is None or end < 0 or end == size):
+            chunk = read(chunk_size)
+            if chunk:
+                buffer = buffer[pos:] + chunk
+                size = len(buffer)
+                line_start -= pos
+                pos = 0
+            else:
+                read = None
+            continue
+        start = match.start(kind) if kind else end
+        newlines = buffer.count('\n', pos, start)
+        if newlines:
+            line += newlines
+            line_start = buffer.rindex('\n', pos, start) + 1
+        token_line, col = line, start - line_start + 1
+        pos = end
+        if kind == 'atom':
+            # Built without Token.__new__, which is the hot path.
+            datum = str.__new__(Token, buffer[start:end])
+            datum.line, datum.col = token_line, col
+        elif kind == 'open':
+            form = list.__new__(Form)
+            form.line, form.col = token_line, col
+            stack.append((form, _CLOSERS[buffer[start]]))
+            continue
+        elif kind == 'close':
+            text = buffer[start]
+            if not stack or stack[-1][1] is None:
+                raise error(f"Unexpected '{text}'", token_line, col)
+            if stack[-1][1] != text:
+                form = stack[-1][0]
+                raise error(f"Expected '{stack[-1][1]}' to close line {form.line} column {form.col}, "
+                            f"found '{text}'", token_line, col)
+            datum = stack.pop()[0]
+        elif kind == 'quote':
+            quote = Token(_QUOTES[buffer[start:end]], token_line, col)
+            stack.append((Form([quote], token_line, col), None))
+            continue
+        elif kind is None:
+            if end < size:
+                raise error("Unexpected EOF: unterminated string", token_line, col)
+            continue
+        else:
+            if end < 0:
+                raise error("Unexpected EOF: unterminated block comment", token_line, col)
+            newlines = buffer.count('\n', start, end)
+            if newlines:
+                line += newlines
+                line_start = buffer.rindex('\n', start, end) + 1
+            if kind == 'block':
+                continue
+            datum = Token(buffer[start:end], token_line, col)
+
+        # Attach the finished datum to its parent, closing any quote prefixes.
+        while stack:
+            form, closer = stack[-1]
+            form.append(datum)
+            if closer is not None:
+                break
+            stack.pop()
+            datum = form
+        else:
+            yield datum
+
+    if stack:
+        form, closer = stack[-1]
+        opener = form[0] if closer is None else {')': '(', ']': '['}[closer]
+        raise error(f"Unexpected EOF: '{opener}' is never closed", form.line, form.col)
+
+BOUND, DEFINED, PRIMITIVE, FREE = 'bound', 'defined', 'primitive', 'free'
+
+_LITERAL = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$|[#"]')
+
+_LET_FORMS = {'let', 'let*', 'letrec', 'letrec*'}
+
+def _param_names(spec) -> List[str]:
+    """Names bound by a lambda parameter list: a symbol, a list, or a list with `. rest`."""
+    if isinstance(spec, str):
+        return [spec]
+    if isinstance(spec, list):
+        return [name for name in spec if isinstance(name, str) and name != '.']
+    return []
+
+def _internal_defines(body: List) -> List[str]:
+    """Names defined at the start of a lambda or let body, which scope over the whole body."""
+    names = []
+    for form in body:
+        if isinstance(form, list) and len(form) > 1 and form[0] == 'define':
+            target = form[1]
+            while isinstance(target, list) and target:
+                target = target[0]
+            if isinstance(target, str):
+                names.append(target)
+    return names
+
+def top_level_defines(forms: Iterable) -> Set[str]:
+    """Names defined by `(define name ...)` or `(define (name ...) ...)` at top level."""
+    return set(_internal_defines(list(forms)))
+
+def resolve(forms: Iterable, defined: Set[str] = frozenset(), bound: Iterable[str] = ()) -> Dict[str, Counter]:
+    """
+    Classify every identifier reference in the forms.
+
+    The forms are walked with an explicit worklist, so nesting depth is not
+    limited by the Python stack. Lexical scope is a count of live bindings
+    per name: entering a lambda or let increments the counts of the names it
+    binds and leaving it decrements them, so each reference is resolved once
+    in constant time. A reference is `bound` if a lambda, let or internal
+    define in scope binds it, `defined` if it names a top-level definition,
+    `primitive` if it is a standard Scheme primitive, and `free` otherwise.
+    Names in ALLOWED_PRIMITIVES, such as `error`, are not counted unless
+    bound or defined, wherever they appear, and quoted data is skipped.
+
+    Args:
+        forms: Top-level forms, as read by `read_forms`.
+        defined: Names defined at top level, here or in loaded files.
+        bound: Names to treat as bound around every form.
+
+    Returns:
+        dict: A Counter of references by name for each of BOUND, DEFINED,
+        PRIMITIVE and FREE.
+    """
+    references = {BOUND: Counter(), DEFINED: Counter(), PRIMITIVE: Counter(), FREE: Counter()}
+    scope = Counter(bound)
+    # Items are ('expr', node), ('bind', names) or ('unbind', names).
+    work = [('expr', form) for form in reversed(list(forms))]
+    while work:
+        action, node = work.pop()
+        if action == 'bind':
+            scope.update(node)
+            continue
+        if action == 'unbind':
+            scope.subtract(node)
+            continue
+        if isinstance(node, str):
+            if _LITERAL.match(node):
+                continue
+            if scope[node] > 0:
+                references[BOUND][node] += 1
+            elif node in defined:
+                references[DEFINED][node] += 1
+            elif node in ALLOWED_PRIMITIVES:
+                continue
+            elif node in SCHEME_PRIMITIVES:
+                references[PRIMITIVE][node] += 1
+            else:
+                references[FREE][node] += 1
+            continue
+        if not node:
+            continue
+        head = node[0]
+        if isinstance(head, str) and scope[head] == 0 and head not in defined:
+            if head == 'quote':
+                continue
+            if head == 'quasiquote':
+                # Only the unquoted parts of a template are evaluated.
+                pending = node[1:]
+                while pending:
+                    datum = pending.pop()
+                    if isinstance(datum, list) and datum:
+                        if datum[0] in ('unquote', 'unquote-splicing'):
+                            references[PRIMITIVE][datum[0]] += 1
+                            work.extend(('expr', e) for e in reversed(datum[1:]))
+                        else:
+                            pending.extend(datum)
+                references[PRIMITIVE][head] += 1
+                continue
+            if head == 'lambda' or (head == 'define' and len(node) > 1 and isinstance(node[1], list)):
+                if head == 'lambda':
+                    names = _param_names(node[1]) if len(node) > 1 else []
+                else:
+                    # (define (name . params) body...), possibly curried: ((name a) b)
+                    names, target = [], node[1]
+                    while isinstance(target, list) and target:
+                        names += _param_names(target[1:])
+                        target = target[0]
+                body = node[2:]
+                names += _internal_defines(body)
+                work.append(('unbind', names))
+                work.extend(('expr', e) for e in reversed(body))
+                work.append(('bind', names))
+                continue
+            if head == 'define':
+                work.extend(('expr', e) for e in reversed(node[2:]))
+                continue
+            if head in _LET_FORMS and len(node) > 2:
+                references[PRIMITIVE][head] += 1
+                named = isinstance(node[1], str)
+                bindings = node[2] if named else node[1]
+                bindings = bindings if isinstance(bindings, list) else []
+                body = node[3:] if named else node[2:]
+                names = [b[0] for b in bindings if isinstance(b, list) and b and isinstance(b[0], str)]
+                inits = [e for b in bindings if isinstance(b, list) for e in b[1:]]
+                if named:
+                    names.append(node[1])
+                names += _internal_defines(body)
+                work.append(('unbind', names))
+                work.extend(('expr', e) for e in reversed(body))
+                if head == 'let':
+                    # The initial values, even of a named let, are outside its scope.
+                    work.append(('bind', names))
+                    work.extend(('expr', e) for e in reversed(inits))
+                else:
+                    work.extend(('expr', e) for e in reversed(inits))
+                    work.append(('bind', names))
+                continue
+            if head in ALLOWED_PRIMITIVES:
+                work.extend(('expr', e) for e in reversed(node[1:]))
+                continue
+        work.extend(('expr', e) for e in reversed(node))
+    return references
+
+def analyze_program(forms: Iterable, visible: Iterable[str] = ()) -> Dict[str, int]:
+    """
+    Count non-allowed primitives and free names in a program.
+
+    Top-level definitions are collected first, so a function may be used
+    before the form that defines it.
+
+    Args:
+        forms: Top-level forms, as read by `read_forms`.
+        visible: Names defined by loaded files.
+
+    Returns:
+        dict: Counts of PRIMITIVE and FREE references by name.
+    """
+    forms = list(forms)
+    references = resolve(forms, top_level_defines(forms) | set(visible))
+    non_allowed_used = references[PRIMITIVE] + references[FREE]
+    return dict(non_allowed_used)
+
 def analyze_expression(expr: List, defined_funcs: Set[str], lambda_params: Set[str], non_allowed_used: Dict[str, int]) -> None:
     """Analyze an expression and update the non_allowed_used dictionary."""
-    if isinstance(expr, list) and len(expr) > 0:
-        if expr[0] == 'define':
-            defined_funcs.add(expr[1])
-            if isinstance(expr[2], list) and expr[2][0] == 'lambda':
-                lambda_params = set(expr[2][1])
-                analyze_expression(expr[2][2], defined_funcs, lambda_params, non_allowed_used)
-            else:
-                analyze_expression(expr[2], defined_funcs, lambda_params, non_allowed_used)
-        elif expr[0] == 'lambda':
-            lambda_params = set(expr[1])
-            analyze_expression(expr[2], defined_funcs, lambda_params, non_allowed_used)
+    defined_funcs |= top_level_defines([expr])
+    references = resolve([expr], defined_funcs, lambda_params)
+    for name, count in (references[PRIMITIVE] + references[FREE]).items():
+        non_allowed_used[name] += count
+
+# Bump whenever the analysis changes, so cached results are recomputed.
+ANALYSIS_VERSION = 3
+
+CACHE_DIR_NAME = '__schemecache__'
+
+LINT_CACHE_NAME = 'lint.json'
+
+def default_cache_path(file_path: str) -> str:
+    """Return the lint cache used for a file: __schemecache__/lint.json beside it."""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME, LINT_CACHE_NAME)
+
+# Read snapshots hold the forms of a file as flat arrays, so a file that has
+# not changed is rebuilt without tokenising it again. After the header come
+# three i32 arrays with one entry per datum in preorder (the string number
+# of an atom, or -1 - n for a form of n items; its line; its column), the
+# offset of each distinct atom text in characters, and the UTF-8 text.
+SNAPSHOT_VERSION = 1
+
+_SNAPSHOT_HEADER = struct.Struct('<4sI32sIII')
+
+def snapshot_path(file_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Return where the read snapshot of a file lives.
+
+    There is one snapshot per file, overwritten when the source changes;
+    the SHA-256 in its header says which source it was read from.
+    """
+    directory = cache_dir or os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+    return os.path.join(directory, f'{os.path.basename(file_path)}.forms')
+
+def forms_to_bytes(forms: List, digest: str) -> bytes:
+    """Serialise forms as read by `read_forms` into a read snapshot."""
+    strings: Dict[str, int] = {}
+    tags, lines, cols = array('i'), array('i'), array('i')
+    pending = list(reversed(forms))
+    while pending:
+        datum = pending.pop()
+        if isinstance(datum, list):
+            tags.append(-1 - len(datum))
+            pending.extend(reversed(datum))
         else:
-            if isinstance(expr[0], str):
-                if expr[0] not in ALLOWED_PRIMITIVES:
-                    if expr[0] in SCHEME_PRIMITIVES or expr[0] not in defined_funcs and expr[0] not in lambda_params:
-                        non_allowed_used[expr[0]] += 1
-            for sub_expr in expr[1:]:
-                analyze_expression(sub_expr, defined_funcs, lambda_params, non_allowed_used)
-    elif isinstance(expr, str) and expr not in ALLOWED_PRIMITIVES and expr in SCHEME_PRIMITIVES:
-        non_allowed_used[expr] += 1
-
-def parse_scheme_file(file_path: str) -> Dict[str, int]:
+            tags.append(strings.setdefault(str(datum), len(strings)))
+        lines.append(getattr(datum, 'line', 0))
+        cols.append(getattr(datum, 'col', 0))
+    offsets = array('i', [0])
+    for text in strings:
+        offsets.append(offsets[-1] + len(text))
+    text = ''.join(strings).encode('utf-8')
+    if sys.byteorder != 'little':
+        for data in (tags, lines, cols, offsets):
+            data.byteswap()
+    header = _SNAPSHOT_HEADER.pack(b'SCMF', SNAPSHOT_VERSION, bytes.fromhex(digest), len(tags),
+                                   len(strings), len(text))
+    return b''.join([header, tags.tobytes(), lines.tobytes(), cols.tobytes(), offsets.tobytes(), text])
+
+def forms_from_buffer(buffer, digest: Optional[str] = None) -> List:
+    """
+    Rebuild the forms of a read snapshot held in a buffer or a memory map.
+
+    Raises:
+        ValueError: If the buffer is not a snapshot of this version, or not
+            of the source with the given SHA-256.
+    """
+    view = memoryview(buffer)
+    try:
+        if len(view) < _SNAPSHOT_HEADER.size or sys.byteorder != 'little':
+            raise ValueError("Not a read snapshot")
+        magic, version, source_digest, count, strings, size = _SNAPSHOT_HEADER.unpack_from(view)
+        if magic != b'SCMF' or version != SNAPSHOT_VERSION:
+            raise ValueError(f"Not a read snapshot of version {SNAPSHOT_VERSION}")
+        if digest is not None and source_digest != bytes.fromhex(digest):
+            raise ValueError("Read snapshot of a different source")
+        pos = _SNAPSHOT_HEADER.size
+        if len(view) != pos + 4 * (3 * count + strings + 1) + size:
+            raise ValueError("Read snapshot is truncated")
+        arrays = []
+        for length in (count, count, count, strings + 1):
+            arrays.append(view[pos:pos + 4 * length].cast('i').tolist())
+            pos += 4 * length
+        tags, lines, cols, offsets = arrays
+        text = bytes(view[pos:]).decode('utf-8')
+    finally:
+        view.release()
+    atoms = [text[offsets[i]:offsets[i + 1]] for i in range(strings)]
+    # Walking the preorder backwards, a form's items are on top of the
+    # stack, first item topmost, by the time the form itself is reached.
+    stack: List = []
+    for tag, line, col in zip(reversed(tags), reversed(lines), reversed(cols)):
+        if tag >= 0:
+            stack.append(Token(atoms[tag], line, col))
+        elif tag == -1:
+            stack.append(Form((), line, col))
+        else:
+            items = stack[tag + 1:]
+            del stack[tag + 1:]
+            items.reverse()
+            stack.append(Form(items, line, col))
+    stack.reverse()
+    return stack
+
+def load_forms(file_path: str, cache: bool = True, cache_dir: Optional[str] = None) -> List:
+    """
+    Read every form of a file, through its read snapshot when there is one.
+
+    A snapshot is used only if the SHA-256 in its header matches the
+    source, and is otherwise replaced, so each file has at most one. It is
+    memory-mapped when read and written atomically. A cache directory that
+    cannot be written is silently skipped.
+
+    Raises:
+        SyntaxError: As `read_forms`, when the source has to be read.
+    """
+    with open(file_path, 'rb') as f:
+        source = f.read()
+    if not cache:
+        return list(read_forms(source.decode('utf-8'), file_path))
+    digest = hashlib.sha256(source).hexdigest()
+    snapshot = snapshot_path(file_path, cache_dir)
+    try:
+        with open(snapshot, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return forms_from_buffer(data, digest)
+    except (OSError, ValueError):
+        pass
+    forms = list(read_forms(source.decode('utf-8'), file_path))
+    try:
+        os.makedirs(os.path.dirname(snapshot), exist_ok=True)
+        temporary = f'{snapshot}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(forms_to_bytes(forms, digest))
+        os.replace(temporary, snapshot)
+    except OSError:
+        pass
+    return forms
+
+def _summarise(path: str, forms: List) -> Dict:
+    """Collect the files loaded and the names defined at top level."""
+    loads, defines = [], []
+    for form in forms:
+        if not isinstance(form, list) or len(form) < 2:
+            continue
+        if form[0] == 'load' and isinstance(form[1], str) and form[1].startswith('"'):
+            loaded = os.path.join(os.path.dirname(path), form[1].strip('"'))
+            loads.append(os.path.realpath(loaded))
+        elif form[0] == 'define':
+            target = form[1][0] if isinstance(form[1], list) and form[1] else form[1]
+            if isinstance(target, str):
+                defines.append(str(target))
+    return {'loads': loads, 'defines': sorted(set(defines))}
+
+def _components(graph: Dict[str, List[str]]) -> List[List[str]]:
+    """Strongly connected components of the load graph, dependencies first (iterative Tarjan)."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack: Set[str] = set()
+    components = []
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, edges = work[-1]
+            for child in edges:
+                if child not in index:
+                    index[child] = low[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph[child])))
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+class AnalysisCache:
+    """
+    Per-file lint results, keyed by path and content hash and saved as JSON.
+
+    Each file is analysed once with the definitions of every file it loads,
+    directly or not, in scope. A result is reused while the file and all of
+    those files are unchanged, so editing a file re-analyses it and the
+    files that load it, and nothing else. Files that load each other form
+    one group that shares definitions; each file is counted once.
+
+    Args:
+        path: JSON file to load and save entries, or None to keep them in
+            memory only.
+
+    Attributes:
+        analysed: Files analysed, rather than taken from the cache, so far.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.analysed: List[str] = []
+        self._forms: Dict[str, List] = {}
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            if data.get('version') == ANALYSIS_VERSION:
+                self.entries = data['files']
+
+    def _scan(self, path: str) -> Dict:
+        """Return the entry for a file, reading and summarising it only if it changed."""
+        with open(path, 'rb') as f:
+            source = f.read()
+        digest = hashlib.sha256(source).hexdigest()
+        entry = self.entries.get(path)
+        if entry is None or entry['sha256'] != digest:
+            forms = list(read_forms(source.decode('utf-8'), path))
+            entry = self.entries[path] = dict(_summarise(path, forms), sha256=digest)
+            self._forms[path] = forms
+            self._dirty = True
+        return entry
+
+    def graph(self, file_path: str) -> Dict[str, List[str]]:
+        """Return the load graph reachable from a file, by real path. Missing files are left out."""
+        root = os.path.realpath(file_path)
+        graph: Dict[str, List[str]] = {}
+        pending = [root]
+        while pending:
+            path = pending.pop()
+            if path in graph:
+                continue
+            graph[path] = [p for p in self._scan(path)['loads'] if os.path.exists(p)]
+            pending.extend(graph[path])
+        return graph
+
+    def _analyse(self, path: str, visible: Set[str]) -> Dict[str, int]:
+        forms = self._forms.pop(path, None)
+        if forms is None:
+            with open(path) as f:
+                forms = list(read_forms(f))
+        self.analysed.append(path)
+        return analyze_program(forms, visible)
+
+    def lint(self, file_path: str) -> Dict[str, int]:
+        """
+        Count non-allowed primitives and undefined names in a file and the files it loads.
+
+        Returns:
+            dict: Counts by name, summed over the file and everything it
+            loads, each file once.
+
+        Raises:
+            SyntaxError: If a file cannot be read as Scheme.
+        """
+        graph = self.graph(file_path)
+        closures: Dict[str, Set[str]] = {}
+        for component in _components(graph):
+            closure = set(component)
+            for member in component:
+                for loaded in graph[member]:
+                    closure.update(closures.get(loaded, ()))
+            for member in component:
+                closures[member] = closure
+        for path, closure in closures.items():
+            entry = self.entries[path]
+            others = sorted(closure - {path})
+            key = hashlib.sha256('\n'.join(f"{p} {self.entries[p]['sha256']}" for p in others).encode()).hexdigest()
+            if entry.get('dependencies') != key or 'non_allowed' not in entry:
+                visible = {name for p in others for name in self.entries[p]['defines']}
+                entry['non_allowed'] = self._analyse(path, visible)
+                entry['dependencies'] = key
+                self._dirty = True
+        totals = defaultdict(int)
+        for path in sorted(closures[os.path.realpath(file_path)]):
+            for name, count in self.entries[path]['non_allowed'].items():
+                totals[name] += count
+        return totals
+
+    def merge(self, entries: Dict[str, Dict]) -> None:
+        """Add entries computed by another cache, such as one in a worker process."""
+        if entries:
+            self.entries.update(entries)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the entries to `path` if anything changed."""
+        if not self.path or not self._dirty:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'version': ANALYSIS_VERSION, 'files': self.entries}, f)
+        os.replace(temporary, self.path)
+        self._dirty = False
+
+def parse_scheme_file(file_path: str, cache: Optional[AnalysisCache] = None) -> Dict[str, int]:
     """Parse a Scheme file and return a dictionary of non-allowed primitives and undefined functions used."""
-    with open(file_path, 'r') as file:
-        content = file.read()
-    
-    # Remove comments
-    content = re.sub(';.*$', '', content, flags=re.MULTILINE)
-    
-    tokens = tokenize(content)
-    parsed = parse(tokens)
-    
-    defined_funcs = set()
-    non_allowed_used = defaultdict(int)
-    
-    for expr in parsed:
-        analyze_expression(expr, defined_funcs, set(), non_allowed_used)
-    
-    # Handle 'load' specially
-    if 'load' in non_allowed_used:
-        for expr in parsed:
-            if isinstance(expr, list) and expr[0] == 'load':
-                loaded_file = expr[1].strip('"')
-                loaded_path = os.path.join(os.path.dirname(file_path), loaded_file)
-                if os.path.exists(loaded_path):
-                    loaded_non_allowed = parse_scheme_file(loaded_path)
-                    for primitive, count in loaded_non_allowed.items():
-                        non_allowed_used[primitive] += count
-    
-    return non_allowed_used
+    return (cache or AnalysisCache()).lint(file_path)
 
 @click.command()
 @click.argument('file_path', type=click.Path(exists=True))
-def main(file_path: str) -> None:
+@click.option('--no-cache', is_flag=True, help="Analyse every file again instead of using __schemecache__/lint.json.")
+def main(file_path: str, no_cache: bool) -> None:
     """
     Parse a Scheme file and report on non-allowed primitives and undefined function calls.
 
@@ -210,8 +798,13 @@ def main(file_path: str) -> None:
 
     Usage: python scheme_parser.py <path_to_lambda-calculus.scm>
     """
-    non_allowed_used = parse_scheme_file(file_path)
-    
+    cache = AnalysisCache(None if no_cache else default_cache_path(file_path))
+    try:
+        non_allowed_used = parse_scheme_file(file_path, cache)
+    except SyntaxError as e:
+        raise click.ClickException(f"{e.filename}:{e.lineno}:{e.offset}: {e.msg}")
+    cache.save()
+
     if not non_allowed_used:
         click.echo(click.style("No non-allowed primitives or undefined function calls found. The implementation appears to be pure lambda calculus!", fg="green"))
     else:
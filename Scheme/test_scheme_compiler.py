@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from scheme_compiler import CompileError, SchemeModule, compile_program, load, read_program
+from scheme_eval import Evaluator
+
+PROGRAMS = {
+    'fact': """
+        (define fact (lambda (n) (if (= n 0) 1 (* n (fact (- n 1))))))
+        (define result (fact 10))
+    """,
+    'church': """
+        (define zero (lambda (f) (lambda (x) x)))
+        (define succ (lambda (n) (lambda (f) (lambda (x) (f ((n f) x))))))
+        (define add (lambda (m) (lambda (n) (lambda (f) (lambda (x) ((m f) ((n f) x)))))))
+        (define three (succ (succ (succ zero))))
+        (define result ((((add three) three) (lambda (k) (+ k 1))) 0))
+    """,
+    'lists': """
+        (define (build n) (if (= n 0) '() (cons n (build (- n 1)))))
+        (define (total xs) (cond ((null? xs) 0) (else (+ (car xs) (total (cdr xs))))))
+        (define result (let ((xs (build 6))) (and (not (null? xs)) (total xs))))
+    """,
+}
+
+
+class TestSchemeCompiler(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, '__schemecache__')
+        self.path = os.path.join(self.tmp.name, 'prog.scm')
+        self.write(PROGRAMS['fact'])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, source):
+        with open(self.path, 'w') as f:
+            f.write(source)
+
+    def test_matches_evaluator(self):
+        for name, source in PROGRAMS.items():
+            with self.subTest(name):
+                module = SchemeModule(compile_program(read_program(source)))
+                evaluator = Evaluator()
+                evaluator.eval_source(source)
+                self.assertEqual(module['result'], evaluator['result'])
+
+    def test_cache_hit(self):
+        self.assertEqual(load(self.path, cache_dir=self.cache_dir)['result'], 3628800)
+        self.assertEqual(len(os.listdir(self.cache_dir)), 1)
+        with mock.patch('scheme_compiler.compile_program', side_effect=AssertionError("recompiled")):
+            self.assertEqual(load(self.path, cache_dir=self.cache_dir)['result'], 3628800)
+
+    def test_edit_invalidates(self):
+        self.assertEqual(load(self.path, cache_dir=self.cache_dir)['result'], 3628800)
+        self.write(PROGRAMS['fact'].replace('(fact 10)', '(fact 5)'))
+        with mock.patch('scheme_compiler.compile_program', wraps=compile_program) as compiled:
+            self.assertEqual(load(self.path, cache_dir=self.cache_dir)['result'], 120)
+        compiled.assert_called_once()
+
+    def test_no_cache_writes_nothing(self):
+        self.assertEqual(load(self.path, cache=False, cache_dir=self.cache_dir)['result'], 3628800)
+        self.assertFalse(os.path.exists(self.cache_dir))
+
+    def test_load_is_rejected(self):
+        with self.assertRaises(CompileError) as caught:
+            compile_program(read_program('(load "lc.scm")'), 'examples.scm')
+        self.assertEqual(caught.exception.lineno, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from scheme_eval import EvaluationLimit, Evaluator, SchemeError
+
+COUNTDOWN = "(define (count n) (if (= n 0) 'done (count (- n 1))))"
+DEPTH = "(define (depth n) (if (= n 0) 0 (+ 1 (depth (- n 1)))))"
+
+
+class TestSchemeEval(unittest.TestCase):
+
+    def run_source(self, source, **limits):
+        return Evaluator(cache=False, **limits).eval_source(source, 'test.scm')
+
+    def test_tail_calls_run_in_constant_space(self):
+        self.assertEqual(self.run_source(COUNTDOWN + "(count 100000)", max_depth=10), 'done')
+        mutual = """
+            (define (even? n) (if (= n 0) #t (odd? (- n 1))))
+            (define (odd? n) (if (= n 0) #f (even? (- n 1))))
+            (even? 50001)
+        """
+        self.assertFalse(self.run_source(mutual, max_depth=10))
+
+    def test_max_depth(self):
+        self.assertEqual(self.run_source(DEPTH + "(depth 100)", max_depth=200), 100)
+        with self.assertRaisesRegex(EvaluationLimit, r"test\.scm:1:\d+: recursion deeper than 50 calls"):
+            self.run_source(DEPTH + "(depth 100)", max_depth=50)
+
+    def test_max_steps_bounds_each_form(self):
+        evaluator = Evaluator(max_steps=1000, cache=False)
+        evaluator.eval_source(COUNTDOWN)
+        with self.assertRaisesRegex(EvaluationLimit, "Step limit of 1000 exceeded"):
+            evaluator.eval_source("(count 1000000)")
+        self.assertEqual(evaluator.eval_source("(count 10)"), 'done')
+
+    def test_fuel_bounds_the_whole_run(self):
+        evaluator = Evaluator(fuel=5000, cache=False)
+        evaluator.eval_source(COUNTDOWN)
+        for _ in range(3):
+            evaluator.eval_source("(count 10)")
+        with self.assertRaisesRegex(EvaluationLimit, "Out of fuel after 5000 steps"):
+            evaluator.eval_source("(count 1000)")
+        self.assertEqual(evaluator.steps, 5000)
+
+    def test_fuel_is_checked_on_every_operand(self):
+        # Constant and variable operands are evaluated without a trip round
+        # the machine, but still may not overrun the fuel.
+        for fuel in range(1, 12):
+            evaluator = Evaluator(fuel=fuel, cache=False)
+            try:
+                evaluator.eval_source("(list 1 2 3 4 5 6 7 8 9 10)")
+            except EvaluationLimit as e:
+                self.assertEqual(str(e), f"Out of fuel after {fuel} steps")
+            self.assertLessEqual(evaluator.steps, fuel)
+
+    def test_named_let(self):
+        source = "(let loop ((i 0) (acc '())) (if (= i 3) acc (loop (+ i 1) (cons i acc))))"
+        self.assertEqual(self.run_source(source), [2, 1, 0])
+
+    def test_letrec(self):
+        source = """
+            (letrec ((ev? (lambda (n) (if (= n 0) #t (od? (- n 1)))))
+                     (od? (lambda (n) (if (= n 0) #f (ev? (- n 1))))))
+              (ev? 10))
+        """
+        self.assertTrue(self.run_source(source))
+
+    def test_internal_defines(self):
+        source = """
+            (define (sum-squares xs)
+              (define (square x) (* x x))
+              (define total 0)
+              (define (walk xs acc) (if (null? xs) acc (walk (cdr xs) (+ acc (square (car xs))))))
+              (walk xs total))
+            (sum-squares (list 1 2 3))
+        """
+        self.assertEqual(self.run_source(source), 14)
+
+    def test_rest_parameters(self):
+        self.assertEqual(self.run_source("(define (f a . rest) (list a rest)) (f 1 2 3)"), [1, [2, 3]])
+        self.assertEqual(self.run_source("(define (f a . rest) rest) (f 1)"), [])
+        self.assertEqual(self.run_source("((lambda args args) 1 2)"), [1, 2])
+
+    def test_single_expression_forms(self):
+        self.assertEqual(self.run_source("(cond ((null? 1) 0) (else 3))"), 3)
+        self.assertEqual(self.run_source("(begin 2)"), 2)
+        self.assertEqual(self.run_source("(and 1)"), 1)
+        self.assertEqual(self.run_source("(or 3)"), 3)
+
+    def test_wrong_argument_count(self):
+        with self.assertRaisesRegex(SchemeError, r"^test\.scm:3:1: f: expected 1 argument, got 2$"):
+            self.run_source("(define (f x) x)\n\n(f 1 2)")
+        with self.assertRaisesRegex(SchemeError, r"^test\.scm:1:\d+: g: expected at least 2 arguments, got 1$"):
+            self.run_source("(define (g a b . c) a) (g 1)")
+
+    def test_unbound_variable(self):
+        with self.assertRaisesRegex(SchemeError, r"^test\.scm:2:7: unbound variable missing$"):
+            self.run_source("(define (f x) x)\n(f 1 (missing))")
+
+    def test_load_cycle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, other in (('a.scm', 'b.scm'), ('b.scm', 'a.scm')):
+                with open(os.path.join(tmp, name), 'w') as f:
+                    f.write(f'(define {name[0]} 1)\n(load "{other}")\n')
+            evaluator = Evaluator(cache=False)
+            with self.assertRaisesRegex(SchemeError, "load cycle"):
+                evaluator.load(os.path.join(tmp, 'a.scm'))
+            self.assertIn('b', evaluator)
+
+    def test_load_is_relative_to_the_loading_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.mkdir(os.path.join(tmp, 'lib'))
+            with open(os.path.join(tmp, 'lib', 'base.scm'), 'w') as f:
+                f.write('(define base 41)\n')
+            with open(os.path.join(tmp, 'main.scm'), 'w') as f:
+                f.write('(load "lib/base.scm")\n(define answer (+ base 1))\n')
+            evaluator = Evaluator(cache=False)
+            evaluator.load(os.path.join(tmp, 'main.scm'))
+            self.assertEqual(evaluator['answer'], 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
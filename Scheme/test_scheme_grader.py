@@ -0,0 +1,149 @@
+import subprocess
+import unittest
+from unittest import mock
+from scheme_eval import Evaluator
+from scheme_grader import (GRADER_VERSION, TEST_VECTORS, WALL_SECONDS, _call, _decode_boolean, _decode_numeral,
+                           _structure, extract_code, grade_source, normalise_source)
+from scheme_parser import read_forms
+
+GOOD = '''\
+;; Filename: lambda-calculus.scm
+;; Description: Church encodings in pure lambda calculus
+;; Author: Test Fixture
+;; Model: none
+;; Usage: (load "lambda-calculus.scm")
+
+;; Identity
+(define identity (lambda (x) x))
+
+;; Church booleans
+(define lc-true (lambda (t f) t))
+(define lc-false (lambda (t f) f))
+(define lc-if (lambda (c t e) (c t e)))
+
+;; Church numerals
+(define lc-zero (lambda (f) (lambda (x) x)))
+(define lc-succ (lambda (n) (lambda (f) (lambda (x) (f ((n f) x))))))
+(define lc-add (lambda (m n) (lambda (f) (lambda (x) ((m f) ((n f) x))))))
+(define lc-mult (lambda (m n) (lambda (f) (m (n f)))))
+(define lc-is-zero? (lambda (n) ((n (lambda (x) lc-false)) lc-true)))
+
+;; Pairs
+(define lc-pair (lambda (a b) (lambda (s) (s a b))))
+(define lc-first (lambda (p) (p lc-true)))
+(define lc-second (lambda (p) (p lc-false)))
+
+;; Lists
+(define lc-nil (lambda (c n) n))
+(define lc-cons (lambda (h t) (lambda (c n) (c h (t c n)))))
+(define lc-is-nil? (lambda (l) (l (lambda (h t) lc-false) lc-true)))
+(define lc-head (lambda (l) (l (lambda (h t) h) lc-false)))
+(define lc-fold (lambda (f z l) (l f z)))
+(define lc-map (lambda (f l) (l (lambda (h t) (lc-cons (f h) t)) lc-nil)))
+(define lc-filter (lambda (p l) (l (lambda (h t) (p h (lc-cons h t) t)) lc-nil)))
+(define lc-tail
+  (lambda (l)
+    (lc-first (l (lambda (h p) (lc-pair (lc-second p) (lc-cons h (lc-second p))))
+                 (lc-pair lc-nil lc-nil)))))
+'''
+
+BAD = '''\
+(define identity (lambda (x) (car (list x))))
+(define lc-true #t)
+(define lcZero 0)
+(lc-true 1)
+'''
+
+
+class TestSchemeGrader(unittest.TestCase):
+
+    def test_extract_code(self):
+        answer = "Here it is:\n```scheme\n(define a 1)\n```\nand\n```\n(define b 2)\n```\nDone."
+        self.assertEqual(extract_code(answer), "(define a 1)\n\n(define b 2)\n")
+        self.assertEqual(extract_code("(define a 1)"), "(define a 1)")
+
+    def test_normalise_source(self):
+        source = "\n\n  (define a\r\n      1)   \r\n\r\n\r\n\t; note\n\n"
+        self.assertEqual(normalise_source(source), "(define a\n1)\n\n; note\n")
+        self.assertEqual(normalise_source(normalise_source(source)), normalise_source(source))
+        self.assertEqual(normalise_source("```scheme\n" + GOOD + "```\n"), normalise_source(GOOD))
+
+    def test_call_curries(self):
+        evaluator = Evaluator(cache=False)
+        evaluator.eval_source("""
+            (define curried-true (lambda (t) (lambda (f) t)))
+            (define uncurried-false (lambda (t f) f))
+            (define two (lambda (f) (lambda (x) (f (f x)))))
+            (define three (lambda (f x) (f (f (f x)))))
+            (define rest-true (lambda (t . more) t))
+            (define five (lambda (t f) 5))
+        """)
+        self.assertTrue(_decode_boolean(evaluator, evaluator['curried-true']))
+        self.assertFalse(_decode_boolean(evaluator, evaluator['uncurried-false']))
+        self.assertTrue(_decode_boolean(evaluator, evaluator['rest-true']))
+        self.assertEqual(_decode_numeral(evaluator, evaluator['two']), 2)
+        self.assertEqual(_decode_numeral(evaluator, evaluator['three']), 3)
+        self.assertEqual(_call(evaluator, evaluator['two'], lambda n: n * 10, 1), 100)
+        with self.assertRaisesRegex(ValueError, "not a Church boolean"):
+            _decode_boolean(evaluator, evaluator['five'])
+        with self.assertRaisesRegex(ValueError, "not a procedure: 1"):
+            _decode_numeral(evaluator, 1)
+
+    def test_structure(self):
+        source = ";; Filename: x.scm\n;; Author: A\n\n;; Identity\n(define identity (lambda (x) x))\n\n(define camelCase 1)\n"
+        checks = _structure(source, list(read_forms(source)))
+        self.assertEqual(checks['header'], 2 / 5)
+        self.assertEqual(checks['comments'], 1 / 2)
+        self.assertEqual(checks['naming'], 1 / 2)
+        self.assertEqual(checks['definitions'], 1 / 19)
+
+    def test_grade_good_submission(self):
+        report = grade_source(GOOD)
+        self.assertEqual(report['grade'], 1.0)
+        self.assertEqual(report['scores'], {'purity': 1.0, 'correctness': 1.0, 'structure': 1.0})
+        self.assertEqual(report['failed'], {})
+        self.assertEqual(report['primitives'], {})
+        self.assertEqual(report['errors'], [])
+        self.assertEqual(report['version'], GRADER_VERSION)
+
+    def test_grade_bad_submission(self):
+        report = grade_source(BAD)
+        self.assertEqual(report['scores'], {'purity': 0.5, 'correctness': 0.05, 'structure': 0.193})
+        self.assertEqual(report['structure'], {'definitions': 0.1053, 'header': 0.0, 'comments': 0.0, 'naming': 0.6667})
+        self.assertEqual(report['grade'], 0.1982)
+        self.assertEqual(report['primitives'], {'car': 1, 'list': 1})
+        self.assertEqual(report['failed']['lc-true'], "not a procedure: #t")
+        self.assertEqual(len(report['failed']), len(TEST_VECTORS) - 1)
+        self.assertEqual(report['errors'], ["line 4: <submission>:4:1: not a procedure: #t"])
+
+    def test_grade_unreadable_submission(self):
+        report = grade_source("(define (f x)")
+        self.assertEqual(report['grade'], 0.0)
+        self.assertEqual(set(report['failed'].values()), {'not run'})
+        self.assertEqual(report['errors'], ["line 1: Unexpected EOF: '(' is never closed"])
+
+    def test_subprocess_failure_before_reporting_raises(self):
+        crash = subprocess.CompletedProcess([], 1, stdout='', stderr='Traceback ...\nImportError: no click\n')
+        with mock.patch('scheme_grader.subprocess.run', return_value=crash):
+            with self.assertRaisesRegex(RuntimeError, "exited with status 1: ImportError: no click"):
+                grade_source(GOOD)
+        timeout = subprocess.TimeoutExpired([], WALL_SECONDS, output=b'', stderr=b'')
+        with mock.patch('scheme_grader.subprocess.run', side_effect=timeout):
+            with self.assertRaisesRegex(RuntimeError, "killed after"):
+                grade_source(GOOD)
+
+    def test_subprocess_failure_after_reporting_is_flagged(self):
+        static = '{"purity": 1.0, "primitives": {}, "structure": {"header": 1.0}}\n{"errors": []}\n'
+        partial = static + '{"vector": "identity", "passed": true}\n{"vect'
+        timeout = subprocess.TimeoutExpired([], WALL_SECONDS, output=partial.encode(), stderr=None)
+        with mock.patch('scheme_grader.subprocess.run', side_effect=timeout):
+            report = grade_source(GOOD)
+        self.assertTrue(report['interrupted'])
+        self.assertEqual(report['scores']['correctness'], 0.05)
+        self.assertEqual(report['failed']['lc-true'], 'not run')
+        self.assertIn(f"grading subprocess killed after {WALL_SECONDS} s", report['errors'])
+        self.assertFalse(grade_source(GOOD)['interrupted'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from scheme_parser import (BOUND, DEFINED, FREE, PRIMITIVE, AnalysisCache, analyze_program, load_forms, read_forms,
+                           resolve, snapshot_path)
+
+
+def lint(source):
+    return analyze_program(read_forms(source))
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+    FILES = {
+        # a and b load each other, so they form one component.
+        'a.scm': '(load "b.scm")\n(define a-id (lambda (x) (b-id x)))\n',
+        'b.scm': '(load "a.scm")\n(define b-id (lambda (x) x))\n(define b-use (lambda (x) (a-id x)))\n',
+        'c.scm': '(define c-id (lambda (x) (car x)))\n',
+        'top.scm': '(load "a.scm")\n(load "c.scm")\n(define top (lambda (x) (c-id (a-id x))))\n',
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = os.path.realpath(self.tmp.name)
+        self.cache_path = os.path.join(self.dir, '__schemecache__', 'lint.json')
+        for name, source in self.FILES.items():
+            self.write(name, source)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+    def write(self, name, source):
+        with open(self.path(name), 'w') as f:
+            f.write(source)
+
+    def lint(self):
+        cache = AnalysisCache(self.cache_path)
+        result = dict(cache.lint(self.path('top.scm')))
+        cache.save()
+        return result, sorted(os.path.basename(p) for p in cache.analysed)
+
+    def test_unchanged_files_hit_the_cache(self):
+        result, analysed = self.lint()
+        self.assertEqual(result, {'car': 1, 'load': 4})
+        self.assertEqual(analysed, ['a.scm', 'b.scm', 'c.scm', 'top.scm'])
+        self.assertEqual(self.lint(), (result, []))
+
+    def test_edit_in_a_cycle_reanalyses_the_component_and_its_loaders(self):
+        self.lint()
+        self.write('b.scm', self.FILES['b.scm'].replace('(a-id x)', '(cdr (a-id x))'))
+        result, analysed = self.lint()
+        self.assertEqual(result, {'car': 1, 'cdr': 1, 'load': 4})
+        self.assertEqual(analysed, ['a.scm', 'b.scm', 'top.scm'])
+        self.assertEqual(self.lint(), (result, []))
+
+    def test_removed_definition_is_reported_in_the_other_member(self):
+        self.lint()
+        self.write('b.scm', '(load "a.scm")\n(define b-use (lambda (x) (a-id x)))\n')
+        result, analysed = self.lint()
+        self.assertEqual(result, {'car': 1, 'b-id': 1, 'load': 4})
+        self.assertEqual(analysed, ['a.scm', 'b.scm', 'top.scm'])
+
+    def test_files_in_a_cycle_are_counted_once(self):
+        cache = AnalysisCache()
+        self.assertEqual(dict(cache.lint(self.path('a.scm'))), {'load': 2})
+        self.assertEqual(dict(cache.lint(self.path('b.scm'))), {'load': 2})
+        self.assertEqual(sorted(os.path.basename(p) for p in cache.analysed), ['a.scm', 'b.scm'])
+
+
+class TestResolve(unittest.TestCase):
+
+    def test_curried_define_binds_every_parameter(self):
+        self.assertEqual(lint('(define ((adder a) b) (lambda (c) (list a b c)))'), {'list': 1})
+
+    def test_dotted_parameters(self):
+        self.assertEqual(lint('(define (f a . rest) (f rest a)) (define g (lambda (x . xs) xs))'), {})
+        self.assertEqual(lint('(define h (lambda args (car args)))'), {'car': 1})
+
+    def test_named_let(self):
+        source = '(define (count n) (let loop ((i 0) (acc n)) (if (loop i acc) i acc)))'
+        self.assertEqual(lint(source), {'let': 1, 'if': 1})
+        # The loop name is not visible in the initial values.
+        self.assertEqual(lint('(let loop ((i loop)) i)'), {'let': 1, 'loop': 1})
+
+    def test_quasiquote_analyses_only_unquoted_parts(self):
+        source = '(define (f b c) `(a ,(g b) ,@c (d e)))'
+        self.assertEqual(lint(source), {'quasiquote': 1, 'unquote': 1, 'unquote-splicing': 1, 'g': 1})
+
+    def test_quoted_data_is_skipped(self):
+        self.assertEqual(lint("(define x '(car cdr undefined))"), {})
+
+    def test_deep_nesting_does_not_recurse(self):
+        depth = 20000
+        source = '(define deep ' + '(lambda (x) ' * depth + '(car x)' + ')' * depth + ')'
+        self.assertGreater(depth, sys.getrecursionlimit())
+        self.assertEqual(lint(source), {'car': 1})
+
+    def test_allowed_primitives_are_not_counted_anywhere(self):
+        self.assertEqual(lint('(define (f x) (x error))'), {})
+        self.assertEqual(lint('(define (f x) (error "bad" x))'), {})
+        references = resolve(read_forms('(lambda (error) (error 1))'))
+        self.assertEqual(references[BOUND], {'error': 1})
+        self.assertEqual(references[PRIMITIVE] + references[FREE] + references[DEFINED], {})
+
+    def test_classification(self):
+        references = resolve(read_forms('(define (f x) (g x (car x)))'), defined={'f', 'g'})
+        self.assertEqual(references[BOUND], {'x': 2})
+        self.assertEqual(references[DEFINED], {'g': 1})
+        self.assertEqual(references[PRIMITIVE], {'car': 1})
+        self.assertEqual(references[FREE], {})
+
+
+class TestReadSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'prog.scm')
+        self.cache_dir = os.path.join(self.tmp.name, '__schemecache__')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def load(self, source):
+        with open(self.path, 'w') as f:
+            f.write(source)
+        return load_forms(self.path, cache_dir=self.cache_dir)
+
+    def test_snapshot_round_trip(self):
+        source = '(define (f x)\n  (g "a b" x))\n; done\n(f 1)\n'
+        forms = self.load(source)
+        with mock.patch('scheme_parser.read_forms', side_effect=AssertionError("read again")):
+            cached = load_forms(self.path, cache_dir=self.cache_dir)
+        self.assertEqual(cached, list(read_forms(source)))
+        self.assertEqual([(f.line, f.col) for f in cached], [(f.line, f.col) for f in forms])
+        self.assertEqual((cached[0][2][2].line, cached[0][2][2].col), (2, 12))
+
+    def test_one_snapshot_per_file(self):
+        for n in range(3):
+            self.assertEqual(self.load(f'(define x {n})'), [['define', 'x', str(n)]])
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(snapshot_path(self.path))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,13 @@
--- Table for storing AI-generated code logs
+-- Generated from MIGRATIONS in ai_code_generation_storage.py by `make schema`.
+-- Do not edit; append a migration there and regenerate.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Migration 1: code generation logs and evaluations
 CREATE TABLE IF NOT EXISTS ai_code_generation_logs (
     id SERIAL PRIMARY KEY,
     provider VARCHAR(50) NOT NULL,
@@ -9,8 +18,6 @@ CREATE TABLE IF NOT EXISTS ai_code_generation_logs (
     language VARCHAR(50) NOT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
--- Table for storing evaluations of AI-generated code
 CREATE TABLE IF NOT EXISTS ai_response_evaluations (
     id SERIAL PRIMARY KEY,
     response_id INTEGER REFERENCES ai_code_generation_logs(id),
@@ -20,9 +27,78 @@ CREATE TABLE IF NOT EXISTS ai_response_evaluations (
     feedback TEXT,
     graded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
-
--- Index for faster lookups on response_id
 CREATE INDEX IF NOT EXISTS idx_response_id ON ai_response_evaluations(response_id);
+CREATE INDEX IF NOT EXISTS idx_graded_at ON ai_response_evaluations(graded_at);
+INSERT INTO schema_migrations (version, description)
+VALUES (1, 'code generation logs and evaluations') ON CONFLICT DO NOTHING;
+
+-- Migration 2: per-criterion model scores
+ALTER TABLE ai_response_evaluations ADD COLUMN IF NOT EXISTS model_scores JSONB;
+ALTER TABLE ai_response_evaluations ADD COLUMN IF NOT EXISTS grader_version INTEGER;
+INSERT INTO schema_migrations (version, description)
+VALUES (2, 'per-criterion model scores') ON CONFLICT DO NOTHING;
+
+-- Migration 3: content-addressed grading cache
+CREATE TABLE IF NOT EXISTS ai_grading_cache (
+    rubric_hash CHAR(64) NOT NULL,
+    grader VARCHAR(50) NOT NULL,
+    grader_version INTEGER NOT NULL,
+    code_hash CHAR(64) NOT NULL,
+    rubric TEXT NOT NULL,
+    model_grade FLOAT NOT NULL,
+    model_scores JSONB,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (rubric_hash, grader, grader_version, code_hash)
+);
+INSERT INTO schema_migrations (version, description)
+VALUES (3, 'content-addressed grading cache') ON CONFLICT DO NOTHING;
+
+-- Migration 4: graded flag and indexes for the grading queue
+-- Set when a response gets its first evaluation, so the ungraded
+-- listings walk a partial index of the ungraded rows only, instead of
+-- probing the evaluations of every graded row they pass.
+ALTER TABLE ai_code_generation_logs ADD COLUMN IF NOT EXISTS graded BOOLEAN NOT NULL DEFAULT FALSE;
+UPDATE ai_code_generation_logs l SET graded = TRUE
+WHERE NOT l.graded AND EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id);
+CREATE INDEX IF NOT EXISTS idx_logs_ungraded ON ai_code_generation_logs(id) WHERE NOT graded;
+-- For the stale check of grade-all --regrade, per response and grader version
+CREATE INDEX IF NOT EXISTS idx_response_grader_version
+    ON ai_response_evaluations(response_id, grader_version);
+INSERT INTO schema_migrations (version, description)
+VALUES (4, 'graded flag and indexes for the grading queue') ON CONFLICT DO NOTHING;
 
--- Index for faster sorting by graded_at
-CREATE INDEX IF NOT EXISTS idx_graded_at ON ai_response_evaluations(graded_at);
\ No newline at end of file
+-- Migration 5: keep the graded flag in step with the evaluations
+-- Statement triggers over transition tables, so a multi-row INSERT of a
+-- grade-all chunk updates its responses in one pass. PostgreSQL allows
+-- transition tables only on single-event triggers, hence one per event.
+CREATE OR REPLACE FUNCTION ai_evaluations_inserted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE ai_code_generation_logs l SET graded = TRUE
+    FROM (SELECT DISTINCT response_id FROM inserted_evaluations) n
+    WHERE l.id = n.response_id AND NOT l.graded;
+    RETURN NULL;
+END
+$$;
+CREATE OR REPLACE FUNCTION ai_evaluations_deleted() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE ai_code_generation_logs l SET graded = FALSE
+    FROM (SELECT DISTINCT response_id FROM deleted_evaluations) o
+    WHERE l.id = o.response_id AND l.graded
+      AND NOT EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id);
+    RETURN NULL;
+END
+$$;
+DROP TRIGGER IF EXISTS ai_evaluations_mark_graded ON ai_response_evaluations;
+CREATE TRIGGER ai_evaluations_mark_graded AFTER INSERT ON ai_response_evaluations
+    REFERENCING NEW TABLE AS inserted_evaluations
+    FOR EACH STATEMENT EXECUTE PROCEDURE ai_evaluations_inserted();
+DROP TRIGGER IF EXISTS ai_evaluations_unmark_graded ON ai_response_evaluations;
+CREATE TRIGGER ai_evaluations_unmark_graded AFTER DELETE ON ai_response_evaluations
+    REFERENCING OLD TABLE AS deleted_evaluations
+    FOR EACH STATEMENT EXECUTE PROCEDURE ai_evaluations_deleted();
+-- Correct any row written or deleted outside the scripts since migration 4
+UPDATE ai_code_generation_logs l
+SET graded = EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id)
+WHERE l.graded <> EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id);
+INSERT INTO schema_migrations (version, description)
+VALUES (5, 'keep the graded flag in step with the evaluations') ON CONFLICT DO NOTHING;
@@ -1,154 +1,405 @@
+import csv
+import hashlib
+import json
 import os
-from typing import Dict, Any, List, Tuple
-import psycopg2
-from psycopg2 import sql
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import click
+from psycopg2.extras import execute_values
 from tabulate import tabulate
 
-# Database connection parameters
-db_params: Dict[str, Any] = {
-    "dbname": os.getenv("PGDATABASE"),
-    "user": os.getenv("PGUSER"),
-    "password": os.getenv("PGPASSWORD"),
-    "host": os.getenv("PGHOST"),
-    "port": os.getenv("PGPORT")
-}
+from ai_code_generation_storage import connection, ensure_schema, execute
 
-def setup_grading_table() -> None:
-    """Set up the database table for storing grading information."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS ai_response_evaluations (
-        id SERIAL PRIMARY KEY,
-        response_id INTEGER REFERENCES ai_code_generation_logs(id),
-        model_grade FLOAT,
-        human_grade FLOAT,
-        rubric TEXT,
-        feedback TEXT,
-        graded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
+# The local grading engine lives with the rest of the Scheme tooling
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Scheme'))
+from scheme_grader import GRADER_VERSION, grade_source, normalise_source
 
-    conn.commit()
-    cur.close()
-    conn.close()
+# The grading provider that runs offline
+LOCAL_PROVIDER = 'local'
 
-def grade_response(response_id: int, rubric: str, provider_id: str) -> float:
-    """Grade a response using the specified model and rubric."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-    cur.execute("SELECT generated_code FROM ai_code_generation_logs WHERE id = %s", (response_id,))
-    response = cur.fetchone()[0]
-    cur.close()
-    conn.close()
+# The language each grading provider grades, or None for any, so that bulk
+# grading only fetches the responses a provider can grade
+PROVIDER_LANGUAGES: Dict[str, Optional[str]] = {LOCAL_PROVIDER: 'scheme'}
 
-    # Placeholder for actual model grading
-    model_grade = placeholder_model_grading(response, rubric, provider_id)
+# Providers whose grades do not depend on the rubric. Their cached grades
+# are shared by every rubric, and --regrade does not regrade a response
+# just because it was graded under another rubric.
+RUBRIC_FREE_PROVIDERS = {LOCAL_PROVIDER}
 
-    return model_grade
-
-def save_evaluation(response_id: int, model_grade: float, rubric: str) -> None:
+def setup_grading_table() -> None:
+    """Set up the database table for storing grading information."""
+    ensure_schema()
+
+def grade_response(response_id: int, rubric: str, provider_id: str) -> Dict[str, Any]:
+    """
+    Grade a response using the specified model and rubric, returning the grader's report.
+
+    A report cached for the same normalised code, grader version and, if
+    the provider reads it, rubric is returned without grading; a new
+    report is added to the cache unless grading was interrupted.
+    """
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_generated_code", (response_id,))
+        response, language = cur.fetchone()
+
+    key = code_hash(response, language)
+    report = cached_reports([key], rubric, provider_id).get(key)
+    if report is None:
+        report = model_grading(response, language, rubric, provider_id)
+        if _cacheable(report):
+            with connection() as conn, conn.cursor() as cur:
+                _insert_cache_entries(cur, [(key, rubric, provider_id, report)])
+    return report
+
+def model_grading(response: str, language: str, rubric: str, provider_id: str) -> Dict[str, Any]:
+    """
+    Grade generated code with a grading provider.
+
+    The local provider scores Scheme answers to prompt.md.tmpl on purity,
+    correctness and structure (see Scheme/scheme_grader.py). Its criteria
+    are fixed; the rubric is only recorded with the evaluation.
+
+    Returns:
+        Dict[str, Any]: The report of the grader, with the overall `grade`
+        from 0 to 1, the per-criterion `scores` and the `version` of the
+        grader.
+
+    Raises:
+        ValueError: If the provider is unknown or cannot grade the language.
+        RuntimeError: If the grader itself failed, rather than the code.
+    """
+    graded = provider_language(provider_id)
+    if graded is not None and language.lower() != graded:
+        raise ValueError(f"The {provider_id} grader only grades {graded}, not {language}")
+    return grade_source(response)
+
+def provider_language(provider_id: str) -> Optional[str]:
+    """
+    Return the language, in lower case, that a grading provider grades, or None for any.
+
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    if provider_id not in PROVIDER_LANGUAGES:
+        raise ValueError(f"Unknown grading provider {provider_id!r}; available: {', '.join(PROVIDER_LANGUAGES)}")
+    return PROVIDER_LANGUAGES[provider_id]
+
+def code_hash(response: str, language: str) -> str:
+    """Hash a response by its language and normalised code, so copies that differ only in layout collide."""
+    return hashlib.sha256(f"{language.lower()}\n{normalise_source(response)}".encode('utf-8')).hexdigest()
+
+def _rubric_hash(rubric: str) -> str:
+    return hashlib.sha256(rubric.encode('utf-8')).hexdigest()
+
+def _cache_rubric(rubric: str, provider_id: str) -> str:
+    # The rubric as far as a provider's grades depend on it
+    return '' if provider_id in RUBRIC_FREE_PROVIDERS else rubric
+
+def _cacheable(report: Dict[str, Any]) -> bool:
+    # A report cut short by a crash or timeout depends on the machine's
+    # load as much as on the code, so it is saved but not reused.
+    return not report.get('interrupted')
+
+def _details(report: Dict[str, Any]) -> str:
+    return json.dumps({key: value for key, value in report.items() if key not in ('grade', 'version')})
+
+def cached_reports(hashes: Iterable[str], rubric: str, provider_id: str) -> Dict[str, Dict[str, Any]]:
+    """Look up the cached reports of code hashes for a rubric and the current grader version."""
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_cached_grades", (_rubric_hash(_cache_rubric(rubric, provider_id)), provider_id,
+                                              GRADER_VERSION, sorted(set(hashes))))
+        return {key: {'grade': grade, **(details or {}), 'version': GRADER_VERSION}
+                for key, grade, details in cur.fetchall()}
+
+def _insert_cache_entries(cur, entries: List[Tuple[str, str, str, Dict[str, Any]]]) -> None:
+    execute_values(cur, """
+    INSERT INTO ai_grading_cache
+    (rubric_hash, grader, grader_version, code_hash, rubric, model_grade, model_scores)
+    VALUES %s
+    ON CONFLICT DO NOTHING
+    """, [(_rubric_hash(_cache_rubric(rubric, provider_id)), provider_id, report['version'], key,
+           _cache_rubric(rubric, provider_id), report['grade'], _details(report))
+          for key, rubric, provider_id, report in entries],
+                   template="(%s, %s, %s, %s, %s, %s, %s::jsonb)", page_size=1000)
+
+def clear_grading_cache(rubric: Optional[str] = None, everything: bool = False) -> int:
+    """
+    Delete cached grades so that the responses they cover are graded again.
+
+    By default only grades of older grader versions are deleted, which are
+    never read again. Given a rubric, every grade for that rubric is
+    deleted, which leaves those of RUBRIC_FREE_PROVIDERS; with
+    `everything`, every grade is.
+
+    Returns:
+        int: The number of cached grades deleted.
+    """
+    with connection() as conn, conn.cursor() as cur:
+        if everything:
+            cur.execute("DELETE FROM ai_grading_cache")
+        elif rubric is not None:
+            cur.execute("DELETE FROM ai_grading_cache WHERE rubric_hash = %s", (_rubric_hash(rubric),))
+        else:
+            cur.execute("DELETE FROM ai_grading_cache WHERE grader = %s AND grader_version <> %s",
+                        (LOCAL_PROVIDER, GRADER_VERSION))
+        return cur.rowcount
+
+def _evaluation_row(response_id: int, report: Dict[str, Any], rubric: str) -> Tuple:
+    return (response_id, report['grade'], rubric, _details(report), report['version'])
+
+def save_evaluation(response_id: int, report: Dict[str, Any], rubric: str) -> None:
     """Save the evaluation to the database."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    cur.execute("""
-    INSERT INTO ai_response_evaluations (response_id, model_grade, rubric)
-    VALUES (%s, %s, %s)
-    """, (response_id, model_grade, rubric))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "insert_evaluation", _evaluation_row(response_id, report, rubric))
+
+def save_evaluations(evaluations: List[Tuple[int, Dict[str, Any], str]],
+                     cache_entries: List[Tuple[str, str, str, Dict[str, Any]]] = ()) -> None:
+    """
+    Save (response_id, report, rubric) evaluations in one multi-row INSERT,
+    and cache (code_hash, rubric, provider_id, report) entries, in one transaction.
+    """
+    with connection() as conn, conn.cursor() as cur:
+        if cache_entries:
+            _insert_cache_entries(cur, cache_entries)
+        if not evaluations:
+            return
+        execute_values(cur, """
+        INSERT INTO ai_response_evaluations (response_id, model_grade, rubric, model_scores, grader_version)
+        VALUES %s
+        """, [_evaluation_row(*evaluation) for evaluation in evaluations],
+                       template="(%s, %s, %s, %s::jsonb, %s)", page_size=1000)
+
+def fetch_ungraded(after_id: int, limit: int, language: Optional[str] = None) -> List[Tuple[int, str, str]]:
+    """
+    Fetch (ID, code, language) of up to `limit` ungraded responses with IDs above `after_id`, in ID order.
+
+    Given a language, in lower case, only responses in that language are fetched.
+    """
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_ungraded_chunk", (after_id, limit, language))
+        return cur.fetchall()
+
+def fetch_stale(after_id: int, limit: int, rubric: Optional[str],
+                language: Optional[str] = None) -> List[Tuple[int, str, str]]:
+    """
+    Like fetch_ungraded, but for responses with no evaluation by the current grader version.
+
+    Given a rubric, an evaluation only counts if it was under that rubric.
+    """
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_stale_chunk", (after_id, rubric, GRADER_VERSION, limit, language))
+        return cur.fetchall()
+
+def grade_cached(rows: List[Tuple[str, str]], rubric: str, provider_id: str,
+                 map_fn: Callable = map) -> Tuple[List[Optional[Dict[str, Any]]], List[Tuple], int]:
+    """
+    Grade (code, language) rows, reusing cached reports and grading each distinct code once.
+
+    Returns:
+        Tuple: The report of each row, None where grading failed; the cache
+        entries for the reports that were computed and not interrupted; and
+        the number of rows whose report came from the cache.
+    """
+    hashes = [code_hash(code, language) for code, language in rows]
+    reports = cached_reports(hashes, rubric, provider_id)
+    hits = sum(key in reports for key in hashes)
+    misses: Dict[str, Tuple[str, str]] = {}
+    for key, row in zip(hashes, rows):
+        if key not in reports:
+            misses.setdefault(key, row)
+    entries = []
+    computed = map_fn(lambda row: _grade_or_none(row[0], row[1], rubric, provider_id), misses.values())
+    for key, report in zip(misses, computed):
+        if report is not None:
+            reports[key] = report
+            if _cacheable(report):
+                entries.append((key, rubric, provider_id, report))
+    return [reports.get(key) for key in hashes], entries, hits
+
+def grade_all_responses(rubric: str, provider_id: str, concurrency: int, chunk_size: int,
+                        after_id: int = 0, limit: Optional[int] = None,
+                        regrade: bool = False) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Grade ungraded responses chunk by chunk, saving each chunk as one transaction.
+
+    Responses whose normalised code was already graded by the same grader
+    version, under the same rubric if the provider reads it, take the
+    cached report; the rest are graded
+    by up to `concurrency` threads, each distinct code once. Since saved
+    responses are no longer ungraded, a run that is interrupted picks up
+    after the last saved chunk when started again. A response whose
+    grading fails is left ungraded and is not retried in the same run.
+    Responses in a language the provider does not grade are skipped.
+
+    With `regrade`, responses that were only graded by another grader
+    version, or under another rubric if the provider reads it, are graded
+    too, so a changed rubric or grader touches only the responses it
+    affects.
+
+    Yields:
+        Tuple[int, int, int, int]: Responses graded so far, how many of
+        them from the cache, responses that failed so far, and the last
+        response ID attempted, after each chunk.
+
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    language = provider_language(provider_id)
+    graded = cached = failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while limit is None or graded < limit:
+            size = chunk_size if limit is None else min(chunk_size, limit - graded)
+            if regrade:
+                stale_rubric = None if provider_id in RUBRIC_FREE_PROVIDERS else rubric
+                chunk = fetch_stale(after_id, size, stale_rubric, language)
+            else:
+                chunk = fetch_ungraded(after_id, size, language)
+            if not chunk:
+                break
+            reports, entries, hits = grade_cached([row[1:] for row in chunk], rubric, provider_id, pool.map)
+            evaluations = [(row[0], report, rubric) for row, report in zip(chunk, reports) if report is not None]
+            save_evaluations(evaluations, entries)
+            graded += len(evaluations)
+            cached += hits
+            failed += len(chunk) - len(evaluations)
+            after_id = chunk[-1][0]
+            yield graded, cached, failed, after_id
+
+def _grade_or_none(response: str, language: str, rubric: str, provider_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        return model_grading(response, language, rubric, provider_id)
+    except Exception as e:
+        click.echo(f"Grading failed: {e}", err=True)
+        return None
 
 def update_human_grade(evaluation_id: int, human_grade: float, feedback: str) -> None:
     """Update the evaluation with a human-provided grade and feedback."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    cur.execute("""
-    UPDATE ai_response_evaluations
-    SET human_grade = %s, feedback = %s
-    WHERE id = %s
-    """, (human_grade, feedback, evaluation_id))
-
-    conn.commit()
-    cur.close()
-    conn.close()
-
-def list_evaluations() -> List[Tuple]:
-    """List all evaluations."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    cur.execute("""
-    SELECT e.id, e.response_id, e.model_grade, e.human_grade, 
-           LEFT(l.generated_code, 50) as snippet
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "update_human_grade", (human_grade, feedback, evaluation_id))
+
+# Larger than any SERIAL id, so the first page of a listing starts at the newest row
+_MAX_ID = 2**31 - 1
+
+# Rows fetched per round trip while streaming an export
+EXPORT_ITERSIZE = 2000
+
+def list_evaluations(after_id: Optional[int] = None, limit: int = 50) -> List[Tuple]:
+    """
+    List one page of evaluations, newest first.
+
+    Args:
+        after_id (Optional[int]): The last evaluation ID of the previous page,
+            or None for the first page.
+        limit (int): The most evaluations to return.
+    """
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_evaluations_page", (_MAX_ID if after_id is None else after_id, limit))
+        return cur.fetchall()
+
+def iter_evaluations() -> Iterator[Tuple]:
+    """Stream every evaluation, newest first, through a server-side cursor."""
+    return _stream("""
+    SELECT e.id, e.response_id, e.model_grade, e.human_grade, e.rubric, e.feedback,
+           e.graded_at, e.model_scores::text, e.grader_version, l.generated_code
     FROM ai_response_evaluations e
     JOIN ai_code_generation_logs l ON e.response_id = l.id
     ORDER BY e.id DESC
     """)
 
-    evaluations = cur.fetchall()
-    cur.close()
-    conn.close()
-
-    return evaluations
-
 def view_evaluation(evaluation_id: int) -> Tuple:
     """View details of a specific evaluation."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    cur.execute("""
-    SELECT e.id, e.response_id, e.model_grade, e.human_grade, 
-           e.rubric, e.feedback, l.generated_code
-    FROM ai_response_evaluations e
-    JOIN ai_code_generation_logs l ON e.response_id = l.id
-    WHERE e.id = %s
-    """, (evaluation_id,))
-
-    evaluation = cur.fetchone()
-    cur.close()
-    conn.close()
-
-    return evaluation
-
-def list_ungraded_responses() -> List[Tuple]:
-    """List responses that haven't been graded yet."""
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    cur.execute("""
-    SELECT l.id, LEFT(l.generated_code, 50) as snippet
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_evaluation", (evaluation_id,))
+        return cur.fetchone()
+
+def list_ungraded_responses(after_id: Optional[int] = None, limit: int = 50) -> List[Tuple]:
+    """List one page of responses that haven't been graded yet, newest first."""
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "select_ungraded_page", (_MAX_ID if after_id is None else after_id, limit))
+        return cur.fetchall()
+
+def iter_ungraded_responses() -> Iterator[Tuple]:
+    """Stream every response that hasn't been graded yet, newest first, through a server-side cursor."""
+    return _stream("""
+    SELECT l.id, l.provider, l.model, l.language, l.created_at, l.generated_code
     FROM ai_code_generation_logs l
-    LEFT JOIN ai_response_evaluations e ON l.id = e.response_id
-    WHERE e.id IS NULL
+    WHERE NOT l.graded
     ORDER BY l.id DESC
     """)
 
-    ungraded = cur.fetchall()
-    cur.close()
-    conn.close()
-
-    return ungraded
+def _stream(query: str) -> Iterator[Tuple]:
+    # A named cursor keeps the result on the server and fetches
+    # EXPORT_ITERSIZE rows at a time, so memory stays flat however many
+    # rows there are.
+    with connection() as conn, conn.cursor(name="grader_export") as cur:
+        cur.itersize = EXPORT_ITERSIZE
+        cur.execute(query)
+        yield from cur
+
+def _write_csv(headers: List[str], rows: Iterable[Tuple]) -> None:
+    writer = csv.writer(sys.stdout)
+    writer.writerow(headers)
+    writer.writerows(rows)
+
+def _echo_page(rows: List[Tuple], headers: List[str], limit: int) -> None:
+    click.echo(tabulate(rows, headers=headers))
+    if len(rows) == limit:
+        click.echo(f"Next page: --after-id {rows[-1][0]}", err=True)
 
 @click.group()
 def cli():
-    pass
+    """Grade AI-generated code and review the grades."""
+    setup_grading_table()
 
 @cli.command()
 @click.option('--response-id', type=int, required=True, help='ID of the response to grade')
 @click.option('--rubric', type=str, required=True, help='Rubric for grading')
-@click.option('--provider-id', type=str, required=True, help='ID of the provider to use for grading')
+@click.option('--provider-id', type=str, default=LOCAL_PROVIDER, show_default=True,
+              help='ID of the provider to use for grading')
 def grade(response_id: int, rubric: str, provider_id: str):
     """Grade a response using the specified model and rubric."""
-    setup_grading_table()
-    model_grade = grade_response(response_id, rubric, provider_id)
-    save_evaluation(response_id, model_grade, rubric)
-    click.echo(f"Response {response_id} graded. Model grade: {model_grade}")
+    try:
+        report = grade_response(response_id, rubric, provider_id)
+    except (ValueError, RuntimeError) as e:
+        raise click.ClickException(str(e))
+    save_evaluation(response_id, report, rubric)
+    click.echo(f"Response {response_id} graded. Model grade: {report['grade']}")
+    click.echo(_format_scores(report['scores']))
+
+@cli.command()
+@click.option('--rubric', type=str, required=True, help='Rubric for grading')
+@click.option('--provider-id', type=str, default=LOCAL_PROVIDER, show_default=True,
+              help='ID of the provider to use for grading')
+@click.option('--concurrency', type=int, default=os.cpu_count() or 1, show_default=True,
+              help='Number of responses graded at once')
+@click.option('--chunk-size', type=int, default=500, show_default=True,
+              help='Responses fetched, graded and saved per transaction')
+@click.option('--after-id', type=int, default=0, help='Only grade responses with a larger ID')
+@click.option('--limit', type=int, default=None, help='Stop after grading this many responses')
+@click.option('--regrade', is_flag=True,
+              help='Also grade responses graded only by another grader version, or under another '
+                   'rubric if the provider reads it')
+def grade_all(rubric: str, provider_id: str, concurrency: int, chunk_size: int, after_id: int,
+              limit: Optional[int], regrade: bool):
+    """Grade every ungraded response. Rerun after an interruption to resume."""
+    graded = cached = failed = 0
+    try:
+        progress = grade_all_responses(rubric, provider_id, max(concurrency, 1), max(chunk_size, 1),
+                                       after_id, limit, regrade)
+        for graded, cached, failed, last_id in progress:
+            click.echo(f"Graded {graded} responses ({cached} cached, {failed} failed), up to response {last_id}",
+                       err=True)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Graded {graded} responses, {cached} from the cache; {failed} failed and remain ungraded.")
+
+@cli.command()
+@click.option('--rubric', type=str, default=None, help='Delete every cached grade for this rubric')
+@click.option('--all', 'everything', is_flag=True, help='Delete every cached grade')
+def invalidate_cache(rubric: Optional[str], everything: bool):
+    """Delete cached grades, by default those of older grader versions."""
+    click.echo(f"Deleted {clear_grading_cache(rubric, everything)} cached grades.")
 
 @cli.command()
 @click.option('--evaluation-id', type=int, required=True, help='ID of the evaluation to update')
@@ -160,11 +411,19 @@ def update_grade(evaluation_id: int, human_grade: float, feedback: str):
     click.echo(f"Evaluation {evaluation_id} updated with human grade and feedback.")
 
 @cli.command()
-def list():
-    """List all evaluations."""
-    evaluations = list_evaluations()
+@click.option('--after-id', type=int, default=None, help='Start after this evaluation ID, from a previous page')
+@click.option('--limit', type=click.IntRange(min=1), default=50, show_default=True,
+              help='Number of evaluations per page')
+@click.option('--all', 'export', is_flag=True, help='Stream every evaluation, in full, as CSV')
+def list(after_id: Optional[int], limit: int, export: bool):
+    """List evaluations, newest first."""
+    if export:
+        _write_csv(["ID", "Response ID", "Model Grade", "Human Grade", "Rubric", "Feedback",
+                    "Graded At", "Model Scores", "Grader Version", "Generated Code"], iter_evaluations())
+        return
+    evaluations = list_evaluations(after_id, limit)
     headers = ["ID", "Response ID", "Model Grade", "Human Grade", "Code Snippet"]
-    click.echo(tabulate(evaluations, headers=headers))
+    _echo_page(evaluations, headers, limit)
 
 @cli.command()
 @click.option('--evaluation-id', type=int, required=True, help='ID of the evaluation to view')
@@ -177,6 +436,10 @@ def view(evaluation_id: int):
         click.echo(f"Model Grade: {evaluation[2]}")
         click.echo(f"Human Grade: {evaluation[3]}")
         click.echo(f"Rubric: {evaluation[4]}")
+        if evaluation[7]:
+            click.echo(f"Model Scores: {_format_scores(evaluation[7]['scores'])} (grader version {evaluation[8]})")
+            for vector, reason in evaluation[7]['failed'].items():
+                click.echo(f"  Failed {vector}: {reason}")
         click.echo(f"Feedback: {evaluation[5]}")
         click.echo("Generated Code:")
         click.echo(evaluation[6])
@@ -184,16 +447,22 @@ def view(evaluation_id: int):
         click.echo(f"No evaluation found with ID {evaluation_id}")
 
 @cli.command()
-def list_ungraded():
-    """List responses that haven't been graded yet."""
-    ungraded = list_ungraded_responses()
+@click.option('--after-id', type=int, default=None, help='Start after this response ID, from a previous page')
+@click.option('--limit', type=click.IntRange(min=1), default=50, show_default=True,
+              help='Number of responses per page')
+@click.option('--all', 'export', is_flag=True, help='Stream every ungraded response, in full, as CSV')
+def list_ungraded(after_id: Optional[int], limit: int, export: bool):
+    """List responses that haven't been graded yet, newest first."""
+    if export:
+        _write_csv(["Response ID", "Provider", "Model", "Language", "Created At", "Generated Code"],
+                   iter_ungraded_responses())
+        return
+    ungraded = list_ungraded_responses(after_id, limit)
     headers = ["Response ID", "Code Snippet"]
-    click.echo(tabulate(ungraded, headers=headers))
+    _echo_page(ungraded, headers, limit)
 
-def placeholder_model_grading(response: str, rubric: str, provider_id: str) -> float:
-    """Placeholder function for model grading."""
-    import random
-    return random.random()
+def _format_scores(scores: Dict[str, float]) -> str:
+    return ", ".join(f"{criterion} {score:.2f}" for criterion, score in scores.items())
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -1,23 +1,13 @@
 import os
-from typing import Optional, Dict, Any
 import openai
-import psycopg2
-from psycopg2 import sql
 import click
 from jinja2 import Template
 
+from ai_code_generation_storage import connection, ensure_schema, execute
+
 # Set up OpenAI API key
 openai.api_key = os.getenv("OPENAI_API_KEY")
 
-# Database connection parameters
-db_params: Dict[str, Any] = {
-    "dbname": os.getenv("PGDATABASE"),
-    "user": os.getenv("PGUSER"),
-    "password": os.getenv("PGPASSWORD"),
-    "host": os.getenv("PGHOST"),
-    "port": os.getenv("PGPORT")
-}
-
 
 def get_code_from_openai(system_prompt: str,
                          user_prompt: str,
@@ -46,28 +36,9 @@ def get_code_from_openai(system_prompt: str,
 
 def setup_database() -> None:
     """
-    Set up the database by creating necessary tables if they don't exist.
+    Set up the database by applying any schema migrations not yet applied.
     """
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    # Create ai_code_generation_logs table if it doesn't exist
-    cur.execute("""
-    CREATE TABLE IF NOT EXISTS ai_code_generation_logs (
-        id SERIAL PRIMARY KEY,
-        provider VARCHAR(50) NOT NULL,
-        model VARCHAR(50) NOT NULL,
-        system_prompt TEXT NOT NULL,
-        user_prompt TEXT NOT NULL,
-        generated_code TEXT NOT NULL,
-        language VARCHAR(50) NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """)
-
-    conn.commit()
-    cur.close()
-    conn.close()
+    ensure_schema()
 
 
 def save_to_database(provider: str, model: str, system_prompt: str,
@@ -84,20 +55,9 @@ def save_to_database(provider: str, model: str, system_prompt: str,
         generated_code (str): The generated code.
         language (str): The programming language of the generated code.
     """
-    conn = psycopg2.connect(**db_params)
-    cur = conn.cursor()
-
-    insert_query = sql.SQL("""
-    INSERT INTO ai_code_generation_logs 
-    (provider, model, system_prompt, user_prompt, generated_code, language)
-    VALUES (%s, %s, %s, %s, %s, %s)
-    """)
-    cur.execute(insert_query, (provider, model, system_prompt, user_prompt,
-                               generated_code, language))
-
-    conn.commit()
-    cur.close()
-    conn.close()
+    with connection() as conn, conn.cursor() as cur:
+        execute(cur, "insert_log", (provider, model, system_prompt, user_prompt,
+                                    generated_code, language))
 
 
 def read_template(template_file: str) -> str:
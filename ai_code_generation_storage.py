@@ -0,0 +1,358 @@
+import atexit
+import os
+import re
+import textwrap
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import psycopg2
+import psycopg2.errors
+import psycopg2.extensions
+from psycopg2.pool import ThreadedConnectionPool
+
+# Database connection parameters
+db_params: Dict[str, Any] = {
+    "dbname": os.getenv("PGDATABASE"),
+    "user": os.getenv("PGUSER"),
+    "password": os.getenv("PGPASSWORD"),
+    "host": os.getenv("PGHOST"),
+    "port": os.getenv("PGPORT")
+}
+
+# Bounds of the connection pool shared by every caller in a process
+POOL_MIN = int(os.getenv("PGPOOL_MIN", "1"))
+POOL_MAX = int(os.getenv("PGPOOL_MAX", "8"))
+
+# Key of the advisory lock held while migrations run, so concurrent first
+# runs do not apply the same migration twice
+MIGRATION_LOCK = 0x6c63_6d69
+
+# Schema changes, applied in order and recorded in schema_migrations. Never
+# edit an applied migration; append a new one.
+MIGRATIONS: List[Tuple[int, str, str]] = [
+    (1, "code generation logs and evaluations", """
+    CREATE TABLE IF NOT EXISTS ai_code_generation_logs (
+        id SERIAL PRIMARY KEY,
+        provider VARCHAR(50) NOT NULL,
+        model VARCHAR(50) NOT NULL,
+        system_prompt TEXT NOT NULL,
+        user_prompt TEXT NOT NULL,
+        generated_code TEXT NOT NULL,
+        language VARCHAR(50) NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS ai_response_evaluations (
+        id SERIAL PRIMARY KEY,
+        response_id INTEGER REFERENCES ai_code_generation_logs(id),
+        model_grade FLOAT,
+        human_grade FLOAT,
+        rubric TEXT,
+        feedback TEXT,
+        graded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_response_id ON ai_response_evaluations(response_id);
+    CREATE INDEX IF NOT EXISTS idx_graded_at ON ai_response_evaluations(graded_at);
+    """),
+    (2, "per-criterion model scores", """
+    ALTER TABLE ai_response_evaluations ADD COLUMN IF NOT EXISTS model_scores JSONB;
+    ALTER TABLE ai_response_evaluations ADD COLUMN IF NOT EXISTS grader_version INTEGER;
+    """),
+    (3, "content-addressed grading cache", """
+    CREATE TABLE IF NOT EXISTS ai_grading_cache (
+        rubric_hash CHAR(64) NOT NULL,
+        grader VARCHAR(50) NOT NULL,
+        grader_version INTEGER NOT NULL,
+        code_hash CHAR(64) NOT NULL,
+        rubric TEXT NOT NULL,
+        model_grade FLOAT NOT NULL,
+        model_scores JSONB,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (rubric_hash, grader, grader_version, code_hash)
+    );
+    """),
+    (4, "graded flag and indexes for the grading queue", """
+    -- Set when a response gets its first evaluation, so the ungraded
+    -- listings walk a partial index of the ungraded rows only, instead of
+    -- probing the evaluations of every graded row they pass.
+    ALTER TABLE ai_code_generation_logs ADD COLUMN IF NOT EXISTS graded BOOLEAN NOT NULL DEFAULT FALSE;
+    UPDATE ai_code_generation_logs l SET graded = TRUE
+    WHERE NOT l.graded AND EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id);
+    CREATE INDEX IF NOT EXISTS idx_logs_ungraded ON ai_code_generation_logs(id) WHERE NOT graded;
+    -- For the stale check of grade-all --regrade, per response and grader version
+    CREATE INDEX IF NOT EXISTS idx_response_grader_version
+        ON ai_response_evaluations(response_id, grader_version);
+    """),
+    (5, "keep the graded flag in step with the evaluations", """
+    -- Statement triggers over transition tables, so a multi-row INSERT of a
+    -- grade-all chunk updates its responses in one pass. PostgreSQL allows
+    -- transition tables only on single-event triggers, hence one per event.
+    CREATE OR REPLACE FUNCTION ai_evaluations_inserted() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE ai_code_generation_logs l SET graded = TRUE
+        FROM (SELECT DISTINCT response_id FROM inserted_evaluations) n
+        WHERE l.id = n.response_id AND NOT l.graded;
+        RETURN NULL;
+    END
+    $$;
+    CREATE OR REPLACE FUNCTION ai_evaluations_deleted() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE ai_code_generation_logs l SET graded = FALSE
+        FROM (SELECT DISTINCT response_id FROM deleted_evaluations) o
+        WHERE l.id = o.response_id AND l.graded
+          AND NOT EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id);
+        RETURN NULL;
+    END
+    $$;
+    DROP TRIGGER IF EXISTS ai_evaluations_mark_graded ON ai_response_evaluations;
+    CREATE TRIGGER ai_evaluations_mark_graded AFTER INSERT ON ai_response_evaluations
+        REFERENCING NEW TABLE AS inserted_evaluations
+        FOR EACH STATEMENT EXECUTE PROCEDURE ai_evaluations_inserted();
+    DROP TRIGGER IF EXISTS ai_evaluations_unmark_graded ON ai_response_evaluations;
+    CREATE TRIGGER ai_evaluations_unmark_graded AFTER DELETE ON ai_response_evaluations
+        REFERENCING OLD TABLE AS deleted_evaluations
+        FOR EACH STATEMENT EXECUTE PROCEDURE ai_evaluations_deleted();
+    -- Correct any row written or deleted outside the scripts since migration 4
+    UPDATE ai_code_generation_logs l
+    SET graded = EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id)
+    WHERE l.graded <> EXISTS (SELECT 1 FROM ai_response_evaluations e WHERE e.response_id = l.id);
+    """),
+]
+
+# Record of the applied migrations, created before any of them runs
+MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+# Hot queries, prepared once per connection and then run with EXECUTE
+STATEMENTS: Dict[str, str] = {
+    "select_generated_code": """
+    SELECT generated_code, language FROM ai_code_generation_logs WHERE id = $1
+    """,
+    "insert_evaluation": """
+    INSERT INTO ai_response_evaluations (response_id, model_grade, rubric, model_scores, grader_version)
+    VALUES ($1, $2, $3, $4, $5)
+    """,
+    "update_human_grade": """
+    UPDATE ai_response_evaluations
+    SET human_grade = $1, feedback = $2
+    WHERE id = $3
+    """,
+    "select_evaluation": """
+    SELECT e.id, e.response_id, e.model_grade, e.human_grade,
+           e.rubric, e.feedback, l.generated_code, e.model_scores, e.grader_version
+    FROM ai_response_evaluations e
+    JOIN ai_code_generation_logs l ON e.response_id = l.id
+    WHERE e.id = $1
+    """,
+    "select_evaluations_page": """
+    SELECT e.id, e.response_id, e.model_grade, e.human_grade,
+           LEFT(l.generated_code, 50) as snippet
+    FROM ai_response_evaluations e
+    JOIN ai_code_generation_logs l ON e.response_id = l.id
+    WHERE e.id < $1
+    ORDER BY e.id DESC
+    LIMIT $2
+    """,
+    "select_ungraded_page": """
+    SELECT l.id, LEFT(l.generated_code, 50) as snippet
+    FROM ai_code_generation_logs l
+    WHERE NOT l.graded AND l.id < $1
+    ORDER BY l.id DESC
+    LIMIT $2
+    """,
+    "select_ungraded_chunk": """
+    SELECT l.id, l.generated_code, l.language
+    FROM ai_code_generation_logs l
+    WHERE NOT l.graded AND l.id > $1
+      AND ($3::text IS NULL OR lower(l.language) = $3)
+    ORDER BY l.id
+    LIMIT $2
+    """,
+    "select_stale_chunk": """
+    SELECT l.id, l.generated_code, l.language
+    FROM ai_code_generation_logs l
+    WHERE l.id > $1
+      AND NOT EXISTS (SELECT 1 FROM ai_response_evaluations e
+                      WHERE e.response_id = l.id AND e.grader_version = $3
+                        AND ($2::text IS NULL OR e.rubric = $2))
+      AND ($5::text IS NULL OR lower(l.language) = $5)
+    ORDER BY l.id
+    LIMIT $4
+    """,
+    "select_cached_grades": """
+    SELECT code_hash, model_grade, model_scores
+    FROM ai_grading_cache
+    WHERE rubric_hash = $1 AND grader = $2 AND grader_version = $3 AND code_hash = ANY($4)
+    """,
+    "insert_log": """
+    INSERT INTO ai_code_generation_logs
+    (provider, model, system_prompt, user_prompt, generated_code, language)
+    VALUES ($1, $2, $3, $4, $5, $6)
+    """,
+}
+
+_ARITY: Dict[str, int] = {
+    name: max((int(n) for n in re.findall(r'\$(\d+)', query)), default=0)
+    for name, query in STATEMENTS.items()
+}
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """A connection that remembers which of STATEMENTS it has prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+_schema_version: Optional[int] = None
+
+
+def get_pool() -> ThreadedConnectionPool:
+    """
+    Return the process-wide connection pool, creating it on first use.
+
+    Returns:
+        ThreadedConnectionPool: A pool of between POOL_MIN and POOL_MAX
+        connections, safe to share between threads.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(POOL_MIN, POOL_MAX, connection_factory=PreparingConnection,
+                                               **db_params)
+    return _pool
+
+
+@atexit.register
+def close_pool() -> None:
+    """Close every pooled connection. The next get_pool() opens a new pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+@contextmanager
+def connection() -> Iterator[PreparingConnection]:
+    """
+    Borrow a pooled connection for one transaction.
+
+    The transaction is committed when the block exits normally and rolled
+    back if it raises. The connection goes back to the pool either way,
+    unless it was lost, in which case it is discarded.
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        if not conn.closed:
+            try:
+                conn.rollback()
+                # Whether or not a failed transaction kept its PREPAREs,
+                # start this connection over with none.
+                with conn.cursor() as cur:
+                    cur.execute("DEALLOCATE ALL")
+                conn.commit()
+                conn.prepared.clear()
+            except psycopg2.Error:
+                conn.close()
+        raise
+    finally:
+        pool.putconn(conn, close=bool(conn.closed))
+
+
+def execute(cur, name: str, params: Sequence = ()) -> None:
+    """
+    Run one of STATEMENTS on a cursor of a pooled connection.
+
+    The statement is prepared on the cursor's connection the first time it
+    is used there, so later calls skip parsing and planning.
+
+    Args:
+        cur: A cursor of a connection from connection().
+        name (str): The key of the statement in STATEMENTS.
+        params (Sequence): Values for $1, $2, ... in order.
+    """
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} AS {STATEMENTS[name]}")
+        conn.prepared.add(name)
+    arity = _ARITY[name]
+    if arity:
+        cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * arity)})", params)
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+
+def ensure_schema() -> int:
+    """
+    Bring the schema up to date with MIGRATIONS, once per process.
+
+    An up-to-date database costs one SELECT. Pending migrations are applied
+    in a single transaction under an advisory lock.
+
+    Returns:
+        int: The schema version now in place.
+    """
+    global _schema_version
+    if _schema_version is not None:
+        return _schema_version
+    latest = MIGRATIONS[-1][0]
+    try:
+        with connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+            current = cur.fetchone()[0]
+    except psycopg2.errors.UndefinedTable:
+        current = 0
+    if current < latest:
+        with connection() as conn, conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK,))
+            cur.execute(MIGRATIONS_TABLE)
+            cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_migrations")
+            current = cur.fetchone()[0]
+            for version, description, statements in MIGRATIONS:
+                if version > current:
+                    cur.execute(statements)
+                    cur.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                                (version, description))
+    _schema_version = latest
+    return _schema_version
+
+
+def schema_sql() -> str:
+    """
+    Return MIGRATIONS as one SQL script that also records them as applied.
+
+    This is what ai_code_generation_create.sql holds, for tools that create
+    the schema without these scripts. Regenerate it with `make schema`
+    after appending a migration.
+
+    Returns:
+        str: The script.
+    """
+    parts = ["-- Generated from MIGRATIONS in ai_code_generation_storage.py by `make schema`.\n"
+             "-- Do not edit; append a migration there and regenerate.\n",
+             MIGRATIONS_TABLE.strip() + "\n"]
+    for version, description, statements in MIGRATIONS:
+        description_literal = description.replace("'", "''")
+        parts.append(f"-- Migration {version}: {description}\n"
+                     f"{textwrap.dedent(statements).strip()}\n"
+                     f"INSERT INTO schema_migrations (version, description)\n"
+                     f"VALUES ({version}, '{description_literal}') ON CONFLICT DO NOTHING;\n")
+    return "\n".join(parts)
+
+
+if __name__ == "__main__":
+    print(schema_sql(), end="")
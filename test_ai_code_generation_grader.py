@@ -0,0 +1,159 @@
+import unittest
+from unittest import mock
+
+import ai_code_generation_grader as grader
+
+
+class FakeStore:
+    """The grading queue and cache that grade_all_responses reads and writes, kept in memory."""
+
+    def __init__(self, rows):
+        self.rows = dict(rows)
+        self.evaluations = []
+        self.cache = {}
+        self.fetches = []
+        self.saves = 0
+        self.calls = []
+
+    def graded(self, response_id, rubric=None):
+        return any(e[0] == response_id and e[1]['version'] == grader.GRADER_VERSION
+                   and (rubric is None or e[2] == rubric) for e in self.evaluations)
+
+    def _chunk(self, after_id, limit, language, skip):
+        ids = [i for i in sorted(self.rows) if i > after_id and not skip(i)
+               and (language is None or self.rows[i][1].lower() == language)]
+        return [(i, *self.rows[i]) for i in ids[:limit]]
+
+    def fetch_ungraded(self, after_id, limit, language=None):
+        self.fetches.append(('ungraded', after_id, limit))
+        return self._chunk(after_id, limit, language, lambda i: any(e[0] == i for e in self.evaluations))
+
+    def fetch_stale(self, after_id, limit, rubric, language=None):
+        self.fetches.append(('stale', after_id, limit))
+        return self._chunk(after_id, limit, language, lambda i: self.graded(i, rubric))
+
+    def cached_reports(self, hashes, rubric, provider_id):
+        rubric = grader._cache_rubric(rubric, provider_id)
+        return {key: self.cache[rubric, provider_id, grader.GRADER_VERSION, key] for key in hashes
+                if (rubric, provider_id, grader.GRADER_VERSION, key) in self.cache}
+
+    def save_evaluations(self, evaluations, cache_entries=()):
+        self.saves += 1
+        self.evaluations.extend(evaluations)
+        for key, rubric, provider_id, report in cache_entries:
+            self.cache[grader._cache_rubric(rubric, provider_id), provider_id, report['version'], key] = report
+
+    def model_grading(self, response, language, rubric, provider_id):
+        self.calls.append(response)
+        if 'crash' in response:
+            raise RuntimeError("grading subprocess exited with status 1")
+        return {'grade': len(response.strip()) / 100, 'scores': {}, 'interrupted': 'slow' in response,
+                'version': grader.GRADER_VERSION}
+
+
+class TestGradeAll(unittest.TestCase):
+
+    def setUp(self):
+        self.store = FakeStore({i: (f'(define f{i} {i})', 'Scheme') for i in range(1, 8)})
+        for name in ('fetch_ungraded', 'fetch_stale', 'cached_reports', 'save_evaluations', 'model_grading'):
+            patcher = mock.patch.object(grader, name, getattr(self.store, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # Failures are echoed to stderr; keep the test output clean.
+        patcher = mock.patch.object(grader.click, 'echo')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_all(self, rubric='rubric', chunk_size=3, **options):
+        return list(grader.grade_all_responses(rubric, grader.LOCAL_PROVIDER, 2, chunk_size, **options))
+
+    def graded_ids(self):
+        return sorted(e[0] for e in self.store.evaluations)
+
+    def test_chunks_are_saved_one_at_a_time(self):
+        self.assertEqual(self.run_all(), [(3, 0, 0, 3), (6, 0, 0, 6), (7, 0, 0, 7)])
+        self.assertEqual(self.store.saves, 3)
+        self.assertEqual(self.graded_ids(), list(range(1, 8)))
+
+    def test_interrupted_run_resumes(self):
+        progress = grader.grade_all_responses('rubric', grader.LOCAL_PROVIDER, 2, 3)
+        self.assertEqual(next(progress), (3, 0, 0, 3))
+        progress.close()
+        self.assertEqual(self.run_all(), [(3, 0, 0, 6), (4, 0, 0, 7)])
+        self.assertEqual(self.graded_ids(), list(range(1, 8)))
+        self.assertEqual(len(self.store.calls), 7)
+
+    def test_after_id(self):
+        self.assertEqual(self.run_all(after_id=4), [(3, 0, 0, 7)])
+        self.assertEqual(self.graded_ids(), [5, 6, 7])
+
+    def test_limit(self):
+        self.assertEqual(self.run_all(limit=4), [(3, 0, 0, 3), (4, 0, 0, 4)])
+        self.assertEqual(self.store.fetches, [('ungraded', 0, 3), ('ungraded', 3, 1)])
+        self.assertEqual(self.graded_ids(), [1, 2, 3, 4])
+
+    def test_failed_rows_are_not_retried_in_the_same_run(self):
+        self.store.rows[2] = ('(crash)', 'Scheme')
+        self.assertEqual(self.run_all()[-1], (6, 0, 1, 7))
+        self.assertEqual(self.store.calls.count('(crash)'), 1)
+        self.assertNotIn(2, self.graded_ids())
+        # The next run tries it again.
+        self.assertEqual(self.run_all(), [(0, 0, 1, 2)])
+        self.assertEqual(self.store.calls.count('(crash)'), 2)
+
+    def test_identical_code_is_graded_once(self):
+        self.store.rows = {1: ('(define f 1)', 'Scheme'), 2: ('  (define f 1)\r\n\r\n', 'scheme'),
+                           3: ('```scheme\n(define f 1)\n```', 'Scheme'), 4: ('(define g 2)', 'Scheme')}
+        self.assertEqual(self.run_all(chunk_size=10), [(4, 0, 0, 4)])
+        self.assertEqual(len(self.store.calls), 2)
+        self.assertEqual(len({e[1]['grade'] for e in self.store.evaluations if e[0] < 4}), 1)
+        # Copies in later chunks and runs come from the cache.
+        self.store.rows[5] = ('(define f 1)', 'Scheme')
+        self.assertEqual(self.run_all(), [(1, 1, 0, 5)])
+        self.assertEqual(len(self.store.calls), 2)
+
+    def test_interrupted_reports_are_saved_but_not_cached(self):
+        self.store.rows = {1: ('(slow)', 'Scheme'), 2: ('(define f 1)', 'Scheme')}
+        self.assertEqual(self.run_all(), [(2, 0, 0, 2)])
+        self.assertEqual(self.graded_ids(), [1, 2])
+        self.assertEqual(len(self.store.cache), 1)
+        self.store.rows.update({3: ('(slow)', 'Scheme'), 4: ('(define f 1)', 'Scheme')})
+        self.assertEqual(self.run_all(), [(2, 1, 0, 4)])
+        self.assertEqual(self.store.calls.count('(slow)'), 2)
+
+    def test_other_languages_are_not_fetched(self):
+        self.store.rows[3] = ('def f(): pass', 'Python')
+        self.assertEqual(self.run_all()[-1], (6, 0, 0, 7))
+        self.assertNotIn('def f(): pass', self.store.calls)
+        self.assertNotIn(3, self.graded_ids())
+
+    def test_unknown_provider(self):
+        with self.assertRaises(ValueError):
+            list(grader.grade_all_responses('rubric', 'nobody', 2, 3))
+        self.assertEqual(self.store.fetches, [])
+
+    def test_regrade_ignores_the_rubric_of_the_local_grader(self):
+        self.run_all(rubric='old')
+        self.assertEqual(self.run_all(rubric='new', regrade=True), [])
+        self.assertEqual(self.store.fetches[-1], ('stale', 0, 3))
+        self.assertEqual(len(self.store.calls), 7)
+
+    def test_regrade_under_a_new_rubric(self):
+        with mock.patch.dict(grader.PROVIDER_LANGUAGES, {'reviewer': 'scheme'}):
+            run = lambda rubric, **options: list(grader.grade_all_responses(rubric, 'reviewer', 2, 3, **options))
+            run('old')
+            self.assertEqual(run('new', regrade=True)[-1], (7, 0, 0, 7))
+            self.assertEqual(run('new', regrade=True), [])
+        self.assertEqual(len(self.store.calls), 14)
+
+    def test_regrade_after_a_grader_change(self):
+        self.run_all()
+        with mock.patch.object(grader, 'GRADER_VERSION', grader.GRADER_VERSION + 1):
+            self.assertEqual(self.run_all(), [])
+            self.assertEqual(self.run_all(regrade=True, chunk_size=10), [(7, 0, 0, 7)])
+            self.assertEqual(self.run_all(regrade=True), [])
+        self.assertEqual(len(self.store.calls), 14)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import re
+import unittest
+
+import ai_code_generation_storage as storage
+
+CREATE_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai_code_generation_create.sql')
+
+
+class TestSchema(unittest.TestCase):
+
+    def test_create_script_is_up_to_date(self):
+        with open(CREATE_SQL) as f:
+            self.assertEqual(f.read(), storage.schema_sql(), "run `make schema` after changing MIGRATIONS")
+
+    def test_migrations_are_numbered_in_order(self):
+        versions = [version for version, _, _ in storage.MIGRATIONS]
+        self.assertEqual(versions, list(range(1, len(versions) + 1)))
+
+
+class TestStatements(unittest.TestCase):
+
+    # Parameters each statement is called with
+    ARITY = {
+        'select_generated_code': 1,
+        'insert_evaluation': 5,
+        'update_human_grade': 3,
+        'select_evaluation': 1,
+        'select_evaluations_page': 2,
+        'select_ungraded_page': 2,
+        'select_ungraded_chunk': 3,
+        'select_stale_chunk': 5,
+        'select_cached_grades': 4,
+        'insert_log': 6,
+    }
+
+    def test_arity(self):
+        self.assertEqual(storage._ARITY, self.ARITY)
+
+    def test_placeholders_are_contiguous(self):
+        # EXECUTE passes _ARITY values, and PREPARE cannot infer the type of
+        # a parameter that the query skips.
+        for name, query in storage.STATEMENTS.items():
+            with self.subTest(name):
+                placeholders = {int(n) for n in re.findall(r'\$(\d+)', query)}
+                self.assertEqual(placeholders, set(range(1, storage._ARITY[name] + 1)))
+
+
+if __name__ == '__main__':
+    unittest.main()